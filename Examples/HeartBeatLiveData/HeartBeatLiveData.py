@@ -1,5 +1,6 @@
 import sys
 from thales_remote.connection import ThalesRemoteConnection
+from thales_remote.live_data import DataRow, LiveDataStream
 from thales_remote.script_wrapper import PotentiostatMode, ThalesRemoteScriptWrapper
 import time
 import threading
@@ -32,27 +33,16 @@ def liveDataThreadFunction():
     global zenniumConnectionLiveData
 
     print("live thread started")
-    while keepThreadRunning:
-        try:
-            data = zenniumConnectionLiveData.waitForBinaryTelegram()
-            packetId = data[0]
-            data = data[1:]
-            """
-            Type:
-            1 = Init measurement begin
-            2 = Measurement end
-            4 = Measurement data names
-            5 = Measurement data units
-            6 = ASCII data
-            """
-            if packetId in [1, 2, 4, 5, 6]:
-                print(data.decode("ASCII"))
-        except:
-            r"""
-            The connection to the term has an error or the socket has been closed.
-            """
-            print("term error live thread")
-            keepThreadRunning = False
+    stream = LiveDataStream(zenniumConnectionLiveData)
+    r"""
+    The iteration ends when the connection to the term has an error or the socket has been closed.
+    """
+    for event in stream:
+        if isinstance(event, DataRow):
+            print(event.asDict())
+        else:
+            print(event)
+    keepThreadRunning = False
 
     print("live thread left")
     return
@@ -0,0 +1,49 @@
+import re
+import timeit
+import numpy as np
+from thales_remote.live_data import parseLiveDataRow, parseLiveDataRows
+
+numberOfPackets = 20000
+numberOfColumns = 8
+
+rng = np.random.default_rng(0)
+data = rng.normal(size=(numberOfPackets, numberOfColumns)) * 1e3
+packets = [";".join(f"{value:.6e}" for value in row).encode("ASCII") for row in data]
+
+valueSeparator = re.compile(r"[\s;]+")
+
+
+def parseNaive(payload):
+    text = payload.decode("ASCII")
+    return np.array(
+        [float(value) for value in valueSeparator.split(text.strip()) if value],
+        dtype=np.float64,
+    )
+
+
+naive = np.array([parseNaive(packet) for packet in packets])
+vectorized = np.array([parseLiveDataRow(packet) for packet in packets])
+batch = parseLiveDataRows(packets)
+
+assert np.array_equal(naive, vectorized)
+assert np.array_equal(naive, batch)
+
+
+def benchmark(function, repeat=5):
+    return min(timeit.repeat(function, number=1, repeat=repeat))
+
+
+timeNaive = benchmark(lambda: [parseNaive(packet) for packet in packets])
+timeVectorized = benchmark(lambda: [parseLiveDataRow(packet) for packet in packets])
+timeBatch = benchmark(lambda: parseLiveDataRows(packets))
+
+for name, duration in [
+    ("naive per row", timeNaive),
+    ("parseLiveDataRow per row", timeVectorized),
+    ("parseLiveDataRows batch", timeBatch),
+]:
+    print(
+        f"{name:>26}: {duration * 1e6 / numberOfPackets:7.2f} us/packet"
+        f" {numberOfPackets / duration:12.0f} packets/s"
+        f" speedup {timeNaive / duration:5.1f}x"
+    )
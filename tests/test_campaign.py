@@ -0,0 +1,73 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from thales_remote.campaign import MeasurementCampaign
+
+
+def _createCampaign(directory, measured):
+    def measure(zahnerZennium, point):
+        measured.append(point["a"])
+        return {"value": np.full(3, point["a"], dtype=np.float64)}
+
+    return MeasurementCampaign(None, {"a": [1, 2, 3, 4]}, str(directory), measure)
+
+
+def test_reload_truncated_journal(tmp_path):
+    measured = []
+    _createCampaign(tmp_path, measured).run()
+    assert measured == [1, 2, 3, 4]
+
+    journalPath = os.path.join(tmp_path, "journal.jsonl")
+    with open(journalPath, "rb") as file:
+        lines = file.readlines()
+    # the last entry is only partly written
+    with open(journalPath, "wb") as file:
+        file.writelines(lines[:2])
+        file.write(lines[2][: len(lines[2]) // 2])
+
+    measured = []
+    campaign = _createCampaign(tmp_path, measured)
+    assert campaign.run() == 2
+    assert measured == [3, 4]
+
+    with open(journalPath, "rb") as file:
+        entries = [json.loads(line) for line in file]
+    assert [entry["point"]["a"] for entry in entries] == [1, 2, 3, 4]
+
+    measured = []
+    campaign = _createCampaign(tmp_path, measured)
+    assert campaign.run() == 0
+    for a in [1, 2, 3, 4]:
+        np.testing.assert_array_equal(campaign.getResult(a=a)["value"], [a] * 3)
+
+
+def test_append_after_entry_without_newline(tmp_path):
+    measured = []
+    _createCampaign(tmp_path, measured).run()
+
+    journalPath = os.path.join(tmp_path, "journal.jsonl")
+    with open(journalPath, "rb") as file:
+        lines = file.readlines()
+    with open(journalPath, "wb") as file:
+        file.writelines(lines[:1])
+        file.write(lines[1].rstrip(b"\n"))
+
+    measured = []
+    assert _createCampaign(tmp_path, measured).run() == 2
+    assert measured == [3, 4]
+
+    measured = []
+    assert _createCampaign(tmp_path, measured).run() == 0
+
+
+def test_reject_different_axis_order(tmp_path):
+    def measure(zahnerZennium, point):
+        return {"value": np.array([point["a"], point["b"]])}
+
+    MeasurementCampaign(None, {"a": [1, 2], "b": [3, 4]}, str(tmp_path), measure).run()
+
+    with pytest.raises(ValueError):
+        MeasurementCampaign(None, {"b": [3, 4], "a": [1, 2]}, str(tmp_path), measure)
@@ -0,0 +1,43 @@
+import os
+
+from thales_remote.file_cache import FileCache
+from thales_remote.file_interface import FileData
+
+
+def test_store_after_incomplete_manifest_line(tmp_path):
+    cache = FileCache(str(tmp_path))
+    cache.store(FileData("a.ism", r"C:\THALES\a.ism", b"a"))
+    cache.store(FileData("b.ism", r"C:\THALES\b.ism", b"b"))
+
+    manifestPath = os.path.join(tmp_path, "manifest.jsonl")
+    with open(manifestPath, "rb") as file:
+        lines = file.readlines()
+    # the last entry is only partly written
+    with open(manifestPath, "wb") as file:
+        file.writelines(lines[:1])
+        file.write(lines[1][: len(lines[1]) // 2])
+
+    cache = FileCache(str(tmp_path))
+    assert cache.lookup(r"C:\THALES\b.ism") is None
+    cache.store(FileData("c.ism", r"C:\THALES\c.ism", b"c"))
+
+    cache = FileCache(str(tmp_path))
+    assert cache.lookup(r"C:\THALES\a.ism") is not None
+    assert cache.lookup(r"C:\THALES\c.ism") is not None
+
+
+def test_store_after_entry_without_newline(tmp_path):
+    cache = FileCache(str(tmp_path))
+    cache.store(FileData("a.ism", r"C:\THALES\a.ism", b"a"))
+
+    manifestPath = os.path.join(tmp_path, "manifest.jsonl")
+    with open(manifestPath, "rb") as file:
+        content = file.read()
+    with open(manifestPath, "wb") as file:
+        file.write(content.rstrip(b"\n"))
+
+    FileCache(str(tmp_path)).store(FileData("b.ism", r"C:\THALES\b.ism", b"b"))
+
+    cache = FileCache(str(tmp_path))
+    assert cache.lookup(r"C:\THALES\a.ism") is not None
+    assert cache.lookup(r"C:\THALES\b.ism") is not None
@@ -0,0 +1,61 @@
+import json
+import os
+
+import numpy as np
+
+from thales_remote.live_data import DataRow, MeasurementBegin, MeasurementEnd
+from thales_remote.live_segments import LiveDataSegmenter
+
+
+def _recordMeasurement(directory, kind):
+    segmenter = LiveDataSegmenter(str(directory))
+    segmenter.handleEvent(MeasurementBegin(kind))
+    segmenter.handleEvent(DataRow(np.array([1.0, 2.0]), ["Time", "Voltage"]))
+    segmenter.handleEvent(MeasurementEnd(kind))
+    segmenter.close()
+
+
+def test_record_after_incomplete_index_line(tmp_path):
+    _recordMeasurement(tmp_path, "EIS")
+
+    indexPath = os.path.join(tmp_path, "index.jsonl")
+    with open(indexPath, "rb") as file:
+        lines = file.readlines()
+    # the end entry of the first segment is only partly written
+    with open(indexPath, "wb") as file:
+        file.writelines(lines[:1])
+        file.write(lines[1][: len(lines[1]) // 2])
+
+    _recordMeasurement(tmp_path, "CV")
+
+    with open(indexPath, "rb") as file:
+        entries = [json.loads(line) for line in file]
+    assert [(entry["number"], entry["completed"]) for entry in entries] == [
+        (1, False),
+        (2, False),
+        (2, True),
+    ]
+
+    segments = LiveDataSegmenter(str(tmp_path)).getSegments()
+    assert [(segment.kind, segment.completed) for segment in segments] == [
+        ("EIS", False),
+        ("CV", True),
+    ]
+
+
+def test_record_after_entry_without_newline(tmp_path):
+    _recordMeasurement(tmp_path, "EIS")
+
+    indexPath = os.path.join(tmp_path, "index.jsonl")
+    with open(indexPath, "rb") as file:
+        content = file.read()
+    with open(indexPath, "wb") as file:
+        file.write(content.rstrip(b"\n"))
+
+    _recordMeasurement(tmp_path, "CV")
+
+    segments = LiveDataSegmenter(str(tmp_path)).getSegments()
+    assert [(segment.kind, segment.completed) for segment in segments] == [
+        ("EIS", True),
+        ("CV", True),
+    ]
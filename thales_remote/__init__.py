@@ -1 +1,24 @@
-__all__ = ["connection", "error", "file_interface", "script_wrapper"]
+__all__ = [
+    "campaign",
+    "connection",
+    "error",
+    "file_archive",
+    "file_cache",
+    "file_interface",
+    "file_store",
+    "file_writer",
+    "live_async",
+    "live_broker",
+    "live_buffer",
+    "live_data",
+    "live_decimation",
+    "live_file",
+    "live_health",
+    "live_segments",
+    "live_trigger",
+    "post_processing",
+    "script_wrapper",
+    "sequence_manager",
+    "sweep",
+    "transfer_statistics",
+]
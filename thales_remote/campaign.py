@@ -0,0 +1,311 @@
+r"""
+  ____       __                        __    __   __      _ __
+ /_  / ___ _/ /  ___  ___ ___________ / /__ / /__/ /_____(_) /__
+  / /_/ _ `/ _ \/ _ \/ -_) __/___/ -_) / -_)  '_/ __/ __/ /  '_/
+ /___/\_,_/_//_/_//_/\__/_/      \__/_/\__/_/\_\\__/_/ /_/_/\_\
+
+Copyright 2024 Zahner-Elektrik GmbH & Co. KG
+
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the Software
+is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH
+THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import itertools
+import json
+import os
+import re
+from typing import Any, Callable, Iterator, Optional
+
+import numpy as np
+
+from thales_remote.script_wrapper import ThalesRemoteScriptWrapper
+
+
+class MeasurementCampaign(object):
+    r"""Class which runs a grid of measurements and can resume it after an interruption.
+
+    The grid is defined as dict with the name of each axis as key and the values of the axis as value,
+    for example potential × temperature × frequency range. Every combination of the values is a point which is
+    measured with a user function. The function gets the script wrapper and the point as dict and returns the
+    results of the point as dict with a name as key and a number or an array as value.
+
+    Everything is stored in the campaign directory:
+
+    * campaign.json: the grid definition
+    * journal.jsonl: one line for every completed point with its grid coordinates and the location of its results
+    * columns/<name>.bin: one append-only file for each result name with the raw data of all points
+
+    A point is only written to the journal after its results have been written to disk.
+    If the campaign is restarted with the same directory, all points from the journal are skipped, so that
+    finished measurements are never repeated. Data of a point which was interrupted while writing is discarded.
+
+    .. code-block:: python
+
+        def measure(zahnerZennium, point):
+            zahnerZennium.setPotential(point["potential"])
+            ...
+            return {"frequency": frequencies, "impedance": impedances}
+
+        campaign = MeasurementCampaign(
+            zahnerZennium,
+            {"potential": [0.0, 0.1, 0.2], "temperature": [25, 40]},
+            r"D:\myCampaign",
+            measure,
+        )
+        campaign.run()
+        campaign.getResult(potential=0.1, temperature=40)["impedance"]
+
+    :param scriptWrapper: The script wrapper which is passed to the measure function.
+    :param grid: Dict with the axis names as key and the list of values as value.
+        The values must be serializable to JSON.
+    :param directory: The directory of the campaign. It is created if it does not exist.
+    :param measure: Function which measures one point.
+    """
+
+    _script_wrapper: ThalesRemoteScriptWrapper
+    _grid: dict[str, list[Any]]
+    _directory: str
+    _measure: Callable[[ThalesRemoteScriptWrapper, dict[str, Any]], dict[str, Any]]
+    _journal: dict[tuple[int, ...], dict[str, Any]]
+
+    def __init__(
+        self,
+        scriptWrapper: ThalesRemoteScriptWrapper,
+        grid: dict[str, list[Any]],
+        directory: str,
+        measure: Callable[[ThalesRemoteScriptWrapper, dict[str, Any]], dict[str, Any]],
+    ):
+        self._script_wrapper = scriptWrapper
+        self._grid = {
+            axis: [
+                value.item() if isinstance(value, np.generic) else value
+                for value in values
+            ]
+            for axis, values in grid.items()
+        }
+        self._directory = directory
+        self._measure = measure
+        self._journal = {}
+
+        os.makedirs(os.path.join(self._directory, "columns"), exist_ok=True)
+        self._loadGridDefinition()
+        self._loadJournal()
+        return
+
+    def run(self, callback: Optional[Callable[[dict[str, Any]], None]] = None) -> int:
+        r"""
+        Measure all points which are not completed yet.
+
+        :param callback: Optional function which is called with the point after it was measured and stored.
+        :returns: The number of points measured in this run.
+        """
+        measured = 0
+        for index, point in self._iterateGrid():
+            if index in self._journal:
+                continue
+            results = self._measure(self._script_wrapper, point)
+            self._storePoint(index, point, results)
+            measured += 1
+            if callback is not None:
+                callback(point)
+        return measured
+
+    def getNumberOfPoints(self) -> int:
+        r"""
+        Get the number of points of the grid.
+
+        :returns: number of points
+        """
+        number = 1
+        for values in self._grid.values():
+            number *= len(values)
+        return number
+
+    def getCompletedPoints(self) -> list[dict[str, Any]]:
+        r"""
+        Get the completed points.
+
+        :returns: List with the completed points as dict.
+        """
+        return [dict(entry["point"]) for entry in self._journal.values()]
+
+    def isCompleted(self, **coordinates: Any) -> bool:
+        r"""
+        Check if the point with the passed coordinates is completed.
+
+        :param coordinates: The value of each axis as keyword, for example potential=0.1.
+        :returns: True if the point is completed.
+        """
+        return self._coordinatesToIndex(coordinates) in self._journal
+
+    def getResult(self, **coordinates: Any) -> dict[str, np.ndarray]:
+        r"""
+        Read the results of a completed point.
+
+        The arrays are memory mapped from the column files, so nothing has to be parsed.
+
+        :param coordinates: The value of each axis as keyword, for example potential=0.1.
+        :returns: Dict with the result name as key and the array as value.
+        """
+        index = self._coordinatesToIndex(coordinates)
+        if index not in self._journal:
+            raise KeyError(f"point not completed: {coordinates}")
+
+        results = {}
+        for name, column in self._journal[index]["columns"].items():
+            dtype = np.dtype(column["dtype"])
+            shape = tuple(column["shape"])
+            count = int(np.prod(shape, dtype=np.int64))
+            if count == 0:
+                results[name] = np.empty(shape, dtype=dtype)
+            else:
+                results[name] = np.memmap(
+                    self._columnPath(name),
+                    dtype=dtype,
+                    mode="r",
+                    offset=column["offset"],
+                    shape=(count,),
+                ).reshape(shape)
+        return results
+
+    # The following methods should not be called by the user.
+    # They are marked with the prefix '_' after the Python convention for proteced.
+
+    def _iterateGrid(self) -> Iterator[tuple[tuple[int, ...], dict[str, Any]]]:
+        r"""
+        iterate over all points of the grid
+
+        :returns: generator with tuples of the grid index and the point as dict.
+        """
+        axes = list(self._grid.keys())
+        ranges = [range(len(self._grid[axis])) for axis in axes]
+        for index in itertools.product(*ranges):
+            yield index, {
+                axis: self._grid[axis][position] for axis, position in zip(axes, index)
+            }
+
+    def _coordinatesToIndex(self, coordinates: dict[str, Any]) -> tuple[int, ...]:
+        r"""
+        convert the axis values into the grid index
+        """
+        if set(coordinates.keys()) != set(self._grid.keys()):
+            raise ValueError(
+                f"coordinates must contain exactly the axes: {list(self._grid.keys())}"
+            )
+        return tuple(
+            values.index(coordinates[axis]) for axis, values in self._grid.items()
+        )
+
+    def _columnPath(self, name: str) -> str:
+        r"""
+        path of the file of a result column
+        """
+        if re.fullmatch(r"[0-9a-zA-Z_\-]+", name) is None:
+            raise ValueError(f'invalid result name: "{name}"')
+        return os.path.join(self._directory, "columns", name + ".bin")
+
+    def _loadGridDefinition(self) -> None:
+        r"""
+        write the grid definition or check that it matches the existing campaign
+
+        The order of the axes is compared too, because the indices in the journal depend on it.
+        """
+        definitionPath = os.path.join(self._directory, "campaign.json")
+        if os.path.exists(definitionPath):
+            with open(definitionPath, "r") as file:
+                existingGrid = json.load(file)
+            if list(existingGrid.items()) != list(
+                json.loads(json.dumps(self._grid)).items()
+            ):
+                raise ValueError(
+                    f"The directory contains a campaign with a different grid or axis order: {definitionPath}"
+                )
+        else:
+            with open(definitionPath, "w") as file:
+                json.dump(self._grid, file, indent=2)
+        return
+
+    def _loadJournal(self) -> None:
+        r"""
+        read the completed points and cut off data of an interrupted point from the journal and the column files
+        """
+        journalPath = os.path.join(self._directory, "journal.jsonl")
+        columnEnds: dict[str, int] = {}
+
+        if os.path.exists(journalPath):
+            journalEnd = 0
+            position = 0
+            with open(journalPath, "rb") as file:
+                for line in file:
+                    position += len(line)
+                    try:
+                        entry = json.loads(line)
+                    except (json.JSONDecodeError, UnicodeDecodeError):
+                        # incomplete line of an interrupted run
+                        continue
+                    journalEnd = position
+                    self._journal[tuple(entry["index"])] = entry
+                    for name, column in entry["columns"].items():
+                        columnEnds[name] = max(
+                            columnEnds.get(name, 0), column["offset"] + column["bytes"]
+                        )
+            if position > journalEnd:
+                # the next entry must not be appended to an incomplete line
+                os.truncate(journalPath, journalEnd)
+
+        for fileName in os.listdir(os.path.join(self._directory, "columns")):
+            name, extension = os.path.splitext(fileName)
+            if extension != ".bin":
+                continue
+            path = self._columnPath(name)
+            if os.path.getsize(path) > columnEnds.get(name, 0):
+                os.truncate(path, columnEnds.get(name, 0))
+        return
+
+    def _storePoint(
+        self, index: tuple[int, ...], point: dict[str, Any], results: dict[str, Any]
+    ) -> None:
+        r"""
+        append the results to the column files and then the point to the journal
+        """
+        columns = {}
+        for name, value in results.items():
+            array = np.ascontiguousarray(value)
+            with open(self._columnPath(name), "ab") as file:
+                offset = file.tell()
+                file.write(array.tobytes())
+                file.flush()
+                os.fsync(file.fileno())
+            columns[name] = {
+                "dtype": array.dtype.str,
+                "shape": list(array.shape),
+                "offset": offset,
+                "bytes": array.nbytes,
+            }
+
+        entry = {"index": list(index), "point": point, "columns": columns}
+        with open(os.path.join(self._directory, "journal.jsonl"), "a+b") as file:
+            line = json.dumps(entry).encode("utf-8") + b"\n"
+            if file.seek(0, os.SEEK_END) > 0:
+                file.seek(-1, os.SEEK_END)
+                if file.read(1) != b"\n":
+                    line = b"\n" + line
+            file.write(line)
+            file.flush()
+            os.fsync(file.fileno())
+        self._journal[index] = entry
+        return
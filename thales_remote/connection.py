@@ -47,7 +47,7 @@ class ThalesRemoteConnection(object):
     _send_mutex: threading.Semaphore
     _receiving_worker_is_running: bool
     _available_channels: list[int]
-    _queuesForChannels: dict[int, queue.Queue[Optional[bytes]]]
+    _queuesForChannels: dict[int, queue.Queue[Optional[tuple[bytes, float]]]]
     _connectionName: str
 
     def __init__(self):
@@ -234,11 +234,51 @@ class ThalesRemoteConnection(object):
         :returns: The response from the device or an empty bytearray if someting went wrong.
         :rtype: bytearray
         """
+        return self.waitForBinaryTelegramWithTime(message_type, timeout)[0]
+
+    def waitForBinaryTelegramWithTime(
+        self, message_type: int = 2, timeout: Optional[float] = None
+    ) -> tuple[bytes, float]:
+        r"""
+        block infinitely until the next Telegram is arriving and return it with its reception time
+
+        The reception time is taken in the receiving thread when the telegram was read from the socket,
+        so it does not depend on how long the telegram has been waiting in the queue.
+
+        :param message_type: Used internally by the DevCli dll. Depends on context. Most of the time 2.
+        :param timeout: The timeout for sending data in seconds, blocking at None
+        :returns: The response from the device and the time of the reception in seconds of
+            :func:`time.perf_counter`.
+        """
         retval = self._queuesForChannels[message_type].get(True, timeout=timeout)
         if retval is None:
             raise TermConnectionError("Socket error during data reception.")
         return retval
 
+    def interruptWaitForTelegram(self, message_type: int = 2) -> None:
+        r"""
+        wake up a thread waiting for a telegram
+
+        An empty telegram is put into the queue of the channel. The listener never queues empty telegrams,
+        so the waiting thread can recognize the interruption by the empty return value of
+        :func:`~thales_remote.connection.ThalesRemoteConnection.waitForBinaryTelegram`.
+
+        :param message_type: The channel on which the thread is waiting.
+        """
+        self._queuesForChannels[message_type].put((bytes(), time.perf_counter()))
+        return
+
+    def getQueueSize(self, message_type: int = 2) -> int:
+        r"""
+        get the number of received telegrams waiting in the queue of a channel
+
+        A growing number shows that the telegrams are not read as fast as they arrive.
+
+        :param message_type: The channel.
+        :returns: The approximate number of telegrams in the queue.
+        """
+        return self._queuesForChannels[message_type].qsize()
+
     def waitForStringTelegram(
         self, message_type: int = 2, timeout: Optional[float] = None
     ) -> str:
@@ -289,7 +329,9 @@ class ThalesRemoteConnection(object):
         while self._receiving_worker_is_running:
             message_type, telegram = self._readTelegramFromSocket()
             if len(telegram) > 0 and message_type in self._available_channels:
-                self._queuesForChannels[message_type].put(telegram)
+                self._queuesForChannels[message_type].put(
+                    (telegram, time.perf_counter())
+                )
             elif message_type is None:
                 # An error has occurred in the connection. None is passed into all queues to free
                 # the waiting threads from the queue. If they have received None, they throw an exception.
@@ -0,0 +1,325 @@
+r"""
+  ____       __                        __    __   __      _ __
+ /_  / ___ _/ /  ___  ___ ___________ / /__ / /__/ /_____(_) /__
+  / /_/ _ `/ _ \/ _ \/ -_) __/___/ -_) / -_)  '_/ __/ __/ /  '_/
+ /___/\_,_/_//_/_//_/\__/_/      \__/_/\__/_/\_\\__/_/ /_/_/\_\
+
+Copyright 2024 Zahner-Elektrik GmbH & Co. KG
+
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the Software
+is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH
+THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import dataclasses
+import fnmatch
+import glob
+import json
+import lzma
+import os
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from thales_remote.file_interface import FileData
+
+
+class ArchiveCompression(IntEnum):
+    r"""
+    Compression of the files in the :class:`.FileArchive`.
+
+    * ZLIB: fast, suitable for archiving during the measurement
+    * LZMA: smaller archives, but slower compression
+    """
+
+    ZLIB = 0
+    LZMA = 1
+
+
+@dataclass
+class ArchiveEntry:
+    r"""
+    Entry of the index of the :class:`.FileArchive`.
+
+    :param remotePath: Full path of the file on the computer running the Thales software.
+    :param name: Name of the file.
+    :param archive: File name of the archive in the archive directory.
+    :param offset: Position of the compressed file in the archive in bytes.
+    :param compressedSize: Size of the compressed file in bytes.
+    :param size: Size of the file in bytes.
+    :param compression: Compression of the file.
+    :param receivedAt: Time of the archiving in seconds since the epoch.
+    """
+
+    remotePath: str
+    name: str
+    archive: str
+    offset: int
+    compressedSize: int
+    size: int
+    compression: ArchiveCompression
+    receivedAt: float
+
+
+class FileArchive(object):
+    r"""Rolling archive of compressed files.
+
+    Every file is compressed on its own and appended to the current archive file. When the archive would exceed
+    the maximum size, a new archive file is started. Next to each archive a sidecar index with the extension
+    ".idx" holds one line per file with the position and the size of the compressed data, so a single file is
+    read with one seek and one decompression, without scanning the archive.
+
+    Only zlib and lzma of the standard library are used. Archives written by an interrupted run are truncated to
+    the last indexed file when the archive is opened again.
+
+    All methods are thread safe.
+
+    :param directory: The directory of the archives. It is created if it does not exist.
+    :param compression: Compression of the files appended from now on.
+    :param maxArchiveSize: Maximum size of an archive file in bytes. A single larger file gets its own archive.
+    """
+
+    _directory: str
+    _compression: ArchiveCompression
+    _max_archive_size: int
+    _entries: list[ArchiveEntry]
+    _current_archive: Optional[str]
+    _current_size: int
+    _archive_counter: int
+    _mutex: threading.Lock
+
+    def __init__(
+        self,
+        directory: str,
+        compression: ArchiveCompression = ArchiveCompression.ZLIB,
+        maxArchiveSize: int = 256 * 1024 * 1024,
+    ):
+        self._directory = directory
+        self._compression = compression
+        self._max_archive_size = maxArchiveSize
+        self._entries = []
+        self._current_archive = None
+        self._current_size = 0
+        self._archive_counter = 0
+        self._mutex = threading.Lock()
+
+        os.makedirs(self._directory, exist_ok=True)
+        self._loadIndices()
+        return
+
+    def append(self, file: "FileData") -> ArchiveEntry:
+        r"""
+        compress a file and append it to the current archive
+
+        :param file: The transferred file, with binary data or a local path.
+        :returns: The new index entry.
+        """
+        if file.binaryData is not None:
+            content = file.binaryData
+        else:
+            with open(file.localPath, "rb") as localFile:
+                content = localFile.read()
+
+        compressedData = self._compress(content, self._compression)
+
+        with self._mutex:
+            if self._current_archive is None or (
+                self._current_size > 0
+                and self._current_size + len(compressedData) > self._max_archive_size
+            ):
+                self._startArchive()
+
+            entry = ArchiveEntry(
+                file.path,
+                file.name,
+                self._current_archive,
+                self._current_size,
+                len(compressedData),
+                len(content),
+                self._compression,
+                time.time(),
+            )
+            indexPath = self._indexPath(entry.archive)
+            indexSize = os.path.getsize(indexPath) if os.path.exists(indexPath) else 0
+            try:
+                with open(self._archivePath(entry.archive), "ab") as archive:
+                    archive.write(compressedData)
+                with open(indexPath, "a") as index:
+                    index.write(json.dumps(dataclasses.asdict(entry)) + "\n")
+            except:
+                # the next file is appended at the same position
+                self._truncate(self._archivePath(entry.archive), entry.offset)
+                self._truncate(indexPath, indexSize)
+                raise
+
+            self._current_size += len(compressedData)
+            self._entries.append(entry)
+        return entry
+
+    def read(self, entry: ArchiveEntry) -> "FileData":
+        r"""
+        read a file from the archive
+
+        :param entry: The index entry.
+        :returns: The file with its binary data.
+        """
+        from thales_remote.file_interface import FileData
+
+        with open(self._archivePath(entry.archive), "rb") as archive:
+            archive.seek(entry.offset)
+            compressedData = archive.read(entry.compressedSize)
+        return FileData(
+            entry.name,
+            entry.remotePath,
+            self._decompress(compressedData, entry.compression),
+        )
+
+    def query(
+        self,
+        pattern: str = "*",
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+    ) -> list[ArchiveEntry]:
+        r"""
+        search the index
+
+        The index is kept in memory, so searching does not touch the archives.
+
+        :param pattern: Unix shell-style wildcard for the path on the Thales computer, for example "*.ism".
+        :param since: Only entries archived at or after this time in seconds since the epoch.
+        :param until: Only entries archived before this time in seconds since the epoch.
+        :returns: List with the matching entries in the order of the archiving.
+        """
+        pattern = self._normalizePath(pattern)
+        with self._mutex:
+            entries = list(self._entries)
+        return [
+            entry
+            for entry in entries
+            if fnmatch.fnmatchcase(self._normalizePath(entry.remotePath), pattern)
+            and (since is None or entry.receivedAt >= since)
+            and (until is None or entry.receivedAt < until)
+        ]
+
+    def getArchivePath(self, entry: ArchiveEntry) -> str:
+        r"""
+        get the local path of the archive containing a file
+
+        :param entry: The index entry.
+        :returns: path of the archive file
+        """
+        return self._archivePath(entry.archive)
+
+    def __len__(self) -> int:
+        with self._mutex:
+            return len(self._entries)
+
+    # The following methods should not be called by the user.
+    # They are marked with the prefix '_' after the Python convention for proteced.
+
+    def _archivePath(self, archive: str) -> str:
+        return os.path.join(self._directory, archive)
+
+    def _indexPath(self, archive: str) -> str:
+        return self._archivePath(archive) + ".idx"
+
+    def _normalizePath(self, path: str) -> str:
+        r"""
+        paths on the Thales computer are not case sensitive
+        """
+        return path.replace("/", "\\").lower()
+
+    def _compress(self, content: bytes, compression: ArchiveCompression) -> bytes:
+        if compression == ArchiveCompression.LZMA:
+            return lzma.compress(content)
+        return zlib.compress(content)
+
+    def _decompress(self, content: bytes, compression: ArchiveCompression) -> bytes:
+        if compression == ArchiveCompression.LZMA:
+            return lzma.decompress(content)
+        return zlib.decompress(content)
+
+    def _truncate(self, path: str, size: int) -> None:
+        r"""
+        cut off a partly written append, errors are ignored because the original error is raised
+        """
+        try:
+            if os.path.exists(path):
+                os.truncate(path, size)
+        except OSError:
+            pass
+        return
+
+    def _startArchive(self) -> None:
+        r"""
+        start a new archive file
+        """
+        self._archive_counter += 1
+        self._current_archive = f"archive_{self._archive_counter:06d}.bin"
+        self._current_size = 0
+        return
+
+    def _loadIndices(self) -> None:
+        r"""
+        read the sidecar indices and continue the last archive
+
+        Entries beyond the end of their archive are ignored and data after the last entry is truncated.
+        """
+        archives = sorted(
+            os.path.basename(path)[: -len(".idx")]
+            for path in glob.glob(os.path.join(self._directory, "archive_*.bin.idx"))
+        )
+        for archive in archives:
+            if not os.path.exists(self._archivePath(archive)):
+                continue
+            archiveSize = os.path.getsize(self._archivePath(archive))
+            end = 0
+            entries = []
+            with open(self._indexPath(archive), "r") as index:
+                lines = index.readlines()
+            for line in lines:
+                try:
+                    values = json.loads(line)
+                    values["compression"] = ArchiveCompression(values["compression"])
+                    entry = ArchiveEntry(**values)
+                except (json.JSONDecodeError, TypeError, KeyError, ValueError):
+                    # incomplete last line of an interrupted write
+                    continue
+                if entry.offset + entry.compressedSize > archiveSize:
+                    continue
+                entries.append(entry)
+                end = max(end, entry.offset + entry.compressedSize)
+
+            if len(entries) != len(lines):
+                # rewrite the index, so that the dropped entries do not point to data appended later
+                with open(self._indexPath(archive), "w") as index:
+                    for entry in entries:
+                        index.write(json.dumps(dataclasses.asdict(entry)) + "\n")
+            self._entries.extend(entries)
+
+            self._archive_counter = max(
+                self._archive_counter, int(archive[len("archive_") : -len(".bin")])
+            )
+            self._current_archive = archive
+            self._current_size = end
+            if archiveSize > end:
+                with open(self._archivePath(archive), "r+b") as archiveFile:
+                    archiveFile.truncate(end)
+        return
@@ -0,0 +1,233 @@
+r"""
+  ____       __                        __    __   __      _ __
+ /_  / ___ _/ /  ___  ___ ___________ / /__ / /__/ /_____(_) /__
+  / /_/ _ `/ _ \/ _ \/ -_) __/___/ -_) / -_)  '_/ __/ __/ /  '_/
+ /___/\_,_/_//_/_//_/\__/_/      \__/_/\__/_/\_\\__/_/ /_/_/\_\
+
+Copyright 2024 Zahner-Elektrik GmbH & Co. KG
+
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the Software
+is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH
+THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import dataclasses
+import fnmatch
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from thales_remote.file_interface import FileData
+
+
+@dataclass
+class CacheEntry:
+    r"""
+    Entry of the manifest of the :class:`.FileCache`.
+
+    :param remotePath: Full path of the file on the computer running the Thales software.
+    :param name: Name of the file.
+    :param size: Size of the file in bytes.
+    :param digest: SHA-256 hash of the content, which is also the key of the cached object.
+    :param receivedAt: Time of the transfer in seconds since the epoch.
+    """
+
+    remotePath: str
+    name: str
+    size: int
+    digest: str
+    receivedAt: float
+
+
+class FileCache(object):
+    r"""Persistent local cache for transferred files.
+
+    The content of every file is stored once under its SHA-256 hash in the objects directory.
+    The manifest maps each path on the Thales computer with size and time of the transfer to the cached object.
+    Files with the same name but different content, for example from different measurements, are all kept.
+
+    A path found in the manifest is only the latest transferred version of the file. Thales writes a repeated
+    measurement with individual file naming to the same path, so the cached version can be outdated.
+    The :class:`~thales_remote.file_interface.ThalesFileInterface` therefore only returns files from the cache
+    if this is requested explicitly.
+
+    :param directory: The directory of the cache. It is created if it does not exist.
+    """
+
+    _directory: str
+    _entries: list[CacheEntry]
+    _latest: dict[str, CacheEntry]
+    _mutex: threading.Lock
+
+    def __init__(self, directory: str):
+        self._directory = directory
+        self._entries = []
+        self._latest = {}
+        self._mutex = threading.Lock()
+
+        os.makedirs(os.path.join(self._directory, "objects"), exist_ok=True)
+        self._loadManifest()
+        return
+
+    def store(self, file: "FileData") -> CacheEntry:
+        r"""
+        add a transferred file to the cache
+
+        :param file: The transferred file, with binary data or a local path.
+        :returns: The new manifest entry.
+        """
+        if file.binaryData is not None:
+            content = bytes(file.binaryData)
+        else:
+            with open(file.localPath, "rb") as localFile:
+                content = localFile.read()
+
+        digest = hashlib.sha256(content).hexdigest()
+        objectPath = self._objectPath(digest)
+        if not os.path.exists(objectPath):
+            os.makedirs(os.path.dirname(objectPath), exist_ok=True)
+            fileDescriptor, temporaryPath = tempfile.mkstemp(
+                suffix=".tmp", dir=os.path.dirname(objectPath)
+            )
+            try:
+                with os.fdopen(fileDescriptor, "wb") as objectFile:
+                    objectFile.write(content)
+                os.replace(temporaryPath, objectPath)
+            except:
+                if os.path.exists(temporaryPath):
+                    os.remove(temporaryPath)
+                raise
+
+        entry = CacheEntry(file.path, file.name, len(content), digest, time.time())
+        with self._mutex:
+            with open(self._manifestPath(), "a+b") as manifest:
+                line = json.dumps(dataclasses.asdict(entry)).encode("utf-8") + b"\n"
+                if manifest.seek(0, os.SEEK_END) > 0:
+                    manifest.seek(-1, os.SEEK_END)
+                    if manifest.read(1) != b"\n":
+                        line = b"\n" + line
+                manifest.write(line)
+            self._addEntry(entry)
+        return entry
+
+    def lookup(self, remotePath: str) -> Optional[CacheEntry]:
+        r"""
+        find the latest cached version of a file
+
+        :param remotePath: Full path of the file on the computer running the Thales software.
+        :returns: The manifest entry or None if the file is not cached.
+        """
+        with self._mutex:
+            return self._latest.get(self._normalizePath(remotePath))
+
+    def load(self, entry: CacheEntry) -> "FileData":
+        r"""
+        read a cached file
+
+        :param entry: The manifest entry.
+        :returns: The file with its binary data.
+        """
+        from thales_remote.file_interface import FileData
+
+        with open(self._objectPath(entry.digest), "rb") as objectFile:
+            return FileData(entry.name, entry.remotePath, objectFile.read())
+
+    def getObjectPath(self, entry: CacheEntry) -> str:
+        r"""
+        get the local path of a cached object
+
+        :param entry: The manifest entry.
+        :returns: path of the object file
+        """
+        return self._objectPath(entry.digest)
+
+    def query(
+        self,
+        pattern: str = "*",
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        digest: Optional[str] = None,
+    ) -> list[CacheEntry]:
+        r"""
+        search the manifest
+
+        :param pattern: Unix shell-style wildcard for the path on the Thales computer, for example "*.ism".
+        :param since: Only entries transferred at or after this time in seconds since the epoch.
+        :param until: Only entries transferred before this time in seconds since the epoch.
+        :param digest: Only entries with this content hash.
+        :returns: List with the matching entries in the order of the transfer.
+        """
+        pattern = self._normalizePath(pattern)
+        with self._mutex:
+            entries = list(self._entries)
+        return [
+            entry
+            for entry in entries
+            if fnmatch.fnmatchcase(self._normalizePath(entry.remotePath), pattern)
+            and (since is None or entry.receivedAt >= since)
+            and (until is None or entry.receivedAt < until)
+            and (digest is None or entry.digest == digest)
+        ]
+
+    # The following methods should not be called by the user.
+    # They are marked with the prefix '_' after the Python convention for proteced.
+
+    def _manifestPath(self) -> str:
+        return os.path.join(self._directory, "manifest.jsonl")
+
+    def _objectPath(self, digest: str) -> str:
+        return os.path.join(self._directory, "objects", digest[:2], digest)
+
+    def _normalizePath(self, path: str) -> str:
+        r"""
+        paths on the Thales computer are not case sensitive
+        """
+        return path.replace("/", "\\").lower()
+
+    def _addEntry(self, entry: CacheEntry) -> None:
+        self._entries.append(entry)
+        self._latest[self._normalizePath(entry.remotePath)] = entry
+        return
+
+    def _loadManifest(self) -> None:
+        r"""
+        read the manifest and cut off an incomplete last line, entries of missing objects are ignored
+        """
+        if not os.path.exists(self._manifestPath()):
+            return
+        manifestEnd = 0
+        position = 0
+        with open(self._manifestPath(), "rb") as manifest:
+            for line in manifest:
+                position += len(line)
+                try:
+                    entry = CacheEntry(**json.loads(line))
+                except (json.JSONDecodeError, UnicodeDecodeError, TypeError):
+                    # incomplete last line of an interrupted write
+                    continue
+                manifestEnd = position
+                if os.path.exists(self._objectPath(entry.digest)):
+                    self._addEntry(entry)
+        if position > manifestEnd:
+            # the next entry must not be appended to an incomplete line
+            os.truncate(self._manifestPath(), manifestEnd)
+        return
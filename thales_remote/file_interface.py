@@ -24,22 +24,81 @@ OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH
 THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
 
+import fnmatch
+import multiprocessing.context
 import os
+import queue
 import threading
 import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from queue import Empty
-from typing import Optional, Union, ByteString
+from typing import BinaryIO, Callable, Iterator, Optional, Union, ByteString
 
 from thales_remote.connection import ThalesRemoteConnection
-from dataclasses import dataclass
+from thales_remote.error import TermConnectionError
+from thales_remote.file_archive import ArchiveCompression, FileArchive
+from thales_remote.file_cache import FileCache
+from thales_remote.file_store import ReceivedFileStore
+from thales_remote.file_writer import (
+    FileWriter,
+    FileWriterStatistics,
+    FsyncPolicy,
+    writeFileAtomically,
+)
+from thales_remote.post_processing import FilePostProcessor, ProcessedFile
+from thales_remote.transfer_statistics import (
+    FileTransferRecord,
+    TransferStatistics,
+    TransferStatisticsSnapshot,
+)
+from dataclasses import dataclass, field
 import warnings
 
 
 @dataclass
 class FileData:
+    r"""
+    A file transferred from Term.
+
+    :param name: Name of the file.
+    :param path: Full path of the file on the computer running the Thales software.
+    :param binaryData: Content of the file or None if the file was streamed to disk.
+    :param localPath: Path of the file on the local computer if it was streamed to disk, otherwise None.
+    """
+
     name: str
     path: str
-    binaryData: ByteString
+    binaryData: Optional[ByteString]
+    localPath: Optional[str] = None
+
+
+@dataclass
+class BulkTransferReport:
+    r"""
+    Result of the transfer of several files.
+
+    :param files: Dict with the requested path as key and the received file as value.
+    :param failures: Dict with the requested path as key and the reason as value for the files that could
+        not be transferred.
+    :param bytes: Number of bytes transferred.
+    :param seconds: Duration of the transfer in seconds.
+    """
+
+    files: dict[str, FileData] = field(default_factory=dict)
+    failures: dict[str, str] = field(default_factory=dict)
+    bytes: int = 0
+    seconds: float = 0.0
+
+    def getThroughput(self) -> float:
+        r"""
+        get the throughput of the transfer
+
+        :returns: throughput in MB/s
+        """
+        if self.seconds <= 0:
+            return 0.0
+        return self.bytes / self.seconds / 1e6
 
 
 class ThalesFileInterface(object):
@@ -62,10 +121,27 @@ class ThalesFileInterface(object):
     _receiver_is_running: bool
     _automatic_file_exchange: bool
     _files_to_skip: list[str]
-    receivedFiles: list[FileData]
+    receivedFiles: ReceivedFileStore
     pathToSave: str
     _save_received_files_to_disk: bool
     _keep_files_in_object: bool
+    _file_condition: threading.Condition
+    _file_callbacks: list[Callable[[FileData], None]]
+    _file_subscribers: list[queue.Queue[Optional[FileData]]]
+    _recent_files: deque[tuple[int, FileData]]
+    _received_counter: int
+    _wait_cursors: dict[str, int]
+    _post_processor: Optional[FilePostProcessor]
+    _file_cache: Optional[FileCache]
+    _file_archive: Optional[FileArchive]
+    _file_writer: Optional[FileWriter]
+    _file_writer_mutex: threading.Lock
+    _file_writer_error: Optional[BaseException]
+    _storage_worker: Optional[ThreadPoolExecutor]
+    _storage_slots: threading.BoundedSemaphore
+    _transfer_statistics: TransferStatistics
+    receivingWorker: Optional[threading.Thread]
+    _receiver_error: Optional[BaseException]
 
     def __init__(self, address, connectionName="FileExchange"):
         self._device_name = connectionName
@@ -74,10 +150,27 @@ class ThalesFileInterface(object):
         self._receiver_is_running = False
         self._automatic_file_exchange = False
         self._files_to_skip = ["lastshot.ism"]
-        self.receivedFiles = []
+        self.receivedFiles = ReceivedFileStore()
         self.pathToSave = os.getcwd()
         self._save_received_files_to_disk = False
         self._keep_files_in_object = True
+        self._file_condition = threading.Condition()
+        self._file_callbacks = []
+        self._file_subscribers = []
+        self._recent_files = deque(maxlen=32)
+        self._received_counter = 0
+        self._wait_cursors = {}
+        self._post_processor = None
+        self._file_cache = None
+        self._file_archive = None
+        self._file_writer = None
+        self._file_writer_mutex = threading.Lock()
+        self._file_writer_error = None
+        self._storage_worker = None
+        self._storage_slots = threading.BoundedSemaphore(16)
+        self._transfer_statistics = TransferStatistics()
+        self.receivingWorker = None
+        self._receiver_error = None
         return
 
     def close(self) -> None:
@@ -85,9 +178,17 @@ class ThalesFileInterface(object):
         close the file interface
 
         The automatic file sending is disabled and the socket connection is closed.
+        If post-processing is enabled, the process pool is shut down after all files are parsed.
+        If the thread receiving the files has stopped with an error, a TermConnectionError is raised after
+        everything is closed.
         """
-        self.disableAutomaticFileExchange()
-        self.remoteConnection.disconnectFromTerm()
+        try:
+            self.disableAutomaticFileExchange()
+        finally:
+            self.remoteConnection.disconnectFromTerm()
+            self.disablePostProcessing()
+            self._closeStorageWorker()
+            self._closeFileWriter()
         return
 
     def enableAutomaticFileExchange(
@@ -104,6 +205,10 @@ class ThalesFileInterface(object):
         the received files as an array with :func:`~thales_remote.file_interface.ThalesFileInterface.getReceivedFiles`.
         The standard setting is that the files remain in the object.
 
+        If the thread receiving the files has stopped with an error, the error is raised as TermConnectionError
+        when the automatic file exchange is disabled or enabled again. In the second case ON is not sent, and the
+        next call starts a new thread.
+
         :param enable: Enable automatic file exchange. Default = True.
         :param fileExtensions: File extensions that will be exchanged. You can see the default paramter.
             But you can also specify only one type of file or more.
@@ -112,22 +217,21 @@ class ThalesFileInterface(object):
         :rtype: string
         """
         if enable:
+            self._startWorker()
             retval = self.remoteConnection.sendStringAndWaitForReplyString(
                 f"3,{self._device_name},4,ON,{fileExtensions}",
                 message_type=128,
                 answer_message_type=132,
             )
-            self._startWorker()
         else:
             # Sending the command that no more data should be sent.
-            # Then wait 1 second until the Thales has possibly sent everything.
-            # Then stopp the worker thread.
+            # Term sends the reply after the last file, so all files are in the queues when the reply arrives.
+            # Then the worker thread is stopped after it has processed the queued files.
             retval = self.remoteConnection.sendStringAndWaitForReplyString(
                 f"3,{self._device_name},4,OFF",
                 message_type=128,
                 answer_message_type=132,
             )
-            time.sleep(1)
             self._stopWorker()
         return retval
 
@@ -174,7 +278,9 @@ class ThalesFileInterface(object):
         )
         return self.acquireFile(filename)
 
-    def acquireFile(self, filename: str) -> Union[FileData, None]:
+    def acquireFile(
+        self, filename: str, useCache: bool = False
+    ) -> Union[FileData, None]:
         r"""
         transfer a single file
 
@@ -183,19 +289,235 @@ class ThalesFileInterface(object):
         The parameter filename is used to specify the full path of the file, on the computer running
         the Thales software, to be transferred e.g. r"C:\\THALES\\temp\\test1\\myeis.ism".
 
+        If the file cache is enabled with :func:`~thales_remote.file_interface.ThalesFileInterface.enableFileCache`,
+        transferred files are added to the cache. With useCache, a file that was already transferred is read from
+        the cache instead. The cache only knows the path, so this must only be used if the file on the Thales
+        computer cannot have been overwritten since, for example by a repeated measurement with the same name.
+
         The function returns the file as dataclass.
 
         :param filename: Filename with path on the Thales computer.
+        :param useCache: If True, a file in the cache is not transferred again.
         :returns: A dataclass with the file or None if this command is called when automatic file
             exchange is activated.
         """
+        if self._receiver_is_running:
+            return None
+        else:
+            cached = self._loadFromCache(filename) if useCache else None
+            if cached is not None:
+                return cached
+            self.remoteConnection.sendTelegram(
+                f"3,{self._device_name},1,{filename}", message_type=128
+            )
+            file = self._receiveFile()
+            if self._file_cache is not None:
+                self._file_cache.store(file)
+            return file
+
+    def acquireFileToDisk(
+        self, filename: str, path: Optional[str] = None
+    ) -> Union[FileData, None]:
+        r"""
+        transfer a single file directly to the hard disk
+
+        Like :func:`~thales_remote.file_interface.ThalesFileInterface.acquireFile`, but the received data is
+        written chunk by chunk into a temporary file, which is renamed when the transfer is complete.
+        Existing files are not overwritten, instead a number is appended to the name.
+        This way the memory usage does not depend on the size of the file.
+        **This command can only be executed if automatic transfer is disabled.** If automatic transfer is enabled, None is returned.
+
+        :param filename: Filename with path on the Thales computer.
+        :param path: Optional local directory, default is the path set with
+            :func:`~thales_remote.file_interface.ThalesFileInterface.setSavePath`.
+        :returns: A dataclass with the local path of the file and without binary data or None if this command is
+            called when automatic file exchange is activated.
+        """
         if self._receiver_is_running:
             return None
         else:
             self.remoteConnection.sendTelegram(
                 f"3,{self._device_name},1,{filename}", message_type=128
             )
-            return self._receiveFile()
+            return self._receiveFile(
+                directory=path if path is not None else self.pathToSave
+            )
+
+    def acquireFiles(
+        self,
+        filenames: list[str],
+        path: Optional[str] = None,
+        window: int = 4,
+        timeout: float = 30.0,
+        useCache: bool = False,
+    ) -> Union[BulkTransferReport, None]:
+        r"""
+        transfer several files
+
+        Up to *window* requests are sent to Term before the first file is received, so that Term can send the
+        next file without waiting for the next request. The received files are assigned to the requests by their
+        path. If a path is passed, the files are written to disk by worker threads while the next files are
+        received, then the returned files contain the local path and no binary data. Existing files are not
+        overwritten and files with the same name from different remote directories are not written over each other,
+        instead a number is appended to the name.
+
+        If no file arrives within the timeout, the outstanding requests are reported as failed and the
+        remaining requests are sent. With useCache, files in the file cache are not transferred again, see
+        :func:`~thales_remote.file_interface.ThalesFileInterface.acquireFile`.
+        **This command can only be executed if automatic transfer is disabled.** If automatic transfer is enabled, None is returned.
+
+        :param filenames: List of filenames with path on the Thales computer.
+        :param path: Optional local directory into which the files are written.
+        :param window: Maximum number of requests sent ahead.
+        :param timeout: Time in seconds to wait for the next file.
+        :param useCache: If True, files in the cache are not transferred again.
+        :returns: :class:`.BulkTransferReport` with the files and the failures or None if this command is called
+            when automatic file exchange is activated.
+        """
+        if self._receiver_is_running:
+            return None
+
+        report = BulkTransferReport()
+        toRequest = deque(dict.fromkeys(filenames))
+        outstanding: dict[str, str] = {}
+        writes: dict[str, Future] = {}
+        startTime = time.monotonic()
+
+        with ThreadPoolExecutor(max_workers=window) as writer:
+            for filename in list(toRequest if useCache else []):
+                cached = self._loadFromCache(filename)
+                if cached is None:
+                    continue
+                toRequest.remove(filename)
+                if path is None:
+                    report.files[filename] = cached
+                else:
+                    writes[filename] = writer.submit(self._writeFile, cached, path)
+
+            while len(toRequest) > 0 or len(outstanding) > 0:
+                while len(toRequest) > 0 and len(outstanding) < window:
+                    filename = toRequest.popleft()
+                    outstanding[self._normalizeRemotePath(filename)] = filename
+                    self.remoteConnection.sendTelegram(
+                        f"3,{self._device_name},1,{filename}", message_type=128
+                    )
+
+                file = self._receiveFile(timeout)
+                if file is None:
+                    for filename in outstanding.values():
+                        report.failures[filename] = "no reply within timeout"
+                    outstanding = {}
+                    continue
+
+                filename = outstanding.pop(self._normalizeRemotePath(file.path), None)
+                if filename is None:
+                    # not requested by this call
+                    continue
+
+                report.bytes += len(file.binaryData)
+                if self._file_cache is not None:
+                    self._file_cache.store(file)
+                if path is None:
+                    report.files[filename] = file
+                else:
+                    writes[filename] = writer.submit(self._writeFile, file, path)
+
+        for filename, write in writes.items():
+            try:
+                report.files[filename] = write.result()
+            except OSError as error:
+                report.failures[filename] = f"writing failed: {error}"
+
+        report.seconds = time.monotonic() - startTime
+        return report
+
+    def enableFileCache(self, directory: str) -> FileCache:
+        r"""
+        enable the persistent local cache for transferred files
+
+        The files transferred with :func:`~thales_remote.file_interface.ThalesFileInterface.acquireFile`,
+        :func:`~thales_remote.file_interface.ThalesFileInterface.acquireFiles` and the automatic file exchange are
+        stored in the :class:`~thales_remote.file_cache.FileCache`. If acquireFile and acquireFiles are called with
+        useCache, files already in the cache are not transferred again. The cache persists between runs of the
+        script and can be searched with :func:`~thales_remote.file_cache.FileCache.query`.
+
+        The files of the automatic file exchange are stored by a separate thread, so that hashing and writing
+        do not delay the receiving of the next file.
+
+        :param directory: The directory of the cache.
+        :returns: The file cache.
+        """
+        self.disableFileCache()
+        self._file_cache = FileCache(directory)
+        self.onFile(self._storeInFileCache)
+        return self._file_cache
+
+    def disableFileCache(self) -> None:
+        r"""
+        disable the local file cache, the files in the cache directory remain
+
+        Files which are still waiting to be stored are stored before the method returns.
+        """
+        if self._file_cache is not None:
+            self.removeFileCallback(self._storeInFileCache)
+            self._waitForStorageWorker()
+            self._file_cache = None
+        return
+
+    def getFileCache(self) -> Optional[FileCache]:
+        r"""
+        get the local file cache
+
+        :returns: The file cache or None if it is not enabled.
+        """
+        return self._file_cache
+
+    def enableFileArchive(
+        self,
+        directory: str,
+        compression: ArchiveCompression = ArchiveCompression.ZLIB,
+        maxArchiveSize: int = 256 * 1024 * 1024,
+    ) -> FileArchive:
+        r"""
+        append every received file to a rolling compressed archive
+
+        The files of the automatic file exchange are compressed and appended to the archive files of the
+        :class:`~thales_remote.file_archive.FileArchive` instead of being kept as separate files. Single files are
+        found with :func:`~thales_remote.file_archive.FileArchive.query` and read back with
+        :func:`~thales_remote.file_archive.FileArchive.read`.
+
+        The files are compressed and appended by a separate thread, so that the compression does not delay the
+        receiving of the next file. A file therefore appears in the archive shortly after it was received.
+
+        :param directory: The directory of the archives.
+        :param compression: Compression of the files, zlib or lzma.
+        :param maxArchiveSize: Maximum size of an archive file in bytes.
+        :returns: The file archive.
+        """
+        self.disableFileArchive()
+        self._file_archive = FileArchive(directory, compression, maxArchiveSize)
+        self.onFile(self._appendToFileArchive)
+        return self._file_archive
+
+    def disableFileArchive(self) -> None:
+        r"""
+        stop archiving the received files, the archives remain
+
+        Files which are still waiting to be archived are appended before the method returns.
+        """
+        if self._file_archive is not None:
+            self.removeFileCallback(self._appendToFileArchive)
+            self._waitForStorageWorker()
+            self._file_archive = None
+        return
+
+    def getFileArchive(self) -> Optional[FileArchive]:
+        r"""
+        get the file archive
+
+        :returns: The file archive or None if it is not enabled.
+        """
+        return self._file_archive
 
     def setSavePath(self, path: str) -> None:
         r"""
@@ -211,7 +533,11 @@ class ThalesFileInterface(object):
         return
 
     def enableSaveReceivedFilesToDisk(
-        self, enable: bool = True, path: Optional[str] = None
+        self,
+        enable: bool = True,
+        path: Optional[str] = None,
+        fsyncPolicy: FsyncPolicy = FsyncPolicy.NEVER,
+        maxQueueSize: int = 16,
     ) -> None:
         r"""
         enable the automatic saving of files to the hard disk
@@ -221,12 +547,28 @@ class ThalesFileInterface(object):
         The path must be accessible by Python, otherwise there are no restrictions on the path.
         Default path is the current working directory of Python.
 
+        The files are written by a separate :class:`~thales_remote.file_writer.FileWriter` thread, so that a slow
+        disk does not delay the receiving of the next file. Existing files are not overwritten, instead a number
+        is appended to the name. When saving is disabled, the queued files are written before the method returns.
+        If a file could not be written, the error is raised when saving is reconfigured or disabled and it stops
+        the automatic file exchange when the next file is saved.
+
         :param enable: Enable automatic file saving to the hard disk. Default = True.
         :param path: Optional path where the files should be saved. For example r"D:\\myLocalDirectory".
+        :param fsyncPolicy: When the written files are flushed to the storage device.
+        :param maxQueueSize: Maximum number of received files waiting to be written.
         """
         if path is not None:
             self.setSavePath(path)
-        self._save_received_files_to_disk = enable
+        with self._file_writer_mutex:
+            previousWriter = self._file_writer
+            self._file_writer = (
+                FileWriter(maxQueueSize, fsyncPolicy) if enable else None
+            )
+            self._save_received_files_to_disk = enable
+        if previousWriter is not None:
+            previousWriter.close()
+        self._raiseFileWriterError()
         return
 
     def disableSaveReceivedFilesToDisk(self) -> None:
@@ -235,6 +577,46 @@ class ThalesFileInterface(object):
         """
         return self.enableSaveReceivedFilesToDisk(False)
 
+    def getFileWriterStatistics(self) -> Optional[FileWriterStatistics]:
+        r"""
+        get the queue depth and write latencies of the saving to disk
+
+        :returns: The statistics or None if saving to disk is disabled.
+        """
+        with self._file_writer_mutex:
+            if self._file_writer is None:
+                return None
+            return self._file_writer.getStatistics()
+
+    def getTransferStatistics(self) -> TransferStatisticsSnapshot:
+        r"""
+        get the performance of the file transfers
+
+        For every transferred file the time from the announcement of the path to the last chunk, the number of
+        bytes and chunks and the chunk sizes are recorded. The times are taken when the telegrams are read from
+        the socket, so they measure the network transfer even if the files are processed later or written to disk.
+        The snapshot contains the totals, rolling values of the last 100 files and the distribution of the chunk
+        sizes.
+
+        :returns: The snapshot of the statistics.
+        """
+        return self._transfer_statistics.getSnapshot()
+
+    def getTransferRecords(self) -> list[FileTransferRecord]:
+        r"""
+        get the measured values of the last 100 file transfers
+
+        :returns: List with the records, the last transfer at the end.
+        """
+        return self._transfer_statistics.getRecords()
+
+    def resetTransferStatistics(self) -> None:
+        r"""
+        delete the collected values of the file transfers
+        """
+        self._transfer_statistics.reset()
+        return
+
     def enableKeepReceivedFilesInObject(self, enable: bool = True) -> None:
         r"""Enable that the files remain in the Python object.
 
@@ -242,6 +624,9 @@ class ThalesFileInterface(object):
         number of files, so you can disable that the files are stored in the object as an array.
         By default, the files remain in the object.
 
+        If the files do not remain in the object and are saved to disk, they are streamed directly into the
+        file on disk without keeping the whole file in memory.
+
         :param enable: True = Allow the files to remain in the object.
         """
         self._keep_files_in_object = enable
@@ -253,16 +638,39 @@ class ThalesFileInterface(object):
         """
         return self.enableKeepReceivedFilesInObject(False)
 
+    def setReceivedFilesMemoryBudget(
+        self, maxBytes: Optional[int], cacheDirectory: Optional[str] = None
+    ) -> None:
+        r"""
+        Limit the memory used by the files in the Python object.
+
+        If the files in the object exceed the budget, the least recently used files are written to the cache
+        directory and removed from memory. They remain in the object and are read back from the cache
+        directory as bytes when they are read with
+        :func:`~thales_remote.file_interface.ThalesFileInterface.getReceivedFiles`
+        or :func:`~thales_remote.file_interface.ThalesFileInterface.getLatestReceivedFile`.
+        The latest received file always stays in memory.
+        By default there is no limit.
+
+        :param maxBytes: Maximum number of bytes kept in memory, None for no limit.
+        :param cacheDirectory: Optional directory for the files removed from memory.
+            By default a temporary directory is used.
+        """
+        self.receivedFiles.setMemoryBudget(maxBytes, cacheDirectory)
+        return
+
     def getReceivedFiles(self) -> list[FileData]:
         r"""
         read all files from the Python object
 
         This function returns an array. Each element in the array is a dictionary as described in
         function :func:`~thales_remote.file_interface.ThalesFileInterface.aquireFile`.
+        Files that were removed from memory because of the memory budget contain a read only memory map
+        of the file as binary data.
 
         :returns: Array with the files from the Python object.
         """
-        return self.receivedFiles
+        return list(self.receivedFiles)
 
     def getLatestReceivedFile(self) -> FileData:
         r"""
@@ -276,56 +684,429 @@ class ThalesFileInterface(object):
         r"""
         delete all files from the Python object
         """
-        self.receivedFiles = []
+        self.receivedFiles.clear()
+        return
+
+    def onFile(
+        self, callback: Callable[[FileData], None]
+    ) -> Callable[[FileData], None]:
+        r"""
+        register a function which is called for every received file
+
+        The function is called by the thread receiving the files, after the file was stored in the object and
+        saved to disk, if this is enabled. It should return quickly, because no further file is received while it
+        runs. Exceptions raised by the function are reported as warning.
+
+        :param callback: Function which is called with the :class:`.FileData` of every received file.
+        :returns: The passed function, so that the method can also be used as decorator.
+        """
+        with self._file_condition:
+            self._file_callbacks.append(callback)
+        return callback
+
+    def removeFileCallback(self, callback: Callable[[FileData], None]) -> None:
+        r"""
+        remove a function registered with :func:`~thales_remote.file_interface.ThalesFileInterface.onFile`
+
+        :param callback: The registered function.
+        """
+        with self._file_condition:
+            self._file_callbacks.remove(callback)
+        return
+
+    def waitForFile(
+        self, pattern: str = "*", timeout: Optional[float] = None
+    ) -> Union[FileData, None]:
+        r"""
+        wait until a file matching the pattern was received
+
+        Returns the first matching file that was received after the file returned by the previous call of this
+        method with the same pattern. Files received before the call are also considered, so that a file that
+        arrived while the measurement command was still running is not missed. Calls with different patterns
+        do not influence each other. Only the last 32 received files are remembered.
+
+        :param pattern: Unix shell-style wildcard for the file name, for example "*.ism".
+        :param timeout: The timeout in seconds, blocking at None.
+        :returns: The received file or None if no matching file was received within the timeout.
+        :raises TermConnectionError: If the thread receiving the files has stopped with an error.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._file_condition:
+            while True:
+                if self._receiver_error is not None:
+                    raise TermConnectionError(
+                        f"The file receiver stopped with an error: {self._receiver_error!r}"
+                    ) from self._receiver_error
+
+                cursor = self._wait_cursors.get(pattern, 0)
+                for number, file in self._recent_files:
+                    if number > cursor and fnmatch.fnmatch(file.name, pattern):
+                        self._wait_cursors[pattern] = number
+                        return file
+
+                if deadline is None:
+                    self._file_condition.wait()
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return None
+                    self._file_condition.wait(remaining)
+
+    def subscribeFiles(self, maxsize: int = 0) -> queue.Queue[Optional[FileData]]:
+        r"""
+        get a queue into which every received file is put
+
+        When the automatic file exchange is stopped, None is put into the queue.
+
+        :param maxsize: Maximum size of the queue. If the queue is full, the file is not put into this queue.
+        :returns: The queue with the received files.
+        """
+        subscriber: queue.Queue[Optional[FileData]] = queue.Queue(maxsize)
+        with self._file_condition:
+            self._file_subscribers.append(subscriber)
+        return subscriber
+
+    def unsubscribeFiles(self, subscriber: queue.Queue[Optional[FileData]]) -> None:
+        r"""
+        stop putting the received files into a queue from :func:`~thales_remote.file_interface.ThalesFileInterface.subscribeFiles`
+
+        :param subscriber: The queue.
+        """
+        with self._file_condition:
+            self._file_subscribers.remove(subscriber)
         return
 
+    def enablePostProcessing(
+        self,
+        callback: Optional[Callable[[ProcessedFile], None]] = None,
+        workers: Optional[int] = None,
+        mpContext: Optional[multiprocessing.context.BaseContext] = None,
+    ) -> FilePostProcessor:
+        r"""
+        parse every received file in a pool of processes
+
+        Every received file is passed to a :class:`~thales_remote.post_processing.FilePostProcessor`, which parses
+        it with the matching importer of zahner_analysis in a worker process and extracts the arrays of the file,
+        for example frequency, impedance and phase for ism files. The receiving of further files continues while
+        the files are parsed.
+
+        The results are passed to the callback and put into the queue
+        :attr:`~thales_remote.post_processing.FilePostProcessor.results` of the returned object.
+        The worker processes are spawned, so the script must be protected with ``if __name__ == "__main__":``.
+
+        :param callback: Optional function which is called with every :class:`~thales_remote.post_processing.ProcessedFile`.
+        :param workers: Number of worker processes, default is the number of cores.
+        :param mpContext: Optional multiprocessing context for the worker processes, default is the "spawn" context.
+        :returns: The post processor.
+        """
+        self.disablePostProcessing()
+        self._post_processor = FilePostProcessor(callback, workers, mpContext=mpContext)
+        self.onFile(self._post_processor.submit)
+        return self._post_processor
+
+    def disablePostProcessing(self, wait: bool = True) -> None:
+        r"""
+        stop parsing the received files and shut down the process pool
+
+        :param wait: If True wait until all submitted files are parsed.
+        """
+        if self._post_processor is not None:
+            self.removeFileCallback(self._post_processor.submit)
+            self._post_processor.close(wait)
+            self._post_processor = None
+        return
+
+    def iterateReceivedFiles(
+        self, timeout: Optional[float] = None
+    ) -> Iterator[FileData]:
+        r"""
+        iterate over the files as they are received
+
+        .. code-block:: python
+
+            for file in fileInterface.iterateReceivedFiles():
+                ismFile = IsmImport(file.binaryData)
+
+        The iteration ends when the automatic file exchange is stopped or no file was received within the timeout.
+        The files are collected from the call of this method on, also before the iteration starts.
+
+        :param timeout: Maximum time in seconds to wait for the next file, blocking at None.
+        :returns: Generator with the received files.
+        """
+        return self._iterateSubscriber(self.subscribeFiles(), timeout)
+
     # The following methods should not be called by the user.
     # They are marked with the prefix '_' after the Python convention for proteced.
 
+    def _iterateSubscriber(
+        self, subscriber: queue.Queue[Optional[FileData]], timeout: Optional[float]
+    ) -> Iterator[FileData]:
+        r"""
+        generator over the files of a subscribed queue, which is unsubscribed at the end
+        """
+        try:
+            while True:
+                try:
+                    file = subscriber.get(timeout=timeout)
+                except Empty:
+                    return
+                if file is None:
+                    return
+                yield file
+        finally:
+            self.unsubscribeFiles(subscriber)
+
     def _saveReceivedFile(self, fileToWrite: FileData) -> None:
         r"""
-        saves the passed file to disk.
+        queues the passed file for saving to disk.
+
+        An error of a previously queued file is raised, so that the receiver thread stops.
+        """
+        self._raiseFileWriterError()
+        with self._file_writer_mutex:
+            if not self._save_received_files_to_disk:
+                # saving was disabled while the file was received
+                return
+            if self._file_writer is None:
+                self._file_writer = FileWriter()
+            future = self._file_writer.submit(fileToWrite, self.pathToSave)
+        future.add_done_callback(self._fileWriteDone)
+        return
+
+    def _fileWriteDone(self, future: Future) -> None:
+        r"""
+        called by the writer thread when a file is written; keeps the first error
+        """
+        exception = future.exception()
+        if exception is not None and self._file_writer_error is None:
+            self._file_writer_error = exception
+        return
+
+    def _raiseFileWriterError(self) -> None:
+        r"""
+        raises the kept error of the file writer once
         """
-        fileNameWithPath = os.path.join(self.pathToSave, fileToWrite.name)
+        error = self._file_writer_error
+        self._file_writer_error = None
+        if error is not None:
+            raise error
+        return
 
-        with open(fileNameWithPath, "wb") as file:
-            file.write(fileToWrite.binaryData)
+    def _closeFileWriter(self) -> None:
+        r"""
+        writes the queued files, stops the writer thread and raises a write error
+        """
+        with self._file_writer_mutex:
+            writer = self._file_writer
+            self._file_writer = None
+        if writer is not None:
+            writer.close()
+        self._raiseFileWriterError()
         return
 
-    def _receiveFile(self, timeout: Optional[float] = None) -> Union[FileData, None]:
+    def _storeInFileCache(self, file: FileData) -> None:
+        r"""
+        called by the receiver thread; queues the file for the file cache
+        """
+        fileCache = self._file_cache
+        if fileCache is not None:
+            self._submitToStorageWorker(fileCache.store, file)
+        return
+
+    def _appendToFileArchive(self, file: FileData) -> None:
+        r"""
+        called by the receiver thread; queues the file for the file archive
+        """
+        fileArchive = self._file_archive
+        if fileArchive is not None:
+            self._submitToStorageWorker(fileArchive.append, file)
+        return
+
+    def _submitToStorageWorker(
+        self, function: Callable[[FileData], object], file: FileData
+    ) -> None:
+        r"""
+        calls a function with a received file in the storage thread
+
+        Blocks if too many files are waiting, so that a slow disk slows down the receiving instead of
+        filling the memory. The files are processed in the order in which they were received.
+        """
+        self._storage_slots.acquire()
+        if self._storage_worker is None:
+            self._storage_worker = ThreadPoolExecutor(max_workers=1)
+        future = self._storage_worker.submit(function, file)
+        future.add_done_callback(self._storageDone)
+        return
+
+    def _storageDone(self, future: Future) -> None:
+        r"""
+        called by the storage thread when a file is processed; reports an error as warning
+        """
+        self._storage_slots.release()
+        exception = future.exception()
+        if exception is not None:
+            warnings.warn(
+                f"Exception while storing a received file: {exception!r}",
+                RuntimeWarning,
+            )
+        return
+
+    def _waitForStorageWorker(self) -> None:
+        r"""
+        waits until the queued files are stored
+        """
+        if self._storage_worker is not None:
+            self._storage_worker.submit(lambda: None).result()
+        return
+
+    def _closeStorageWorker(self) -> None:
+        r"""
+        stores the queued files and stops the storage thread
+        """
+        if self._storage_worker is not None:
+            self._storage_worker.shutdown(wait=True)
+            self._storage_worker = None
+        return
+
+    def _loadFromCache(self, filename: str) -> Union[FileData, None]:
+        r"""
+        read a file from the cache if the cache is enabled and contains the file
+        """
+        if self._file_cache is None:
+            return None
+        entry = self._file_cache.lookup(filename)
+        if entry is None:
+            return None
+        return self._file_cache.load(entry)
+
+    def _normalizeRemotePath(self, path: str) -> str:
+        r"""
+        normalize a path on the Thales computer for comparison
+        """
+        return path.replace("/", "\\").lower()
+
+    def _writeFile(self, file: FileData, directory: str) -> FileData:
+        r"""
+        write a file into a directory with :func:`~thales_remote.file_writer.writeFileAtomically`
+
+        :returns: the file with the local path and without binary data
+        """
+        localPath = writeFileAtomically(
+            directory, file.name, lambda localFile: localFile.write(file.binaryData)
+        )
+        return FileData(file.name, file.path, None, localPath)
+
+    def _receiveFile(
+        self, timeout: Optional[float] = None, directory: Optional[str] = None
+    ) -> Union[FileData, None]:
         r"""
         receive one file with optional timeout
 
+        Without directory, the file is received into a buffer which is allocated with the announced length.
+        With directory, the chunks are written with :func:`~thales_remote.file_writer.writeFileAtomically` into a
+        temporary file in the directory, which is renamed to a free name when all chunks are received, like the
+        files saved by the :class:`~thales_remote.file_writer.FileWriter`. Files to skip are always received into
+        memory.
+
         :param timeout: receive timeout
-        :returns: structure with the file
+        :param directory: optional local directory into which the file is streamed
+        :returns: structure with the file or None on timeout or interruption
         """
 
         try:
-            filePath: str = self.remoteConnection.waitForStringTelegram(
-                130, timeout=timeout
+            pathTelegram, announcementTime = (
+                self.remoteConnection.waitForBinaryTelegramWithTime(
+                    130, timeout=timeout
+                )
             )
         except Empty:
             return None
+        if len(pathTelegram) == 0:
+            # woken up by interruptWaitForTelegram
+            return None
+        filePath: str = pathTelegram.decode("ASCII")
 
-        fileLength = int(self.remoteConnection.waitForStringTelegram(129))
-        bytesToReceive = fileLength
-
-        fileData = bytearray()
-        while bytesToReceive > 0:
-            receivedBytes = self.remoteConnection.waitForBinaryTelegram(131)
-            fileData += receivedBytes
-            bytesToReceive -= len(receivedBytes)
+        lengthTelegram, lastArrivalTime = (
+            self.remoteConnection.waitForBinaryTelegramWithTime(129)
+        )
+        fileLength = int(lengthTelegram.decode("ASCII"))
 
         fileSplit = filePath.split("\\")
         fileName = fileSplit[-1]
 
-        return FileData(fileName, filePath, fileData)
+        if directory is None or fileName in self._files_to_skip:
+            fileData = bytearray(fileLength)
+            fileView = memoryview(fileData)
+            position = 0
+
+            def writeChunk(chunk: bytes) -> None:
+                nonlocal position
+                fileView[position : position + len(chunk)] = chunk
+                position += len(chunk)
+                return
+
+            chunkSizes, lastArrivalTime = self._receiveChunks(
+                fileLength, writeChunk, lastArrivalTime
+            )
+            fileView.release()
+            self._transfer_statistics.record(
+                fileName, chunkSizes, lastArrivalTime - announcementTime
+            )
+            return FileData(fileName, filePath, fileData)
+
+        chunkSizes = []
+
+        def writeChunks(file: BinaryIO) -> None:
+            nonlocal lastArrivalTime
+            receivedSizes, lastArrivalTime = self._receiveChunks(
+                fileLength, file.write, lastArrivalTime
+            )
+            chunkSizes.extend(receivedSizes)
+            return
+
+        localPath = writeFileAtomically(directory, fileName, writeChunks)
+        self._transfer_statistics.record(
+            fileName, chunkSizes, lastArrivalTime - announcementTime
+        )
+        return FileData(fileName, filePath, None, localPath)
+
+    def _receiveChunks(
+        self,
+        fileLength: int,
+        writeChunk: Callable[[bytes], None],
+        lastArrivalTime: float,
+    ) -> tuple[list[int], float]:
+        r"""
+        receive the chunks of a file and pass them to a function
+
+        :param fileLength: announced length of the file
+        :param writeChunk: function which is called with every chunk
+        :param lastArrivalTime: reception time of the length telegram, returned if the file is empty
+        :returns: the sizes of the received chunks and the reception time of the last chunk
+        """
+        chunkSizes = []
+        bytesToReceive = fileLength
+        while bytesToReceive > 0:
+            receivedBytes, lastArrivalTime = (
+                self.remoteConnection.waitForBinaryTelegramWithTime(131)
+            )
+            if len(receivedBytes) > bytesToReceive:
+                raise TermConnectionError("Received more file data than announced.")
+            writeChunk(receivedBytes)
+            chunkSizes.append(len(receivedBytes))
+            bytesToReceive -= len(receivedBytes)
+        return chunkSizes, lastArrivalTime
 
     def _startWorker(self) -> None:
         r"""
         starts the thread handling the asyncronously incoming data
+
+        A thread which has stopped is cleaned up with :func:`_stopWorker` first, which raises its error.
         """
-        if not self._receiver_is_running:
+        if self.receivingWorker is not None and not self.receivingWorker.is_alive():
+            self._stopWorker()
+        if self.receivingWorker is None:
+            self._receiver_error = None
             self._receiver_is_running = True
             self.receivingWorker = threading.Thread(target=self._fileReceiverJob)
             self.receivingWorker.start()
@@ -334,26 +1115,86 @@ class ThalesFileInterface(object):
     def _stopWorker(self) -> None:
         r"""
         stops the thread handling the incoming data gracefully
+
+        The thread is woken up with an empty telegram after the queued files and stops immediately.
+        If the thread has stopped with an error, it is raised as TermConnectionError.
         """
-        if self._receiver_is_running:
-            self._receiver_is_running = False
-            self.receivingWorker.join()
+        if self.receivingWorker is None:
+            return
+
+        if self.receivingWorker.is_alive():
+            self.remoteConnection.interruptWaitForTelegram(130)
+        self.receivingWorker.join()
+        self.receivingWorker = None
+        self._receiver_is_running = False
+
+        error = self._receiver_error
+        self._receiver_error = None
+        if error is not None:
+            raise TermConnectionError(
+                f"The file receiver stopped with an error: {error!r}"
+            ) from error
         return
 
     def _fileReceiverJob(self) -> None:
         r"""
         method running in a separate thread; manages the received files
+
+        Blocks until the next file is announced and stops when it is woken up with an empty telegram.
+        An exception stops the thread, it is stored and raised when the worker is stopped.
+        """
+        try:
+            while True:
+                streamToDisk = (
+                    self._save_received_files_to_disk and not self._keep_files_in_object
+                )
+                file = self._receiveFile(
+                    directory=self.pathToSave if streamToDisk else None
+                )
+                if file is None:
+                    break
+
+                if file.name not in self._files_to_skip:
+                    if self._keep_files_in_object:
+                        self.receivedFiles.append(file)
+
+                    if self._save_received_files_to_disk and file.localPath is None:
+                        self._saveReceivedFile(file)
+
+                    self._dispatchReceivedFile(file)
+        except Exception as exception:
+            self._receiver_error = exception
+        finally:
+            self._receiver_is_running = False
+            with self._file_condition:
+                self._file_condition.notify_all()
+                for subscriber in self._file_subscribers:
+                    try:
+                        subscriber.put_nowait(None)
+                    except queue.Full:
+                        pass
+        return
+
+    def _dispatchReceivedFile(self, file: FileData) -> None:
+        r"""
+        notify the waiting threads, subscribed queues and registered functions about a received file
         """
-        while self._receiver_is_running:
+        with self._file_condition:
+            self._received_counter += 1
+            self._recent_files.append((self._received_counter, file))
+            self._file_condition.notify_all()
+            callbacks = list(self._file_callbacks)
+            for subscriber in self._file_subscribers:
+                try:
+                    subscriber.put_nowait(file)
+                except queue.Full:
+                    pass
+
+        for callback in callbacks:
             try:
-                file = self._receiveFile(1)
-                if file is not None:
-                    if file.name not in self._files_to_skip:
-                        if self._keep_files_in_object:
-                            self.receivedFiles.append(file)
-
-                        if self._save_received_files_to_disk:
-                            self._saveReceivedFile(file)
-            except:
-                self._receiver_is_running = False
+                callback(file)
+            except Exception as exception:
+                warnings.warn(
+                    f"Exception in file callback: {exception!r}", RuntimeWarning
+                )
         return
@@ -0,0 +1,255 @@
+r"""
+  ____       __                        __    __   __      _ __
+ /_  / ___ _/ /  ___  ___ ___________ / /__ / /__/ /_____(_) /__
+  / /_/ _ `/ _ \/ _ \/ -_) __/___/ -_) / -_)  '_/ __/ __/ /  '_/
+ /___/\_,_/_//_/_//_/\__/_/      \__/_/\__/_/\_\\__/_/ /_/_/\_\
+
+Copyright 2024 Zahner-Elektrik GmbH & Co. KG
+
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the Software
+is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH
+THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import dataclasses
+import os
+import tempfile
+import threading
+import warnings
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterator, Optional, Union
+
+if TYPE_CHECKING:
+    from thales_remote.file_interface import FileData
+
+
+@dataclass
+class _StoredFile:
+    r"""
+    Entry of the store. The binary data of the file is None if the file was written to diskPath
+    or streamed to its local path. diskPath stays set when the file is read back into memory.
+    """
+
+    file: "FileData"
+    diskPath: Optional[str]
+
+
+class ReceivedFileStore(object):
+    r"""Store for the received files with a limit for the memory usage.
+
+    The files are kept in the order in which they were received. If a memory budget is set and the files in
+    memory exceed it, the least recently used files are written into the cache directory and removed from memory.
+    The file that was received last always stays in memory. When a removed file is read again, it is read back
+    from the cache directory and kept in memory as the most recently used file.
+
+    Files that were streamed to disk by the :class:`~thales_remote.file_interface.ThalesFileInterface`
+    do not use memory and are read from their local path every time they are accessed.
+
+    The store can be read like the list which was used before: with an index, a negative index, a slice, which
+    returns a list of the files, len and iteration. The binary data of the returned files is always bytes.
+
+    All methods are thread safe.
+
+    :param memoryBudget: Maximum number of bytes kept in memory, None for no limit.
+    :param cacheDirectory: Directory for the files removed from memory. If None a temporary directory is created
+        when the first file has to be removed from memory.
+    """
+
+    _memory_budget: Optional[int]
+    _cache_directory: Optional[str]
+    _files: list[_StoredFile]
+    _in_memory: OrderedDict[int, _StoredFile]
+    _memory_usage: int
+    _spill_counter: int
+    _mutex: threading.RLock
+
+    def __init__(
+        self, memoryBudget: Optional[int] = None, cacheDirectory: Optional[str] = None
+    ):
+        self._memory_budget = memoryBudget
+        self._cache_directory = cacheDirectory
+        self._files = []
+        self._in_memory = OrderedDict()
+        self._memory_usage = 0
+        self._spill_counter = 0
+        self._mutex = threading.RLock()
+        return
+
+    def setMemoryBudget(
+        self, memoryBudget: Optional[int], cacheDirectory: Optional[str] = None
+    ) -> None:
+        r"""
+        set the memory budget and optionally the cache directory
+
+        Files exceeding the new budget are removed from memory immediately.
+
+        :param memoryBudget: Maximum number of bytes kept in memory, None for no limit.
+        :param cacheDirectory: Optional new directory for the files removed from memory.
+        """
+        with self._mutex:
+            self._memory_budget = memoryBudget
+            if cacheDirectory is not None:
+                self._cache_directory = cacheDirectory
+            self._evict()
+        return
+
+    def getMemoryUsage(self) -> int:
+        r"""
+        get the number of bytes of the files in memory
+
+        :returns: number of bytes
+        """
+        with self._mutex:
+            return self._memory_usage
+
+    def append(self, file: "FileData") -> None:
+        r"""
+        add a received file to the store
+
+        :param file: The received file.
+        """
+        with self._mutex:
+            entry = _StoredFile(file, None)
+            self._files.append(entry)
+            if file.binaryData is not None:
+                self._in_memory[id(entry)] = entry
+                self._memory_usage += len(file.binaryData)
+                self._evict(keep=entry)
+        return
+
+    def clear(self) -> None:
+        r"""
+        remove all files from the store and delete the files in the cache directory
+        """
+        with self._mutex:
+            for entry in self._files:
+                if entry.diskPath is not None:
+                    try:
+                        os.remove(entry.diskPath)
+                    except OSError:
+                        # already removed by the user
+                        pass
+            self._files = []
+            self._in_memory = OrderedDict()
+            self._memory_usage = 0
+        return
+
+    def __len__(self) -> int:
+        with self._mutex:
+            return len(self._files)
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union["FileData", list["FileData"]]:
+        with self._mutex:
+            if isinstance(index, slice):
+                return [self._load(entry) for entry in self._files[index]]
+            return self._load(self._files[index])
+
+    def __iter__(self) -> Iterator["FileData"]:
+        with self._mutex:
+            entries = list(self._files)
+        for entry in entries:
+            with self._mutex:
+                file = self._load(entry)
+            yield file
+
+    # The following methods should not be called by the user.
+    # They are marked with the prefix '_' after the Python convention for proteced.
+
+    def _load(self, entry: _StoredFile) -> "FileData":
+        r"""
+        return the file of an entry and mark it as recently used
+
+        A file from the cache directory is read back into memory, a streamed file is only read.
+        """
+        if entry.file.binaryData is not None:
+            self._in_memory.move_to_end(id(entry))
+            return entry.file
+
+        if entry.diskPath is None:
+            return dataclasses.replace(
+                entry.file, binaryData=self._readFile(entry.file.localPath)
+            )
+
+        binaryData = self._readFile(entry.diskPath)
+        entry.file = dataclasses.replace(entry.file, binaryData=binaryData)
+        self._in_memory[id(entry)] = entry
+        self._memory_usage += len(binaryData)
+        self._evict(keep=entry)
+        return entry.file
+
+    def _readFile(self, path: str) -> bytes:
+        r"""
+        read a file completely
+        """
+        with open(path, "rb") as file:
+            return file.read()
+
+    def _evict(self, keep: Optional[_StoredFile] = None) -> None:
+        r"""
+        write the least recently used files to the cache directory until the budget is met
+
+        If a file cannot be written, it stays in memory and a RuntimeWarning is issued.
+
+        :param keep: entry which is not removed from memory
+        """
+        if self._memory_budget is None:
+            return
+        for key, entry in list(self._in_memory.items()):
+            if self._memory_usage <= self._memory_budget:
+                break
+            if entry is keep:
+                continue
+            try:
+                self._spill(entry)
+            except OSError as exception:
+                warnings.warn(
+                    f"Received file could not be removed from memory: {exception!r}",
+                    RuntimeWarning,
+                )
+                break
+            del self._in_memory[key]
+        return
+
+    def _spill(self, entry: _StoredFile) -> None:
+        r"""
+        write a file to the cache directory and remove it from memory
+
+        A file which was already written before is not written again.
+        """
+        if entry.diskPath is None:
+            if self._cache_directory is None:
+                self._cache_directory = tempfile.mkdtemp(prefix="thales_remote_")
+            os.makedirs(self._cache_directory, exist_ok=True)
+
+            diskPath = os.path.join(
+                self._cache_directory, f"{self._spill_counter:08d}_{entry.file.name}"
+            )
+            self._spill_counter += 1
+            try:
+                with open(diskPath, "wb") as file:
+                    file.write(entry.file.binaryData)
+            except OSError:
+                if os.path.exists(diskPath):
+                    os.remove(diskPath)
+                raise
+            entry.diskPath = diskPath
+
+        self._memory_usage -= len(entry.file.binaryData)
+        entry.file = dataclasses.replace(entry.file, binaryData=None)
+        return
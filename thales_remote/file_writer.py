@@ -0,0 +1,272 @@
+r"""
+  ____       __                        __    __   __      _ __
+ /_  / ___ _/ /  ___  ___ ___________ / /__ / /__/ /_____(_) /__
+  / /_/ _ `/ _ \/ _ \/ -_) __/___/ -_) / -_)  '_/ __/ __/ /  '_/
+ /___/\_,_/_//_/_//_/\__/_/      \__/_/\__/_/\_\\__/_/ /_/_/\_\
+
+Copyright 2024 Zahner-Elektrik GmbH & Co. KG
+
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the Software
+is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH
+THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import TYPE_CHECKING, BinaryIO, Callable
+
+if TYPE_CHECKING:
+    from thales_remote.file_interface import FileData
+
+
+class FsyncPolicy(IntEnum):
+    r"""
+    Options when the written files are flushed to the storage device.
+
+    * NEVER: the operating system decides when the data is written
+    * FILE: the file is synchronized before it is renamed
+    * FILE_AND_DIRECTORY: additionally the directory is synchronized after the rename, if the platform supports it
+    """
+
+    NEVER = 0
+    FILE = 1
+    FILE_AND_DIRECTORY = 2
+
+
+_reservation_mutex = threading.Lock()
+_reserved_paths: set[str] = set()
+
+
+def writeFileAtomically(
+    directory: str,
+    name: str,
+    write: Callable[[BinaryIO], None],
+    fsyncPolicy: FsyncPolicy = FsyncPolicy.NEVER,
+) -> str:
+    r"""
+    Write a file into a directory without overwriting existing files.
+
+    The content is written into a temporary file, which is renamed when it is complete, so that no half written
+    files are visible. If a file with the same name already exists or is being written by another thread,
+    a number is appended to the name instead of overwriting it.
+
+    :param directory: The directory into which the file is written.
+    :param name: The name of the file.
+    :param write: Function which writes the content into the opened temporary file.
+    :param fsyncPolicy: When the file is flushed to the storage device.
+    :returns: The local path of the written file.
+    """
+    localPath = _reservePath(directory, name)
+    temporaryPath = localPath + ".part"
+    try:
+        with open(temporaryPath, "wb") as localFile:
+            write(localFile)
+            if fsyncPolicy >= FsyncPolicy.FILE:
+                localFile.flush()
+                os.fsync(localFile.fileno())
+        os.replace(temporaryPath, localPath)
+        if fsyncPolicy >= FsyncPolicy.FILE_AND_DIRECTORY:
+            _syncDirectory(directory)
+    except:
+        if os.path.exists(temporaryPath):
+            os.remove(temporaryPath)
+        raise
+    finally:
+        with _reservation_mutex:
+            _reserved_paths.discard(localPath)
+    return localPath
+
+
+def _reservePath(directory: str, name: str) -> str:
+    r"""
+    find a path which neither exists nor is being written
+    """
+    root, extension = os.path.splitext(name)
+    counter = 0
+    with _reservation_mutex:
+        while True:
+            candidate = os.path.join(
+                directory,
+                name if counter == 0 else f"{root}_{counter}{extension}",
+            )
+            if candidate not in _reserved_paths and not os.path.exists(candidate):
+                _reserved_paths.add(candidate)
+                return candidate
+            counter += 1
+
+
+def _syncDirectory(directory: str) -> None:
+    r"""
+    synchronize the directory entry, not possible on Windows
+    """
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fileDescriptor = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fileDescriptor)
+    finally:
+        os.close(fileDescriptor)
+    return
+
+
+@dataclass
+class FileWriterStatistics:
+    r"""
+    Statistics of the :class:`.FileWriter`.
+
+    :param queueDepth: Number of files waiting to be written.
+    :param writtenFiles: Number of files written.
+    :param failedFiles: Number of files which could not be written.
+    :param writtenBytes: Number of bytes written.
+    :param lastLatency: Time in seconds from submitting to completing the last file.
+    :param meanLatency: Mean time in seconds from submitting to completing a file.
+    :param maxLatency: Maximum time in seconds from submitting to completing a file.
+    :param meanWriteTime: Mean time in seconds for writing a file without the waiting time in the queue.
+    """
+
+    queueDepth: int
+    writtenFiles: int
+    failedFiles: int
+    writtenBytes: int
+    lastLatency: float
+    meanLatency: float
+    maxLatency: float
+    meanWriteTime: float
+
+
+class FileWriter(object):
+    r"""Class which writes files to disk in a separate thread.
+
+    The files are passed through a bounded queue to the writer thread. If the queue is full, submitting blocks,
+    so that a slow disk slows down the receiving instead of filling the memory.
+
+    Every file is written with :func:`.writeFileAtomically`, so no half written files are visible and existing
+    files are not overwritten.
+
+    :param maxQueueSize: Maximum number of files waiting to be written.
+    :param fsyncPolicy: When the written files are flushed to the storage device.
+    """
+
+    _queue: queue.Queue
+    _fsync_policy: FsyncPolicy
+    _worker: threading.Thread
+    _mutex: threading.Lock
+    _written_files: int
+    _failed_files: int
+    _written_bytes: int
+    _last_latency: float
+    _total_latency: float
+    _max_latency: float
+    _total_write_time: float
+
+    def __init__(
+        self, maxQueueSize: int = 16, fsyncPolicy: FsyncPolicy = FsyncPolicy.NEVER
+    ):
+        self._queue = queue.Queue(maxQueueSize)
+        self._fsync_policy = fsyncPolicy
+        self._mutex = threading.Lock()
+        self._written_files = 0
+        self._failed_files = 0
+        self._written_bytes = 0
+        self._last_latency = 0.0
+        self._total_latency = 0.0
+        self._max_latency = 0.0
+        self._total_write_time = 0.0
+        self._worker = threading.Thread(target=self._writerJob, daemon=True)
+        self._worker.start()
+        return
+
+    def submit(self, file: "FileData", directory: str) -> Future:
+        r"""
+        queue a file for writing
+
+        Blocks if the queue is full.
+
+        :param file: The file with binary data.
+        :param directory: The directory into which the file is written.
+        :returns: Future with the local path of the written file.
+        """
+        result: Future = Future()
+        self._queue.put((file, directory, time.monotonic(), result))
+        return result
+
+    def getStatistics(self) -> FileWriterStatistics:
+        r"""
+        get the queue depth and the write latencies
+
+        :returns: The statistics.
+        """
+        with self._mutex:
+            return FileWriterStatistics(
+                self._queue.qsize(),
+                self._written_files,
+                self._failed_files,
+                self._written_bytes,
+                self._last_latency,
+                self._total_latency / max(self._written_files, 1),
+                self._max_latency,
+                self._total_write_time / max(self._written_files, 1),
+            )
+
+    def close(self) -> None:
+        r"""
+        write the queued files and stop the writer thread
+        """
+        if self._worker.is_alive():
+            self._queue.put(None)
+            self._worker.join()
+        return
+
+    # The following methods should not be called by the user.
+    # They are marked with the prefix '_' after the Python convention for proteced.
+
+    def _writerJob(self) -> None:
+        r"""
+        method running in a separate thread; writes the queued files
+        """
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            file, directory, submitTime, result = item
+            writeStart = time.monotonic()
+            try:
+                localPath = writeFileAtomically(
+                    directory,
+                    file.name,
+                    lambda localFile: localFile.write(file.binaryData),
+                    self._fsync_policy,
+                )
+            except Exception as exception:
+                with self._mutex:
+                    self._failed_files += 1
+                result.set_exception(exception)
+                continue
+
+            completed = time.monotonic()
+            with self._mutex:
+                self._written_files += 1
+                self._written_bytes += len(file.binaryData)
+                self._last_latency = completed - submitTime
+                self._total_latency += self._last_latency
+                self._max_latency = max(self._max_latency, self._last_latency)
+                self._total_write_time += completed - writeStart
+            result.set_result(localPath)
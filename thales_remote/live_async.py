@@ -0,0 +1,200 @@
+r"""
+  ____       __                        __    __   __      _ __
+ /_  / ___ _/ /  ___  ___ ___________ / /__ / /__/ /_____(_) /__
+  / /_/ _ `/ _ \/ _ \/ -_) __/___/ -_) / -_)  '_/ __/ __/ /  '_/
+ /___/\_,_/_//_/_//_/\__/_/      \__/_/\__/_/\_\\__/_/ /_/_/\_\
+
+Copyright 2024 Zahner-Elektrik GmbH & Co. KG
+
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the Software
+is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH
+THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import asyncio
+import struct
+from typing import Optional
+
+from thales_remote.error import TermConnectionError
+from thales_remote.live_data import LiveDataDecoder, LiveDataEvent
+
+_TELEGRAM_HEADER = struct.Struct("<HB")
+
+
+class AsyncLiveDataStream(LiveDataDecoder):
+    r"""Class which receives the online display data of the Thales software with asyncio.
+
+    The stream opens its own connection to Term with :func:`asyncio.open_connection` and registers with the
+    name "Logging", so no thread is needed. The events are the same as of the
+    :class:`~thales_remote.live_data.LiveDataStream`.
+
+    The socket is only read when the next event is requested. If the consumer is slower than the measurement,
+    the data remains in the socket buffers and TCP slows down the sender, instead of an unbounded queue growing
+    in memory. Reading is cancellation safe: the received bytes are buffered before telegrams are separated, so
+    a cancelled read, for example by :func:`asyncio.wait_for`, loses no data.
+
+    .. code-block:: python
+
+        async def main():
+            async with AsyncLiveDataStream() as stream:
+                await stream.connect("localhost")
+                async for event in stream:
+                    print(event)
+
+    :param port: The port of Term.
+    """
+
+    _port: int
+    _reader: Optional[asyncio.StreamReader]
+    _writer: Optional[asyncio.StreamWriter]
+    _buffer: bytearray
+    _connection_name: str
+
+    def __init__(self, port: int = 260):
+        super().__init__()
+        self._port = port
+        self._reader = None
+        self._writer = None
+        self._buffer = bytearray()
+        self._connection_name = "Logging"
+        return
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def connect(self, address: str, connectionName: str = "Logging") -> None:
+        r"""
+        connect to Term and register for the online display data
+
+        :param address: hostname or ip-address of the host running "Term" application
+        :param connectionName: name of the connection, "Logging" for the online display
+        :raises TermConnectionError: If the connection is not possible.
+        """
+        try:
+            self._reader, self._writer = await asyncio.open_connection(
+                address, self._port
+            )
+        except OSError as error:
+            raise TermConnectionError("Connection to the Term not possible.") from error
+
+        self._connection_name = connectionName
+        registrationPacket = bytearray()
+        registrationPacket += struct.pack(">H", len(connectionName))
+        registrationPacket += bytearray([0x12, 0xD0, 0xFF, 0xFF, 0xFF, 0xFF])
+        registrationPacket += bytearray(connectionName, "ASCII")
+        self._writer.write(registrationPacket)
+        await self._writer.drain()
+        return
+
+    def isConnected(self) -> bool:
+        r"""
+        check if the connection to Term is open
+
+        :returns: True if connected, False otherwise
+        """
+        return self._writer is not None
+
+    async def readEvent(
+        self, timeout: Optional[float] = None
+    ) -> Optional[LiveDataEvent]:
+        r"""
+        wait for the next event
+
+        :param timeout: The timeout in seconds, blocking at None.
+        :returns: The event or None on timeout.
+        :raises TermConnectionError: If the connection was closed.
+        """
+        try:
+            return await asyncio.wait_for(self._readEvent(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> LiveDataEvent:
+        try:
+            return await self._readEvent()
+        except TermConnectionError:
+            raise StopAsyncIteration
+
+    async def close(self) -> None:
+        r"""
+        deregister from Term and close the connection
+        """
+        if self._writer is None:
+            return
+        writer = self._writer
+        try:
+            self._sendTelegram(f"3,{self._connection_name},0,RS".encode("ASCII"), 128)
+            self._sendTelegram(bytearray([255, 255]), 4)
+            await writer.drain()
+        except OSError:
+            pass
+        finally:
+            self._writer = None
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+        return
+
+    # The following methods should not be called by the user.
+    # They are marked with the prefix '_' after the Python convention for proteced.
+
+    def _sendTelegram(self, payload: bytes, messageType: int) -> None:
+        if self._writer is None:
+            raise TermConnectionError("Socket error during data transmission.")
+        self._writer.write(_TELEGRAM_HEADER.pack(len(payload), messageType) + payload)
+        return
+
+    async def _readEvent(self) -> LiveDataEvent:
+        r"""
+        read telegrams until one of the online display arrives and decode it
+        """
+        while True:
+            messageType, telegram = await self._readTelegram()
+            if messageType == 2 and len(telegram) > 0:
+                return self.decode(telegram)
+
+    async def _readTelegram(self) -> tuple[int, bytes]:
+        r"""
+        separate the next telegram from the buffer, reading from the socket as needed
+        """
+        while True:
+            if len(self._buffer) >= _TELEGRAM_HEADER.size:
+                length, messageType = _TELEGRAM_HEADER.unpack_from(self._buffer)
+                end = _TELEGRAM_HEADER.size + length
+                if len(self._buffer) >= end:
+                    telegram = bytes(self._buffer[_TELEGRAM_HEADER.size : end])
+                    del self._buffer[:end]
+                    return messageType, telegram
+
+            if self._reader is None or self._writer is None:
+                raise TermConnectionError("Socket error during data reception.")
+            try:
+                data = await self._reader.read(65536)
+            except OSError as error:
+                raise TermConnectionError(
+                    "Socket error during data reception."
+                ) from error
+            if len(data) == 0:
+                raise TermConnectionError("Socket error during data reception.")
+            self._buffer += data
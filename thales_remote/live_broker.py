@@ -0,0 +1,464 @@
+r"""
+  ____       __                        __    __   __      _ __
+ /_  / ___ _/ /  ___  ___ ___________ / /__ / /__/ /_____(_) /__
+  / /_/ _ `/ _ \/ _ \/ -_) __/___/ -_) / -_)  '_/ __/ __/ /  '_/
+ /___/\_,_/_//_/_//_/\__/_/      \__/_/\__/_/\_\\__/_/ /_/_/\_\
+
+Copyright 2024 Zahner-Elektrik GmbH & Co. KG
+
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the Software
+is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH
+THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import threading
+import warnings
+from collections import deque
+from enum import IntEnum
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import (
+    Client,
+    Connection,
+    Listener,
+    answer_challenge,
+    deliver_challenge,
+)
+from typing import Iterator, Optional, Union
+
+from thales_remote.live_data import (
+    ColumnNames,
+    ColumnUnits,
+    LiveDataEvent,
+    LiveDataStream,
+)
+
+
+class DropPolicy(IntEnum):
+    r"""
+    Handling of subscribers which do not read the events fast enough.
+
+    * DROP_OLDEST: the oldest queued event is discarded to make room for the new one
+    * DROP_NEWEST: the new event is discarded
+    * DISCONNECT: the subscriber is disconnected
+    """
+
+    DROP_OLDEST = 0
+    DROP_NEWEST = 1
+    DISCONNECT = 2
+
+
+class _Subscriber(object):
+    r"""
+    Connection of a subscriber with its queue and sending thread.
+    """
+
+    connection: Connection
+    dropped: int
+    _events: deque[LiveDataEvent]
+    _max_queue_size: int
+    _drop_policy: DropPolicy
+    _condition: threading.Condition
+    _closed: bool
+    _aborted: bool
+    _worker: threading.Thread
+
+    def __init__(
+        self, connection: Connection, maxQueueSize: int, dropPolicy: DropPolicy
+    ):
+        self.connection = connection
+        self.dropped = 0
+        self._events = deque()
+        self._max_queue_size = maxQueueSize
+        self._drop_policy = dropPolicy
+        self._condition = threading.Condition()
+        self._closed = False
+        self._aborted = False
+        self._worker = threading.Thread(target=self._senderJob, daemon=True)
+        self._worker.start()
+        return
+
+    def isClosed(self) -> bool:
+        with self._condition:
+            return self._closed
+
+    def put(self, event: LiveDataEvent) -> None:
+        r"""
+        queue an event with the drop policy
+        """
+        with self._condition:
+            if self._closed:
+                return
+            if len(self._events) >= self._max_queue_size:
+                self.dropped += 1
+                if self._drop_policy == DropPolicy.DROP_NEWEST:
+                    return
+                elif self._drop_policy == DropPolicy.DISCONNECT:
+                    self._closed = True
+                    self._aborted = True
+                    self._condition.notify_all()
+                    return
+                self._events.popleft()
+            self._events.append(event)
+            self._condition.notify_all()
+        return
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        r"""
+        send the queued events and close the connection
+
+        If the events could not be sent within the timeout, the connection is closed anyway.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._worker.join(timeout)
+        if self._worker.is_alive():
+            self.connection.close()
+        return
+
+    def _senderJob(self) -> None:
+        r"""
+        method running in a separate thread; sends the queued events
+        """
+        try:
+            while True:
+                with self._condition:
+                    while len(self._events) == 0 and not self._closed:
+                        self._condition.wait()
+                    if len(self._events) == 0 or self._aborted:
+                        return
+                    event = self._events.popleft()
+                self.connection.send(event)
+        except (OSError, EOFError, ValueError):
+            # the subscriber has closed the connection
+            pass
+        finally:
+            with self._condition:
+                self._closed = True
+                self._events.clear()
+            self.connection.close()
+        return
+
+
+class LiveDataBroker(object):
+    r"""Local server which distributes the live data of one "Logging" connection to many subscribers.
+
+    The broker reads the events of the :class:`~thales_remote.live_data.LiveDataStream` in a separate thread and
+    sends them to every connected :class:`.LiveDataBrokerClient`. The connections of
+    :mod:`multiprocessing.connection` are used, which are Unix domain sockets on Linux and named pipes on
+    Windows. The events are pickled, so the subscribers receive the same event classes as from the stream.
+
+    The authentication of a new connection runs in its own thread, so a client with a wrong key or a client which
+    does not answer does not block the acceptance of other subscribers. Rejected clients are reported with a
+    warning.
+
+    Every subscriber has its own queue with a sending thread, so a slow subscriber does not delay the others.
+    If the queue of a subscriber is full, the drop policy decides what happens. New subscribers first receive
+    the current column names and units.
+
+    .. code-block:: python
+
+        connection = ThalesRemoteConnection()
+        connection.connectToTerm("localhost", "Logging")
+        broker = LiveDataBroker(LiveDataStream(connection), authkey=b"secret")
+        broker.start()
+        print(broker.getAddress())
+
+        # in another process
+        client = LiveDataBrokerClient(address, authkey=b"secret")
+        for event in client:
+            print(event)
+
+    :param stream: The live data stream of the "Logging" connection.
+    :param address: Address of the server, None for a free address of the default family of the platform.
+    :param authkey: Key which the clients must know, None for no authentication.
+    :param maxQueueSize: Maximum number of events queued per subscriber.
+    :param dropPolicy: Handling of full subscriber queues.
+    :param closeTimeout: Time in seconds to send the queued events to a subscriber when the broker is closed.
+    """
+
+    _stream: LiveDataStream
+    _listener: Listener
+    _authkey: Optional[bytes]
+    _max_queue_size: int
+    _drop_policy: DropPolicy
+    _close_timeout: float
+    _subscribers: list[_Subscriber]
+    _dropped_by_closed: int
+    _disconnected: int
+    _mutex: threading.Lock
+    _running: bool
+    _accept_worker: Optional[threading.Thread]
+    _stream_worker: Optional[threading.Thread]
+
+    def __init__(
+        self,
+        stream: LiveDataStream,
+        address: Optional[Union[str, tuple[str, int]]] = None,
+        authkey: Optional[bytes] = None,
+        maxQueueSize: int = 1000,
+        dropPolicy: DropPolicy = DropPolicy.DROP_OLDEST,
+        closeTimeout: float = 1.0,
+    ):
+        self._stream = stream
+        # the authentication is done per connection in _authenticateJob
+        self._listener = Listener(address)
+        self._authkey = authkey
+        self._max_queue_size = maxQueueSize
+        self._drop_policy = dropPolicy
+        self._close_timeout = closeTimeout
+        self._subscribers = []
+        self._dropped_by_closed = 0
+        self._disconnected = 0
+        self._mutex = threading.Lock()
+        self._running = False
+        self._accept_worker = None
+        self._stream_worker = None
+        return
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def getAddress(self) -> Union[str, tuple[str, int]]:
+        r"""
+        get the address the clients connect to
+
+        :returns: The address of the server.
+        """
+        return self._listener.address
+
+    def start(self) -> None:
+        r"""
+        start accepting subscribers and distributing the events
+        """
+        if self._running:
+            return
+        self._running = True
+        self._accept_worker = threading.Thread(target=self._acceptJob, daemon=True)
+        self._accept_worker.start()
+        self._stream_worker = threading.Thread(target=self._streamJob, daemon=True)
+        self._stream_worker.start()
+        return
+
+    def publish(self, event: LiveDataEvent) -> None:
+        r"""
+        send an event to all subscribers
+
+        This method is called by the thread reading the stream. It can also be used to distribute events which
+        are read in another way, in this case the broker does not need to be started.
+
+        :param event: The event.
+        """
+        with self._mutex:
+            self._removeClosedSubscribers()
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            subscriber.put(event)
+        return
+
+    def getNumberOfSubscribers(self) -> int:
+        r"""
+        get the number of connected subscribers
+
+        :returns: number of subscribers
+        """
+        with self._mutex:
+            self._removeClosedSubscribers()
+            return len(self._subscribers)
+
+    def getNumberOfDroppedEvents(self) -> int:
+        r"""
+        get the number of events dropped because of full queues, of all subscribers since the start
+
+        :returns: number of events
+        """
+        with self._mutex:
+            return self._dropped_by_closed + sum(
+                subscriber.dropped for subscriber in self._subscribers
+            )
+
+    def getNumberOfDisconnectedSubscribers(self) -> int:
+        r"""
+        get the number of subscribers which have disconnected or were disconnected by the drop policy
+
+        :returns: number of subscribers
+        """
+        with self._mutex:
+            self._removeClosedSubscribers()
+            return self._disconnected
+
+    def close(self) -> None:
+        r"""
+        stop the broker and close the connections to the subscribers
+
+        The stream is interrupted but its connection to Term is not closed.
+        """
+        if self._running:
+            self._running = False
+            self._stream.interrupt()
+            self._stream_worker.join()
+            try:
+                # wake up the thread waiting for subscribers, the listener has no handshake
+                Client(self._listener.address).close()
+            except OSError:
+                pass
+            self._accept_worker.join()
+        self._listener.close()
+
+        with self._mutex:
+            subscribers = self._subscribers
+            self._subscribers = []
+        for subscriber in subscribers:
+            subscriber.close(self._close_timeout)
+        return
+
+    # The following methods should not be called by the user.
+    # They are marked with the prefix '_' after the Python convention for proteced.
+
+    def _acceptJob(self) -> None:
+        r"""
+        method running in a separate thread; accepts the subscribers
+        """
+        while self._running:
+            try:
+                connection = self._listener.accept()
+            except OSError:
+                continue
+            if not self._running:
+                connection.close()
+                return
+
+            if self._authkey is None:
+                self._addSubscriber(connection)
+            else:
+                threading.Thread(
+                    target=self._authenticateJob, args=(connection,), daemon=True
+                ).start()
+        return
+
+    def _authenticateJob(self, connection: Connection) -> None:
+        r"""
+        method running in a separate thread; authenticates a new connection like
+        :class:`multiprocessing.connection.Listener` and adds it as subscriber
+        """
+        try:
+            deliver_challenge(connection, self._authkey)
+            answer_challenge(connection, self._authkey)
+        except AuthenticationError as error:
+            warnings.warn(f"Live data subscriber rejected: {error}", RuntimeWarning)
+            connection.close()
+            return
+        except (OSError, EOFError):
+            connection.close()
+            return
+        self._addSubscriber(connection)
+        return
+
+    def _addSubscriber(self, connection: Connection) -> None:
+        r"""
+        add a connection as subscriber and send the current column names and units
+        """
+        subscriber = _Subscriber(connection, self._max_queue_size, self._drop_policy)
+        names = self._stream.getColumnNames()
+        units = self._stream.getColumnUnits()
+        if len(names) > 0:
+            subscriber.put(ColumnNames(names))
+        if len(units) > 0:
+            subscriber.put(ColumnUnits(units))
+        with self._mutex:
+            if self._running:
+                self._subscribers.append(subscriber)
+                return
+        subscriber.close(0)
+        return
+
+    def _streamJob(self) -> None:
+        r"""
+        method running in a separate thread; reads the stream and publishes the events
+        """
+        for event in self._stream:
+            self.publish(event)
+        return
+
+    def _removeClosedSubscribers(self) -> None:
+        r"""
+        forget the subscribers with closed connections, the mutex must be locked
+        """
+        closed = [
+            subscriber for subscriber in self._subscribers if subscriber.isClosed()
+        ]
+        for subscriber in closed:
+            self._subscribers.remove(subscriber)
+            self._dropped_by_closed += subscriber.dropped
+            self._disconnected += 1
+        return
+
+
+class LiveDataBrokerClient(object):
+    r"""Client which receives the live data from a :class:`.LiveDataBroker`.
+
+    :param address: The address of the broker.
+    :param authkey: The key of the broker.
+    """
+
+    _connection: Connection
+
+    def __init__(
+        self,
+        address: Union[str, tuple[str, int]],
+        authkey: Optional[bytes] = None,
+    ):
+        self._connection = Client(address, authkey=authkey)
+        return
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def readEvent(self, timeout: Optional[float] = None) -> Optional[LiveDataEvent]:
+        r"""
+        wait for the next event
+
+        :param timeout: The timeout in seconds, blocking at None.
+        :returns: The event or None on timeout.
+        :raises EOFError: If the broker has closed the connection.
+        """
+        if not self._connection.poll(timeout):
+            return None
+        return self._connection.recv()
+
+    def close(self) -> None:
+        r"""
+        close the connection to the broker
+        """
+        self._connection.close()
+        return
+
+    def __iter__(self) -> Iterator[LiveDataEvent]:
+        r"""
+        iterate over the events until the broker closes the connection
+        """
+        while True:
+            try:
+                yield self._connection.recv()
+            except (EOFError, OSError):
+                return
@@ -0,0 +1,271 @@
+r"""
+  ____       __                        __    __   __      _ __
+ /_  / ___ _/ /  ___  ___ ___________ / /__ / /__/ /_____(_) /__
+  / /_/ _ `/ _ \/ _ \/ -_) __/___/ -_) / -_)  '_/ __/ __/ /  '_/
+ /___/\_,_/_//_/_//_/\__/_/      \__/_/\__/_/\_\\__/_/ /_/_/\_\
+
+Copyright 2024 Zahner-Elektrik GmbH & Co. KG
+
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the Software
+is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH
+THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import threading
+import warnings
+from typing import Optional
+
+import numpy as np
+
+from thales_remote.live_data import ColumnNames, DataRow, LiveDataEvent
+
+
+class LiveDataRingBuffer(object):
+    r"""Ring buffer with a fixed size for the newest rows of the live data.
+
+    The rows are stored in a preallocated array with twice the capacity. Every row is written at its position
+    and at the position plus the capacity, so the newest rows are always a contiguous block of the array and
+    are returned as view without copying. Appending a row does not allocate memory.
+
+    The columns are allocated with the first row or the first column names. If column names with a different
+    number of columns are received, for example with a new measurement, the buffer is allocated again and
+    cleared. Rows with a different number of values are rejected, so a malformed row does not discard the rows
+    in the buffer.
+
+    A view returned by :func:`~thales_remote.live_buffer.LiveDataRingBuffer.getLatest` stays unchanged for
+    capacity minus the length of the view further rows. Readers which process a view longer should use
+    :func:`~thales_remote.live_buffer.LiveDataRingBuffer.copyLatest`, which copies the rows while the writer is
+    locked, so the copy never contains partially written rows.
+
+    The buffer can be registered with :func:`~thales_remote.live_data.LiveDataStream.onEvent`:
+
+    .. code-block:: python
+
+        buffer = LiveDataRingBuffer(10000)
+        stream.onEvent(buffer.handleEvent)
+
+    :param capacity: Maximum number of rows in the buffer.
+    :param columns: Number of columns, None to allocate with the first row or column names.
+    """
+
+    _capacity: int
+    _data: Optional[np.ndarray]
+    _timestamps: np.ndarray
+    _names: list[str]
+    _written: int
+    _mutex: threading.Lock
+
+    def __init__(self, capacity: int, columns: Optional[int] = None):
+        if capacity <= 0:
+            raise ValueError("the capacity must be greater than 0")
+        self._capacity = capacity
+        self._data = None
+        self._timestamps = np.zeros(2 * capacity, dtype=np.float64)
+        self._names = []
+        self._written = 0
+        self._mutex = threading.Lock()
+        if columns is not None:
+            self._allocate(columns)
+        return
+
+    def getCapacity(self) -> int:
+        r"""
+        get the maximum number of rows in the buffer
+
+        :returns: number of rows
+        """
+        return self._capacity
+
+    def getNumberOfColumns(self) -> int:
+        r"""
+        get the number of columns
+
+        :returns: number of columns, 0 if the buffer is not allocated yet
+        """
+        with self._mutex:
+            return 0 if self._data is None else self._data.shape[1]
+
+    def getColumnNames(self) -> list[str]:
+        r"""
+        get the names of the columns
+
+        :returns: List with the names, empty if no names were received.
+        """
+        with self._mutex:
+            return list(self._names)
+
+    def getNumberOfWrittenRows(self) -> int:
+        r"""
+        get the number of rows appended since the buffer was allocated or cleared
+
+        The difference of two values tells a reader how many rows were written in the meantime.
+
+        :returns: number of rows
+        """
+        with self._mutex:
+            return self._written
+
+    def __len__(self) -> int:
+        with self._mutex:
+            return min(self._written, self._capacity)
+
+    def handleEvent(self, event: LiveDataEvent) -> None:
+        r"""
+        process an event of the :class:`~thales_remote.live_data.LiveDataStream`
+
+        Data rows are appended, column names set the names and the number of columns.
+        A row with a wrong number of values is skipped with a warning.
+
+        :param event: The event.
+        """
+        if isinstance(event, DataRow):
+            try:
+                self.append(event.values, event.timestamp)
+            except ValueError as exception:
+                warnings.warn(f"Live data row skipped: {exception}", RuntimeWarning)
+        elif isinstance(event, ColumnNames):
+            self.setColumnNames(event.names)
+        return
+
+    def setColumnNames(self, names: list[str]) -> None:
+        r"""
+        set the names of the columns
+
+        If the number of columns changes, the buffer is allocated again and cleared.
+
+        :param names: List with the names of the columns.
+        """
+        with self._mutex:
+            if self._data is None or self._data.shape[1] != len(names):
+                self._allocate(len(names))
+            self._names = list(names)
+        return
+
+    def append(self, values: np.ndarray, timestamp: float = 0.0) -> None:
+        r"""
+        append a row
+
+        The first row allocates the buffer if neither the number of columns nor the column names were set.
+
+        :param values: The values of the row.
+        :param timestamp: Time of the row in seconds.
+        :raises ValueError: If the number of values does not match the number of columns.
+        """
+        with self._mutex:
+            if self._data is None:
+                self._allocate(len(values))
+            elif self._data.shape[1] != len(values):
+                raise ValueError(
+                    f"the row has {len(values)} values, the buffer has {self._data.shape[1]} columns"
+                )
+            position = self._written % self._capacity
+            self._data[position] = values
+            self._data[position + self._capacity] = values
+            self._timestamps[position] = timestamp
+            self._timestamps[position + self._capacity] = timestamp
+            self._written += 1
+        return
+
+    def clear(self) -> None:
+        r"""
+        remove all rows, the memory remains allocated
+        """
+        with self._mutex:
+            self._written = 0
+        return
+
+    def getLatest(self, rows: Optional[int] = None) -> tuple[np.ndarray, np.ndarray]:
+        r"""
+        get the newest rows as views without copying
+
+        The views are contiguous, the newest row is the last one. They stay unchanged for capacity minus the
+        number of rows further appended rows.
+
+        :param rows: Number of rows, None for all rows in the buffer.
+        :returns: Tuple with the 2-D array of the values and the 1-D array of the timestamps.
+        """
+        with self._mutex:
+            start, end = self._window(rows)
+            return self._values(start, end), self._timestamps[start:end]
+
+    def copyLatest(
+        self, rows: Optional[int] = None, out: Optional[np.ndarray] = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        r"""
+        get a copy of the newest rows
+
+        The rows are copied while the writer is locked, so the copy contains only complete rows.
+
+        :param rows: Number of rows, None for all rows in the buffer.
+        :param out: Optional array for the values with at least the requested number of rows, to avoid the
+            allocation. The returned values are a view of it.
+        :returns: Tuple with the 2-D array of the values and the 1-D array of the timestamps.
+        """
+        with self._mutex:
+            start, end = self._window(rows)
+            values = self._values(start, end)
+            if out is None:
+                values = values.copy()
+            else:
+                out[: end - start] = values
+                values = out[: end - start]
+            return values, self._timestamps[start:end].copy()
+
+    def getLatestSeconds(self, seconds: float) -> tuple[np.ndarray, np.ndarray]:
+        r"""
+        get the rows of the last seconds as views without copying
+
+        The window ends at the timestamp of the newest row. The timestamps must be ascending.
+
+        :param seconds: Length of the window in seconds.
+        :returns: Tuple with the 2-D array of the values and the 1-D array of the timestamps.
+        """
+        with self._mutex:
+            start, end = self._window(None)
+            timestamps = self._timestamps[start:end]
+            if len(timestamps) > 0:
+                start += int(
+                    np.searchsorted(timestamps, timestamps[-1] - seconds, side="left")
+                )
+            return self._values(start, end), self._timestamps[start:end]
+
+    # The following methods should not be called by the user.
+    # They are marked with the prefix '_' after the Python convention for proteced.
+
+    def _allocate(self, columns: int) -> None:
+        r"""
+        allocate the array for the rows and clear the buffer
+        """
+        self._data = np.zeros((2 * self._capacity, columns), dtype=np.float64)
+        self._written = 0
+        return
+
+    def _window(self, rows: Optional[int]) -> tuple[int, int]:
+        r"""
+        positions of the newest rows in the double written array
+        """
+        available = min(self._written, self._capacity)
+        rows = available if rows is None else max(min(rows, available), 0)
+        end = self._written % self._capacity + self._capacity
+        if self._written < self._capacity:
+            # the first copy is complete up to the current position
+            end = self._written
+        return end - rows, end
+
+    def _values(self, start: int, end: int) -> np.ndarray:
+        if self._data is None:
+            return np.zeros((0, 0), dtype=np.float64)
+        return self._data[start:end]
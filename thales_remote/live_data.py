@@ -0,0 +1,478 @@
+r"""
+  ____       __                        __    __   __      _ __
+ /_  / ___ _/ /  ___  ___ ___________ / /__ / /__/ /_____(_) /__
+  / /_/ _ `/ _ \/ _ \/ -_) __/___/ -_) / -_)  '_/ __/ __/ /  '_/
+ /___/\_,_/_//_/_//_/\__/_/      \__/_/\__/_/\_\\__/_/ /_/_/\_\
+
+Copyright 2024 Zahner-Elektrik GmbH & Co. KG
+
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the Software
+is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH
+THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import re
+import threading
+import time
+import warnings
+from dataclasses import dataclass, field
+from enum import IntEnum
+from queue import Empty
+from typing import Callable, Iterator, Optional, Sequence, Union
+
+import numpy as np
+
+from thales_remote.connection import ThalesRemoteConnection
+from thales_remote.error import TermConnectionError
+
+
+class LiveDataPacketType(IntEnum):
+    r"""
+    Types of the packets of the online display, sent to a connection with the name "Logging".
+
+    The type is the first byte of the telegram, followed by ASCII text.
+    """
+
+    MEASUREMENT_BEGIN = 1
+    MEASUREMENT_END = 2
+    COLUMN_NAMES = 4
+    COLUMN_UNITS = 5
+    DATA = 6
+
+
+@dataclass
+class MeasurementBegin:
+    r"""
+    A measurement has been initialized.
+
+    :param text: The text sent with the packet.
+    :param timestamp: Time of the reception in seconds of :func:`time.monotonic`.
+    """
+
+    text: str
+    timestamp: float = 0.0
+
+
+@dataclass
+class MeasurementEnd:
+    r"""
+    The measurement has ended.
+
+    :param text: The text sent with the packet.
+    :param timestamp: Time of the reception in seconds of :func:`time.monotonic`.
+    """
+
+    text: str
+    timestamp: float = 0.0
+
+
+@dataclass
+class ColumnNames:
+    r"""
+    Names of the columns of the following data rows.
+
+    :param names: List with the names of the columns.
+    :param timestamp: Time of the reception in seconds of :func:`time.monotonic`.
+    """
+
+    names: list[str]
+    timestamp: float = 0.0
+
+
+@dataclass
+class ColumnUnits:
+    r"""
+    Units of the columns of the following data rows.
+
+    :param units: List with the units of the columns.
+    :param timestamp: Time of the reception in seconds of :func:`time.monotonic`.
+    """
+
+    units: list[str]
+    timestamp: float = 0.0
+
+
+@dataclass
+class DataRow:
+    r"""
+    One row of measured values.
+
+    :param values: Array with one float64 value per column.
+    :param names: Names of the columns at the time of the reception, empty if the names are unknown.
+    :param units: Units of the columns at the time of the reception, empty if the units are unknown.
+    :param timestamp: Time of the reception in seconds of :func:`time.monotonic`.
+    """
+
+    values: np.ndarray
+    names: list[str] = field(default_factory=list)
+    units: list[str] = field(default_factory=list)
+    timestamp: float = 0.0
+
+    def asDict(self) -> dict[str, float]:
+        r"""
+        get the values with the column names as keys
+
+        :returns: Dict with the column name as key and the value as value.
+        """
+        return dict(zip(self.names, self.values.tolist()))
+
+
+@dataclass
+class UnknownPacket:
+    r"""
+    A packet with a type which is not decoded or with a payload which could not be decoded.
+
+    :param packetType: The type byte of the packet.
+    :param payload: The data after the type byte.
+    :param timestamp: Time of the reception in seconds of :func:`time.monotonic`.
+    """
+
+    packetType: int
+    payload: bytes
+    timestamp: float = 0.0
+
+
+LiveDataEvent = Union[
+    MeasurementBegin, MeasurementEnd, ColumnNames, ColumnUnits, DataRow, UnknownPacket
+]
+
+_TEXT_FIELD_SEPARATOR = re.compile(r"\s*[;\t]\s*")
+_VALUE_SEPARATOR_TABLE = bytes.maketrans(b";", b" ")
+
+
+def splitLiveDataFields(text: str) -> list[str]:
+    r"""
+    Split the text of a names or units packet into the fields.
+
+    The fields are separated by semicolons or tabs. If there is none of them, the fields are separated by
+    whitespace.
+
+    :param text: The decoded text of the packet.
+    :returns: List with the fields.
+    """
+    text = text.strip()
+    if len(text) == 0:
+        return []
+    if _TEXT_FIELD_SEPARATOR.search(text) is not None:
+        return _TEXT_FIELD_SEPARATOR.split(text)
+    return text.split()
+
+
+def parseLiveDataRow(text: Union[bytes, str]) -> np.ndarray:
+    r"""
+    Parse the text of a data packet into the values.
+
+    The values are separated by whitespace or semicolons. The semicolons are replaced by spaces and the text is
+    parsed by :func:`numpy.fromstring` in one step, without splitting it into Python strings.
+    A text without values, for example only separators, results in an empty array.
+
+    :param text: The payload of the packet, bytes are parsed without decoding.
+    :returns: Array with the values as float64.
+    :raises ValueError: If the text contains something else than numbers. Older NumPy versions only warn and
+        return the values up to the invalid one.
+    """
+    return _parseSeparatedValues(_translateSeparators(text))
+
+
+def parseLiveDataRows(
+    texts: Sequence[Union[bytes, str]], columns: Optional[int] = None
+) -> np.ndarray:
+    r"""
+    Parse the texts of several data packets into a 2-D array.
+
+    The texts are joined and parsed by :func:`numpy.fromstring` in one step, so the cost per packet is small
+    when a backlog of packets is processed at once. Before, the number of values of every packet is counted,
+    so that packets with different numbers of values are never shifted into other rows.
+
+    :param texts: The payloads of the packets.
+    :param columns: The number of values per packet, None to take it from the first packet.
+    :returns: 2-D array with one row per packet.
+    :raises ValueError: If the packets do not all have the same number of values.
+    """
+    if len(texts) == 0:
+        return np.zeros((0, columns if columns is not None else 0), dtype=np.float64)
+    payloads = [_translateSeparators(text) for text in texts]
+    counts = [len(payload.split()) for payload in payloads]
+    if columns is None:
+        columns = counts[0]
+    for index, count in enumerate(counts):
+        if count != columns:
+            raise ValueError(
+                f"packet {index} has {count} values, {columns} values expected"
+            )
+
+    values = _parseSeparatedValues(b" ".join(payloads))
+    if len(values) != len(payloads) * columns:
+        raise ValueError(
+            f"{len(payloads)} packets with {columns} values expected, {len(values)} values found"
+        )
+    return values.reshape(len(payloads), columns)
+
+
+def _translateSeparators(text: Union[bytes, str]) -> bytes:
+    r"""
+    replace the semicolons of a data packet by spaces
+    """
+    if isinstance(text, str):
+        text = text.encode("ASCII")
+    return text.translate(_VALUE_SEPARATOR_TABLE)
+
+
+def _parseSeparatedValues(text: bytes) -> np.ndarray:
+    r"""
+    parse whitespace separated values, numpy.fromstring returns [-1.0] for a text with only whitespace
+    """
+    if len(text.strip()) == 0:
+        return np.zeros(0, dtype=np.float64)
+    return np.fromstring(text, dtype=np.float64, sep=" ")
+
+
+def decodeLiveDataPacket(
+    telegram: bytes, timestamp: Optional[float] = None
+) -> LiveDataEvent:
+    r"""
+    Decode a telegram of the online display into an event.
+
+    The decoding has no state, so the names and units of a :class:`.DataRow` are empty.
+    :class:`.LiveDataStream` adds them from the preceding packets.
+
+    :param telegram: The telegram with the type byte at the beginning.
+    :param timestamp: Time of the reception, if None the current time of :func:`time.monotonic` is used.
+    :returns: The decoded event.
+    """
+    if timestamp is None:
+        timestamp = time.monotonic()
+    if len(telegram) == 0:
+        raise ValueError("empty live data telegram")
+
+    packetType = telegram[0]
+    payload = bytes(telegram[1:])
+
+    if packetType == LiveDataPacketType.DATA:
+        return DataRow(parseLiveDataRow(payload), timestamp=timestamp)
+    elif packetType == LiveDataPacketType.COLUMN_NAMES:
+        return ColumnNames(
+            splitLiveDataFields(payload.decode("ASCII")), timestamp=timestamp
+        )
+    elif packetType == LiveDataPacketType.COLUMN_UNITS:
+        return ColumnUnits(
+            splitLiveDataFields(payload.decode("ASCII")), timestamp=timestamp
+        )
+    elif packetType == LiveDataPacketType.MEASUREMENT_BEGIN:
+        return MeasurementBegin(payload.decode("ASCII"), timestamp=timestamp)
+    elif packetType == LiveDataPacketType.MEASUREMENT_END:
+        return MeasurementEnd(payload.decode("ASCII"), timestamp=timestamp)
+    return UnknownPacket(packetType, payload, timestamp=timestamp)
+
+
+class LiveDataDecoder(object):
+    r"""Class which decodes the online display data of the Thales software.
+
+    The decoder keeps the current column names and units and attaches them to every :class:`.DataRow`.
+    It is the base of :class:`.LiveDataStream` and :class:`~thales_remote.live_async.AsyncLiveDataStream`,
+    which receive the telegrams.
+    """
+
+    _names: list[str]
+    _units: list[str]
+    _measuring: bool
+    _callbacks: list[Callable[[LiveDataEvent], None]]
+    _mutex: threading.Lock
+
+    def __init__(self):
+        self._names = []
+        self._units = []
+        self._measuring = False
+        self._callbacks = []
+        self._mutex = threading.Lock()
+        return
+
+    def getColumnNames(self) -> list[str]:
+        r"""
+        get the names of the columns of the current measurement
+
+        :returns: List with the names, empty if no names were received.
+        """
+        return list(self._names)
+
+    def getColumnUnits(self) -> list[str]:
+        r"""
+        get the units of the columns of the current measurement
+
+        :returns: List with the units, empty if no units were received.
+        """
+        return list(self._units)
+
+    def isMeasuring(self) -> bool:
+        r"""
+        check if a measurement is running
+
+        :returns: True between the packets for the begin and the end of a measurement.
+        """
+        return self._measuring
+
+    def onEvent(
+        self, callback: Callable[[LiveDataEvent], None]
+    ) -> Callable[[LiveDataEvent], None]:
+        r"""
+        register a function which is called for every decoded event
+
+        The function is called by the thread decoding the telegrams, before the event is returned. It should
+        return quickly, because the telegrams queue up while it runs. Exceptions raised by the function are
+        reported as warning.
+
+        :param callback: Function which is called with every event.
+        :returns: The passed function, so that the method can also be used as decorator.
+        """
+        with self._mutex:
+            self._callbacks.append(callback)
+        return callback
+
+    def removeEventCallback(self, callback: Callable[[LiveDataEvent], None]) -> None:
+        r"""
+        remove a function registered with :func:`~thales_remote.live_data.LiveDataDecoder.onEvent`
+
+        :param callback: The registered function.
+        """
+        with self._mutex:
+            self._callbacks.remove(callback)
+        return
+
+    def decode(
+        self, telegram: bytes, timestamp: Optional[float] = None
+    ) -> LiveDataEvent:
+        r"""
+        decode a telegram and update the names and units of the stream
+
+        This method is used by the classes receiving the telegrams. It can be called directly with telegrams
+        received in another way. The event is passed to the registered functions.
+
+        A malformed packet, for example a data row with a value that is not a number, is returned as
+        :class:`.UnknownPacket` and reported as warning, so that the stream continues with the next packet.
+
+        :param telegram: The telegram with the type byte at the beginning.
+        :param timestamp: Time of the reception, if None the current time of :func:`time.monotonic` is used.
+        :returns: The decoded event.
+        """
+        if timestamp is None:
+            timestamp = time.monotonic()
+        try:
+            event = decodeLiveDataPacket(telegram, timestamp)
+        except ValueError as exception:
+            if len(telegram) == 0:
+                raise
+            warnings.warn(
+                f"Live data packet not decoded: {exception!r}", RuntimeWarning
+            )
+            event = UnknownPacket(telegram[0], bytes(telegram[1:]), timestamp=timestamp)
+        if isinstance(event, DataRow):
+            event.names = self._names
+            event.units = self._units
+        elif isinstance(event, ColumnNames):
+            self._names = event.names
+        elif isinstance(event, ColumnUnits):
+            self._units = event.units
+        elif isinstance(event, MeasurementBegin):
+            self._names = []
+            self._units = []
+            self._measuring = True
+        elif isinstance(event, MeasurementEnd):
+            self._measuring = False
+
+        with self._mutex:
+            callbacks = list(self._callbacks)
+        for callback in callbacks:
+            try:
+                callback(event)
+            except Exception as exception:
+                warnings.warn(
+                    f"Exception in live data callback: {exception!r}", RuntimeWarning
+                )
+        return event
+
+
+class LiveDataStream(LiveDataDecoder):
+    r"""Class which receives and decodes the online display data of the Thales software.
+
+    The connection must be connected to Term with the name "Logging". Then Term sends the packets of the
+    online display, which are decoded into typed events. The stream keeps the current column names and units
+    and attaches them to every :class:`.DataRow`.
+
+    .. code-block:: python
+
+        connection = ThalesRemoteConnection()
+        connection.connectToTerm("localhost", "Logging")
+        stream = LiveDataStream(connection)
+        for event in stream:
+            if isinstance(event, DataRow):
+                print(event.asDict())
+
+    :param connection: The connection to Term with the name "Logging".
+    """
+
+    _connection: ThalesRemoteConnection
+
+    def __init__(self, connection: ThalesRemoteConnection):
+        super().__init__()
+        self._connection = connection
+        return
+
+    def getConnection(self) -> ThalesRemoteConnection:
+        r"""
+        get the connection of the stream
+
+        :returns: The connection to Term.
+        """
+        return self._connection
+
+    def readEvent(self, timeout: Optional[float] = None) -> Optional[LiveDataEvent]:
+        r"""
+        wait for the next packet and decode it
+
+        :param timeout: The timeout in seconds, blocking at None.
+        :returns: The event or None on timeout or if the wait was interrupted with
+            :func:`~thales_remote.live_data.LiveDataStream.interrupt`.
+        :raises TermConnectionError: If the connection was closed.
+        """
+        try:
+            telegram = self._connection.waitForBinaryTelegram(timeout=timeout)
+        except Empty:
+            return None
+        if len(telegram) == 0:
+            return None
+        return self.decode(telegram)
+
+    def interrupt(self) -> None:
+        r"""
+        wake up a thread waiting in :func:`~thales_remote.live_data.LiveDataStream.readEvent`
+        """
+        self._connection.interruptWaitForTelegram()
+        return
+
+    def __iter__(self) -> Iterator[LiveDataEvent]:
+        r"""
+        iterate over the events until the connection is closed or the stream is interrupted
+
+        Packets which cannot be decoded are yielded as :class:`.UnknownPacket` and do not end the iteration.
+        """
+        while True:
+            try:
+                event = self.readEvent()
+            except TermConnectionError:
+                return
+            if event is None:
+                return
+            yield event
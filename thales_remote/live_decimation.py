@@ -0,0 +1,465 @@
+r"""
+  ____       __                        __    __   __      _ __
+ /_  / ___ _/ /  ___  ___ ___________ / /__ / /__/ /_____(_) /__
+  / /_/ _ `/ _ \/ _ \/ -_) __/___/ -_) / -_)  '_/ __/ __/ /  '_/
+ /___/\_,_/_//_/_//_/\__/_/      \__/_/\__/_/\_\\__/_/ /_/_/\_\
+
+Copyright 2024 Zahner-Elektrik GmbH & Co. KG
+
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the Software
+is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH
+THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import queue
+import threading
+from typing import Optional
+
+import numpy as np
+
+from thales_remote.live_data import (
+    ColumnNames,
+    DataRow,
+    LiveDataEvent,
+    MeasurementBegin,
+    MeasurementEnd,
+)
+
+DecimatedBlock = tuple[np.ndarray, np.ndarray]
+
+
+def minMaxDecimate(
+    values: np.ndarray, timestamps: np.ndarray, bucketSize: int
+) -> DecimatedBlock:
+    r"""
+    Reduce every bucket of rows to the minimum and the maximum of each column.
+
+    Each bucket results in two rows, the first with the minima and the second with the maxima of the columns.
+    Their timestamps are the first and the last timestamp of the bucket. An incomplete last bucket is reduced
+    as well.
+
+    :param values: 2-D array with one row per sample.
+    :param timestamps: 1-D array with the timestamps of the rows.
+    :param bucketSize: Number of rows per bucket.
+    :returns: Tuple with the decimated values and timestamps.
+    """
+    rows, columns = values.shape
+    buckets = -(-rows // bucketSize)
+    outValues = np.empty((2 * buckets, columns), dtype=values.dtype)
+    outTimestamps = np.empty(2 * buckets, dtype=timestamps.dtype)
+
+    complete = rows // bucketSize
+    if complete > 0:
+        reshaped = values[: complete * bucketSize].reshape(
+            complete, bucketSize, columns
+        )
+        outValues[0 : 2 * complete : 2] = reshaped.min(axis=1)
+        outValues[1 : 2 * complete : 2] = reshaped.max(axis=1)
+        reshapedTimestamps = timestamps[: complete * bucketSize].reshape(
+            complete, bucketSize
+        )
+        outTimestamps[0 : 2 * complete : 2] = reshapedTimestamps[:, 0]
+        outTimestamps[1 : 2 * complete : 2] = reshapedTimestamps[:, -1]
+    if buckets > complete:
+        outValues[-2] = values[complete * bucketSize :].min(axis=0)
+        outValues[-1] = values[complete * bucketSize :].max(axis=0)
+        outTimestamps[-2] = timestamps[complete * bucketSize]
+        outTimestamps[-1] = timestamps[-1]
+    return outValues, outTimestamps
+
+
+def lttbIndices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    r"""
+    Select the points with the Largest-Triangle-Three-Buckets algorithm.
+
+    The first and the last point are always selected. The points in between are divided into threshold - 2
+    buckets and from every bucket the point is selected which forms the largest triangle with the point selected
+    in the previous bucket and the mean of the next bucket. The areas of a bucket are calculated vectorized.
+
+    :param x: 1-D array with the x values, ascending.
+    :param y: 1-D array with the y values.
+    :param threshold: Number of points to select.
+    :returns: Array with the indices of the selected points.
+    """
+    length = len(x)
+    if threshold >= length or threshold < 3:
+        return np.arange(length) if threshold >= length else np.array([0, length - 1])
+
+    edges = np.linspace(1, length - 1, threshold - 1).astype(np.intp)
+    selected = np.empty(threshold, dtype=np.intp)
+    selected[0] = 0
+    selected[-1] = length - 1
+
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        if bucket + 2 < len(edges):
+            nextStart, nextEnd = edges[bucket + 1], edges[bucket + 2]
+        else:
+            nextStart, nextEnd = length - 1, length
+        meanX = x[nextStart:nextEnd].mean()
+        meanY = y[nextStart:nextEnd].mean()
+
+        areas = np.abs(
+            (x[previous] - meanX) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (meanY - y[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        selected[bucket + 1] = previous
+    return selected
+
+
+class DecimationStage(object):
+    r"""Base class of the decimation stages.
+
+    A stage receives the live data in blocks and returns the decimated rows. Rows which cannot be decimated yet
+    are kept until the next block, so the result does not depend on the block boundaries.
+    Derived classes implement :func:`~thales_remote.live_decimation.DecimationStage.process` and optionally
+    :func:`~thales_remote.live_decimation.DecimationStage.flush` and
+    :func:`~thales_remote.live_decimation.DecimationStage.reset`.
+    """
+
+    def process(self, values: np.ndarray, timestamps: np.ndarray) -> DecimatedBlock:
+        r"""
+        decimate a block of rows
+
+        :param values: 2-D array with one row per sample.
+        :param timestamps: 1-D array with the timestamps of the rows.
+        :returns: Tuple with the decimated values and timestamps, may be empty.
+        """
+        return values, timestamps
+
+    def flush(self) -> Optional[DecimatedBlock]:
+        r"""
+        decimate the kept rows at the end of a measurement
+
+        :returns: Tuple with the decimated values and timestamps or None if no rows are kept.
+        """
+        return None
+
+    def reset(self) -> None:
+        r"""
+        discard the kept rows
+        """
+        return
+
+
+class MinMaxStage(DecimationStage):
+    r"""Stage which reduces every bucket of rows to the minima and maxima of the columns.
+
+    The envelope of the signal is kept, so peaks remain visible in plots.
+
+    :param bucketSize: Number of rows per bucket.
+    """
+
+    _bucket_size: int
+    _pending: Optional[DecimatedBlock]
+
+    def __init__(self, bucketSize: int):
+        self._bucket_size = bucketSize
+        self._pending = None
+        return
+
+    def process(self, values: np.ndarray, timestamps: np.ndarray) -> DecimatedBlock:
+        values, timestamps = _prepend(self._pending, values, timestamps)
+        complete = len(values) // self._bucket_size * self._bucket_size
+        self._pending = (
+            (values[complete:], timestamps[complete:])
+            if complete < len(values)
+            else None
+        )
+        return minMaxDecimate(
+            values[:complete], timestamps[:complete], self._bucket_size
+        )
+
+    def flush(self) -> Optional[DecimatedBlock]:
+        if self._pending is None:
+            return None
+        values, timestamps = self._pending
+        self._pending = None
+        return minMaxDecimate(values, timestamps, self._bucket_size)
+
+    def reset(self) -> None:
+        self._pending = None
+        return
+
+
+class StrideStage(DecimationStage):
+    r"""Stage which keeps every n-th row.
+
+    :param stride: Distance of the kept rows.
+    """
+
+    _stride: int
+    _offset: int
+
+    def __init__(self, stride: int):
+        self._stride = stride
+        self._offset = 0
+        return
+
+    def process(self, values: np.ndarray, timestamps: np.ndarray) -> DecimatedBlock:
+        first = (-self._offset) % self._stride
+        self._offset = (self._offset + len(values)) % self._stride
+        return values[first :: self._stride], timestamps[first :: self._stride]
+
+    def reset(self) -> None:
+        self._offset = 0
+        return
+
+
+class LttbStage(DecimationStage):
+    r"""Stage which selects the visually important rows with the Largest-Triangle-Three-Buckets algorithm.
+
+    The rows are collected until a window is complete and then reduced by the ratio. Consecutive windows share
+    one row, so the windows are independent of the block boundaries. The selection is made with one column
+    against the timestamps, the other columns of the selected rows are kept.
+
+    :param ratio: Number of rows reduced to one row.
+    :param column: Index of the column used for the selection.
+    :param windowSize: Number of rows reduced at once.
+    """
+
+    _ratio: int
+    _column: int
+    _window_size: int
+    _pending: Optional[DecimatedBlock]
+
+    def __init__(self, ratio: int, column: int = 0, windowSize: Optional[int] = None):
+        self._ratio = ratio
+        self._column = column
+        self._window_size = windowSize if windowSize is not None else 64 * ratio
+        self._pending = None
+        return
+
+    def process(self, values: np.ndarray, timestamps: np.ndarray) -> DecimatedBlock:
+        values, timestamps = _prepend(self._pending, values, timestamps)
+        selected = []
+        start = 0
+        while len(values) - start >= self._window_size:
+            end = start + self._window_size
+            # the last row of a window starts the next window, it is selected and returned there
+            selected.append(
+                start + self._select(values[start:end], timestamps[start:end])[:-1]
+            )
+            start = end - 1
+        self._pending = (values[start:], timestamps[start:])
+
+        indices = np.concatenate(selected) if selected else np.empty(0, np.intp)
+        return values[indices], timestamps[indices]
+
+    def flush(self) -> Optional[DecimatedBlock]:
+        if self._pending is None:
+            return None
+        values, timestamps = self._pending
+        self._pending = None
+        indices = self._select(values, timestamps)
+        return values[indices], timestamps[indices]
+
+    def reset(self) -> None:
+        self._pending = None
+        return
+
+    # The following methods should not be called by the user.
+    # They are marked with the prefix '_' after the Python convention for proteced.
+
+    def _select(self, values: np.ndarray, timestamps: np.ndarray) -> np.ndarray:
+        threshold = max(-(-len(values) // self._ratio), 2)
+        return lttbIndices(timestamps, values[:, self._column], threshold)
+
+
+class LiveDataDecimator(object):
+    r"""Class which distributes the live data to consumers with individual resolutions.
+
+    The data rows of the :class:`~thales_remote.live_data.LiveDataStream` are collected in blocks. Every full
+    block is passed to the stage of each subscription and the decimated rows are put into the queue of the
+    subscription. A subscription without stage receives the full-rate blocks, for example to persist them.
+    At the end of a measurement or when the columns change, the incomplete block is passed on and the stages
+    are flushed.
+
+    The decimator is registered with :func:`~thales_remote.live_data.LiveDataStream.onEvent`:
+
+    .. code-block:: python
+
+        decimator = LiveDataDecimator()
+        stream.onEvent(decimator.handleEvent)
+        plotQueue = decimator.subscribe(MinMaxStage(100))
+        values, timestamps = plotQueue.get()
+
+    :param blockSize: Number of rows collected before they are passed to the stages.
+    """
+
+    _block_size: int
+    _block: Optional[np.ndarray]
+    _block_timestamps: np.ndarray
+    _block_rows: int
+    _subscriptions: list[
+        tuple[queue.Queue[Optional[DecimatedBlock]], Optional[DecimationStage]]
+    ]
+    _mutex: threading.Lock
+
+    def __init__(self, blockSize: int = 256):
+        self._block_size = blockSize
+        self._block = None
+        self._block_timestamps = np.empty(blockSize, dtype=np.float64)
+        self._block_rows = 0
+        self._subscriptions = []
+        self._mutex = threading.Lock()
+        return
+
+    def subscribe(
+        self, stage: Optional[DecimationStage] = None, maxsize: int = 0
+    ) -> queue.Queue[Optional[DecimatedBlock]]:
+        r"""
+        get a queue with the decimated blocks
+
+        Each block is a tuple with the 2-D array of the values and the 1-D array of the timestamps.
+        If the queue is full, blocks are dropped. After :func:`~thales_remote.live_decimation.LiveDataDecimator.close`
+        None is put into the queue.
+
+        :param stage: The decimation stage of the subscription, None for the full-rate data. Every subscription
+            needs its own stage object.
+        :param maxsize: Maximum number of blocks in the queue, 0 for no limit.
+        :returns: The queue.
+        """
+        subscriber: queue.Queue[Optional[DecimatedBlock]] = queue.Queue(maxsize)
+        with self._mutex:
+            self._subscriptions.append((subscriber, stage))
+        return subscriber
+
+    def unsubscribe(self, subscriber: queue.Queue[Optional[DecimatedBlock]]) -> None:
+        r"""
+        remove a queue returned by :func:`~thales_remote.live_decimation.LiveDataDecimator.subscribe`
+
+        :param subscriber: The queue.
+        """
+        with self._mutex:
+            self._subscriptions = [
+                subscription
+                for subscription in self._subscriptions
+                if subscription[0] is not subscriber
+            ]
+        return
+
+    def handleEvent(self, event: LiveDataEvent) -> None:
+        r"""
+        process an event of the :class:`~thales_remote.live_data.LiveDataStream`
+
+        :param event: The event.
+        """
+        with self._mutex:
+            if isinstance(event, DataRow):
+                self._appendRow(event.values, event.timestamp)
+            elif isinstance(event, (ColumnNames, MeasurementEnd)):
+                self._flush()
+            elif isinstance(event, MeasurementBegin):
+                self._flush()
+                for _, stage in self._subscriptions:
+                    if stage is not None:
+                        stage.reset()
+        return
+
+    def flush(self) -> None:
+        r"""
+        pass the incomplete block to the subscriptions and flush the stages
+        """
+        with self._mutex:
+            self._flush()
+        return
+
+    def close(self) -> None:
+        r"""
+        flush the data and put None into the queues of the subscriptions
+        """
+        with self._mutex:
+            self._flush()
+            for subscriber, _ in self._subscriptions:
+                _putNoWait(subscriber, None)
+        return
+
+    # The following methods should not be called by the user.
+    # They are marked with the prefix '_' after the Python convention for proteced.
+
+    def _appendRow(self, values: np.ndarray, timestamp: float) -> None:
+        r"""
+        append a row to the block and dispatch the block when it is full
+        """
+        if self._block is not None and self._block.shape[1] != len(values):
+            self._flush()
+            self._block = None
+        if self._block is None:
+            self._block = np.empty((self._block_size, len(values)), dtype=np.float64)
+
+        self._block[self._block_rows] = values
+        self._block_timestamps[self._block_rows] = timestamp
+        self._block_rows += 1
+        if self._block_rows == self._block_size:
+            self._dispatch()
+        return
+
+    def _dispatch(self) -> None:
+        r"""
+        pass the collected rows to the stages, the block is copied because it is reused
+        """
+        if self._block_rows == 0:
+            return
+        values = self._block[: self._block_rows].copy()
+        timestamps = self._block_timestamps[: self._block_rows].copy()
+        self._block_rows = 0
+        for subscriber, stage in self._subscriptions:
+            if stage is None:
+                _putNoWait(subscriber, (values, timestamps))
+            else:
+                decimated = stage.process(values, timestamps)
+                if len(decimated[0]) > 0:
+                    _putNoWait(subscriber, decimated)
+        return
+
+    def _flush(self) -> None:
+        r"""
+        dispatch the incomplete block and the rows kept by the stages
+        """
+        self._dispatch()
+        for subscriber, stage in self._subscriptions:
+            if stage is not None:
+                decimated = stage.flush()
+                if decimated is not None and len(decimated[0]) > 0:
+                    _putNoWait(subscriber, decimated)
+        return
+
+
+def _prepend(
+    pending: Optional[DecimatedBlock], values: np.ndarray, timestamps: np.ndarray
+) -> DecimatedBlock:
+    r"""
+    prepend the rows kept from the previous block
+    """
+    if pending is None:
+        return values, timestamps
+    return np.concatenate((pending[0], values)), np.concatenate(
+        (pending[1], timestamps)
+    )
+
+
+def _putNoWait(subscriber: queue.Queue, item) -> None:
+    r"""
+    put an item into a queue, drop it if the queue is full
+    """
+    try:
+        subscriber.put_nowait(item)
+    except queue.Full:
+        pass
+    return
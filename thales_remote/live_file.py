@@ -0,0 +1,326 @@
+r"""
+  ____       __                        __    __   __      _ __
+ /_  / ___ _/ /  ___  ___ ___________ / /__ / /__/ /_____(_) /__
+  / /_/ _ `/ _ \/ _ \/ -_) __/___/ -_) / -_)  '_/ __/ __/ /  '_/
+ /___/\_,_/_//_/_//_/\__/_/      \__/_/\__/_/\_\\__/_/ /_/_/\_\
+
+Copyright 2024 Zahner-Elektrik GmbH & Co. KG
+
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the Software
+is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH
+THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import json
+import os
+import struct
+import threading
+import time
+from typing import Any, Optional
+
+import numpy as np
+
+from thales_remote.live_data import DataRow, LiveDataEvent
+
+_MAGIC = b"THLDATA1"
+_HEADER_PREFIX = struct.Struct("<8sI")
+_DATA_ALIGNMENT = 64
+
+
+class LiveDataFileWriter(object):
+    r"""Class which appends live data rows to a binary file.
+
+    The file starts with a small header with the column names, units and the start time. It is followed by the
+    rows as fixed-width records of little endian float64 values: the time in seconds since the start of the file
+    and one value per column. Because every record has the same size, the file is read without parsing by
+    :class:`.LiveDataFile` with :class:`numpy.memmap`, also while it is still written.
+
+    The rows are buffered and written to the file by a timer thread every flush interval, also if no further
+    rows arrive, so a crash loses at most the rows of one interval.
+
+    The writer can be registered with :func:`~thales_remote.live_data.LiveDataStream.onEvent`, then the data
+    rows are appended.
+
+    :param path: The path of the file. An existing file is overwritten.
+    :param names: Names of the columns.
+    :param units: Units of the columns, empty if unknown.
+    :param flushInterval: Time in seconds after which the buffered rows are written to the file.
+    :param metadata: Optional dict with additional JSON serializable values for the header.
+    """
+
+    _path: str
+    _file: Any
+    _columns: int
+    _start_timestamp: float
+    _flush_interval: float
+    _rows: int
+    _flushed_rows: int
+    _record: np.ndarray
+    _mutex: threading.Lock
+    _closed: threading.Event
+    _flusher: threading.Thread
+
+    def __init__(
+        self,
+        path: str,
+        names: list[str],
+        units: Optional[list[str]] = None,
+        flushInterval: float = 1.0,
+        metadata: Optional[dict[str, Any]] = None,
+    ):
+        self._path = path
+        self._columns = len(names)
+        self._start_timestamp = time.monotonic()
+        self._flush_interval = flushInterval
+        self._rows = 0
+        self._flushed_rows = 0
+        self._record = np.zeros(self._columns + 1, dtype="<f8")
+        self._mutex = threading.Lock()
+        self._closed = threading.Event()
+
+        header = {
+            "names": list(names),
+            "units": list(units) if units is not None else [],
+            "startTime": time.time(),
+            "metadata": metadata if metadata is not None else {},
+        }
+        headerBytes = json.dumps(header).encode("utf-8")
+        headerSize = _HEADER_PREFIX.size + len(headerBytes)
+        padding = -headerSize % _DATA_ALIGNMENT
+
+        self._file = open(path, "wb")
+        self._file.write(_HEADER_PREFIX.pack(_MAGIC, len(headerBytes) + padding))
+        self._file.write(headerBytes + b" " * padding)
+        self._file.flush()
+
+        self._flusher = threading.Thread(target=self._flushJob, daemon=True)
+        self._flusher.start()
+        return
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def getPath(self) -> str:
+        r"""
+        get the path of the file
+
+        :returns: The path.
+        """
+        return self._path
+
+    def getNumberOfRows(self) -> int:
+        r"""
+        get the number of appended rows, including the rows not written yet
+
+        :returns: number of rows
+        """
+        return self._rows
+
+    def append(self, values: np.ndarray, timestamp: Optional[float] = None) -> None:
+        r"""
+        append a row
+
+        :param values: The values of the row, one per column.
+        :param timestamp: Time of the row in seconds of :func:`time.monotonic`, None for the current time.
+        """
+        if len(values) != self._columns:
+            raise ValueError(
+                f"the row has {len(values)} values, the file has {self._columns} columns"
+            )
+        if timestamp is None:
+            timestamp = time.monotonic()
+        with self._mutex:
+            self._record[0] = timestamp - self._start_timestamp
+            self._record[1:] = values
+            self._file.write(self._record.tobytes())
+            self._rows += 1
+        return
+
+    def appendBlock(self, values: np.ndarray, timestamps: np.ndarray) -> None:
+        r"""
+        append several rows at once
+
+        The blocks of a full-rate subscription of the :class:`~thales_remote.live_decimation.LiveDataDecimator`
+        can be passed directly.
+
+        :param values: 2-D array with one row per sample.
+        :param timestamps: 1-D array with the times of the rows in seconds of :func:`time.monotonic`.
+        """
+        if values.ndim != 2 or values.shape[1] != self._columns:
+            raise ValueError(
+                f"the block has the shape {values.shape}, the file has {self._columns} columns"
+            )
+        records = np.empty((len(values), self._columns + 1), dtype="<f8")
+        records[:, 0] = timestamps - self._start_timestamp
+        records[:, 1:] = values
+        with self._mutex:
+            self._file.write(records.tobytes())
+            self._rows += len(values)
+        return
+
+    def handleEvent(self, event: LiveDataEvent) -> None:
+        r"""
+        process an event of the :class:`~thales_remote.live_data.LiveDataStream`, data rows are appended
+
+        :param event: The event.
+        """
+        if isinstance(event, DataRow):
+            self.append(event.values, event.timestamp)
+        return
+
+    def flush(self) -> None:
+        r"""
+        write the buffered rows to the file
+        """
+        with self._mutex:
+            if not self._file.closed:
+                self._file.flush()
+                self._flushed_rows = self._rows
+        return
+
+    def close(self) -> None:
+        r"""
+        write the buffered rows, stop the timer thread and close the file
+        """
+        self._closed.set()
+        if self._flusher is not threading.current_thread():
+            self._flusher.join()
+        with self._mutex:
+            if not self._file.closed:
+                self._file.close()
+        return
+
+    # The following methods should not be called by the user.
+    # They are marked with the prefix '_' after the Python convention for proteced.
+
+    def _flushJob(self) -> None:
+        r"""
+        method running in a separate thread; writes the buffered rows every flush interval
+        """
+        while not self._closed.wait(self._flush_interval):
+            if self._flushed_rows != self._rows:
+                self.flush()
+        return
+
+
+class LiveDataFile(object):
+    r"""Class which reads a file written by :class:`.LiveDataFileWriter`.
+
+    The records are memory mapped, so opening the file is instant and only the accessed parts are read by the
+    operating system. If the file is still written, :func:`~thales_remote.live_file.LiveDataFile.refresh` maps
+    the rows appended in the meantime. An incomplete last record is not mapped.
+
+    :param path: The path of the file.
+    """
+
+    _path: str
+    _header: dict[str, Any]
+    _data_offset: int
+    _records: np.ndarray
+
+    def __init__(self, path: str):
+        self._path = path
+        with open(path, "rb") as file:
+            magic, headerSize = _HEADER_PREFIX.unpack(file.read(_HEADER_PREFIX.size))
+            if magic != _MAGIC:
+                raise ValueError(f"not a live data file: {path}")
+            self._header = json.loads(file.read(headerSize).decode("utf-8"))
+        self._data_offset = _HEADER_PREFIX.size + headerSize
+        self.refresh()
+        return
+
+    def refresh(self) -> int:
+        r"""
+        map the rows appended since opening or the last refresh
+
+        :returns: The number of rows.
+        """
+        recordSize = 8 * (len(self._header["names"]) + 1)
+        rows = max(os.path.getsize(self._path) - self._data_offset, 0) // recordSize
+        if rows == 0:
+            self._records = np.zeros((0, len(self._header["names"]) + 1), dtype="<f8")
+        else:
+            self._records = np.memmap(
+                self._path,
+                dtype="<f8",
+                mode="r",
+                offset=self._data_offset,
+                shape=(rows, len(self._header["names"]) + 1),
+            )
+        return rows
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def getColumnNames(self) -> list[str]:
+        r"""
+        get the names of the columns
+
+        :returns: List with the names.
+        """
+        return list(self._header["names"])
+
+    def getColumnUnits(self) -> list[str]:
+        r"""
+        get the units of the columns
+
+        :returns: List with the units, empty if they were unknown.
+        """
+        return list(self._header["units"])
+
+    def getStartTime(self) -> float:
+        r"""
+        get the time the file was created
+
+        :returns: time in seconds since the epoch
+        """
+        return self._header["startTime"]
+
+    def getMetadata(self) -> dict[str, Any]:
+        r"""
+        get the additional values of the header
+
+        :returns: Dict with the values.
+        """
+        return dict(self._header.get("metadata", {}))
+
+    def getTimes(self) -> np.ndarray:
+        r"""
+        get the times of the rows
+
+        :returns: Memory mapped array with the time in seconds since the start time.
+        """
+        return self._records[:, 0]
+
+    def getValues(self) -> np.ndarray:
+        r"""
+        get the values of all columns
+
+        :returns: Memory mapped 2-D array with one row per sample.
+        """
+        return self._records[:, 1:]
+
+    def getColumn(self, name: str) -> np.ndarray:
+        r"""
+        get the values of one column
+
+        :param name: The name of the column.
+        :returns: Memory mapped array with the values.
+        """
+        return self._records[:, 1 + self._header["names"].index(name)]
@@ -0,0 +1,418 @@
+r"""
+  ____       __                        __    __   __      _ __
+ /_  / ___ _/ /  ___  ___ ___________ / /__ / /__/ /_____(_) /__
+  / /_/ _ `/ _ \/ _ \/ -_) __/___/ -_) / -_)  '_/ __/ __/ /  '_/
+ /___/\_,_/_//_/_//_/\__/_/      \__/_/\__/_/\_\\__/_/ /_/_/\_\
+
+Copyright 2024 Zahner-Elektrik GmbH & Co. KG
+
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the Software
+is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH
+THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import threading
+import time
+import warnings
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Optional, Union
+
+import numpy as np
+
+from thales_remote.connection import ThalesRemoteConnection
+from thales_remote.live_data import (
+    DataRow,
+    LiveDataEvent,
+    MeasurementBegin,
+    MeasurementEnd,
+)
+
+
+@dataclass
+class HealthThresholds:
+    r"""
+    Limits of the :class:`.LiveDataHealthMonitor`, None disables a limit.
+
+    :param maxQueueDepth: Maximum number of telegrams waiting in the queue of channel 2.
+    :param maxLag: Maximum lag of the data behind the local time in seconds.
+    :param minSampleRate: Minimum number of samples per second, only checked during a measurement.
+    :param maxJitter: Maximum standard deviation of the time between the samples in seconds.
+    :param maxGap: Maximum time between two samples in seconds during a measurement.
+    """
+
+    maxQueueDepth: Optional[int] = None
+    maxLag: Optional[float] = None
+    minSampleRate: Optional[float] = None
+    maxJitter: Optional[float] = None
+    maxGap: Optional[float] = None
+
+
+@dataclass
+class HealthAlert:
+    r"""
+    A limit of the :class:`.HealthThresholds` was exceeded.
+
+    :param metric: Name of the exceeded limit, for example "maxLag".
+    :param value: The measured value.
+    :param limit: The limit.
+    :param timestamp: Time of the check in seconds of :func:`time.monotonic`.
+    """
+
+    metric: str
+    value: float
+    limit: float
+    timestamp: float
+
+
+@dataclass
+class LiveDataHealthSnapshot:
+    r"""
+    State of the live data stream.
+
+    The rates, the inter-arrival times and the lag are calculated over the rolling window.
+
+    :param packets: Number of packets since the start or reset.
+    :param samples: Number of data rows since the start or reset.
+    :param packetRate: Packets per second.
+    :param sampleRate: Data rows per second.
+    :param meanInterArrival: Mean time between two data rows in seconds.
+    :param jitter: Standard deviation of the time between two data rows in seconds.
+    :param gaps: Number of detected gaps since the start or reset.
+    :param longestGap: Longest time between two data rows in seconds since the start or reset.
+    :param queueDepth: Number of telegrams waiting in the queue of channel 2, 0 without connection.
+    :param lag: Lag of the newest data row in seconds, None without time column.
+    :param maxLag: Maximum lag in seconds, None without time column.
+    :param activeAlerts: Names of the limits which are currently exceeded.
+    """
+
+    packets: int
+    samples: int
+    packetRate: float
+    sampleRate: float
+    meanInterArrival: float
+    jitter: float
+    gaps: int
+    longestGap: float
+    queueDepth: int
+    lag: Optional[float]
+    maxLag: Optional[float]
+    activeAlerts: list[str]
+
+
+class LiveDataHealthMonitor(object):
+    r"""Class which measures whether the live data stream keeps up with the measurement.
+
+    The monitor is registered with :func:`~thales_remote.live_data.LiveDataDecoder.onEvent` and counts the
+    packets and data rows with their reception times. A gap is a time between two data rows of a measurement
+    which is longer than the gap limit or, without limit, longer than five times the mean time between rows.
+
+    The lag is measured with a time column of the data: it is the increase of the reception time since the first
+    row of the measurement minus the increase of the time column. A growing lag shows that the data arrives
+    later than it is measured. With the connection, the queue depth of channel 2 is monitored, which grows if
+    the stream is not read fast enough.
+
+    The limits are checked at most every check interval in the thread of the stream. When a limit is exceeded,
+    the alert functions are called once, until the value is within the limit again.
+
+    :param connection: Optional connection of the stream for the queue depth.
+    :param window: Length of the rolling window in seconds.
+    :param thresholds: The limits for the alerts.
+    :param timeColumn: Name or index of the time column for the lag, None to use the first column whose name
+        starts with "time".
+    :param checkInterval: Minimum time in seconds between two checks of the limits.
+    """
+
+    _connection: Optional[ThalesRemoteConnection]
+    _window: float
+    _thresholds: HealthThresholds
+    _time_column: Optional[Union[str, int]]
+    _check_interval: float
+    _packet_times: deque[float]
+    _sample_times: deque[float]
+    _lags: deque[tuple[float, float]]
+    _packets: int
+    _samples: int
+    _gaps: int
+    _longest_gap: float
+    _gap_since_check: float
+    _last_sample_time: Optional[float]
+    _lag_origin: Optional[tuple[float, float]]
+    _last_check: float
+    _active_alerts: set[str]
+    _callbacks: list[Callable[[HealthAlert], None]]
+    _mutex: threading.Lock
+
+    def __init__(
+        self,
+        connection: Optional[ThalesRemoteConnection] = None,
+        window: float = 10.0,
+        thresholds: Optional[HealthThresholds] = None,
+        timeColumn: Optional[Union[str, int]] = None,
+        checkInterval: float = 0.5,
+    ):
+        self._connection = connection
+        self._window = window
+        self._thresholds = thresholds if thresholds is not None else HealthThresholds()
+        self._time_column = timeColumn
+        self._check_interval = checkInterval
+        self._callbacks = []
+        self._mutex = threading.Lock()
+        self.reset()
+        return
+
+    def reset(self) -> None:
+        r"""
+        delete the measured values
+        """
+        with self._mutex:
+            self._packet_times = deque()
+            self._sample_times = deque()
+            self._lags = deque()
+            self._packets = 0
+            self._samples = 0
+            self._gaps = 0
+            self._longest_gap = 0.0
+            self._gap_since_check = 0.0
+            self._last_sample_time = None
+            self._lag_origin = None
+            self._last_check = 0.0
+            self._active_alerts = set()
+        return
+
+    def setThresholds(self, thresholds: HealthThresholds) -> None:
+        r"""
+        set the limits for the alerts
+
+        :param thresholds: The limits.
+        """
+        with self._mutex:
+            self._thresholds = thresholds
+            self._active_alerts = set()
+        return
+
+    def onAlert(
+        self, callback: Callable[[HealthAlert], None]
+    ) -> Callable[[HealthAlert], None]:
+        r"""
+        register a function which is called when a limit is exceeded
+
+        :param callback: Function which is called with the :class:`.HealthAlert`.
+        :returns: The passed function, so that the method can also be used as decorator.
+        """
+        with self._mutex:
+            self._callbacks.append(callback)
+        return callback
+
+    def removeAlertCallback(self, callback: Callable[[HealthAlert], None]) -> None:
+        r"""
+        remove a function registered with :func:`~thales_remote.live_health.LiveDataHealthMonitor.onAlert`
+
+        :param callback: The registered function.
+        """
+        with self._mutex:
+            self._callbacks.remove(callback)
+        return
+
+    def handleEvent(self, event: LiveDataEvent) -> None:
+        r"""
+        process an event of the :class:`~thales_remote.live_data.LiveDataStream`
+
+        :param event: The event.
+        """
+        receiveTime = event.timestamp
+        with self._mutex:
+            self._packets += 1
+            self._packet_times.append(receiveTime)
+
+            if isinstance(event, (MeasurementBegin, MeasurementEnd)):
+                self._last_sample_time = None
+                self._lag_origin = None
+            elif isinstance(event, DataRow):
+                self._addSample(event, receiveTime)
+
+            self._dropOld(receiveTime)
+        self._checkAlerts(False)
+        return
+
+    def check(self) -> list[HealthAlert]:
+        r"""
+        compare the current state with the limits immediately
+
+        The limits are checked automatically when events arrive. If the stream stops completely, no events arrive,
+        so this method can be called periodically, for example from a timer, to detect it.
+
+        :returns: List with the limits which are newly exceeded.
+        """
+        return self._checkAlerts(True)
+
+    def getSnapshot(self) -> LiveDataHealthSnapshot:
+        r"""
+        get the current state of the stream
+
+        :returns: The snapshot.
+        """
+        with self._mutex:
+            self._dropOld(time.monotonic())
+            return self._snapshot()
+
+    # The following methods should not be called by the user.
+    # They are marked with the prefix '_' after the Python convention for proteced.
+
+    def _addSample(self, row: DataRow, receiveTime: float) -> None:
+        r"""
+        count a data row, detect gaps and measure the lag, the mutex must be locked
+        """
+        self._samples += 1
+        if self._last_sample_time is not None:
+            interArrival = receiveTime - self._last_sample_time
+            self._longest_gap = max(self._longest_gap, interArrival)
+            self._gap_since_check = max(self._gap_since_check, interArrival)
+            gapLimit = self._thresholds.maxGap
+            if gapLimit is None and len(self._sample_times) >= 2:
+                span = self._sample_times[-1] - self._sample_times[0]
+                gapLimit = 5 * span / (len(self._sample_times) - 1)
+            if gapLimit is not None and gapLimit > 0 and interArrival > gapLimit:
+                self._gaps += 1
+        self._last_sample_time = receiveTime
+        self._sample_times.append(receiveTime)
+
+        column = self._timeColumnIndex(row)
+        if column is not None:
+            dataTime = float(row.values[column])
+            if self._lag_origin is None:
+                self._lag_origin = (receiveTime, dataTime)
+            lag = (receiveTime - self._lag_origin[0]) - (dataTime - self._lag_origin[1])
+            self._lags.append((receiveTime, lag))
+        return
+
+    def _timeColumnIndex(self, row: DataRow) -> Optional[int]:
+        if isinstance(self._time_column, int):
+            return self._time_column if self._time_column < len(row.values) else None
+        for index, name in enumerate(row.names):
+            if (self._time_column is None and name.lower().startswith("time")) or (
+                name == self._time_column
+            ):
+                return index
+        return None
+
+    def _dropOld(self, now: float) -> None:
+        r"""
+        remove the values older than the window, the mutex must be locked
+        """
+        limit = now - self._window
+        for times in (self._packet_times, self._sample_times):
+            while len(times) > 0 and times[0] < limit:
+                times.popleft()
+        while len(self._lags) > 0 and self._lags[0][0] < limit:
+            self._lags.popleft()
+        return
+
+    def _snapshot(self) -> LiveDataHealthSnapshot:
+        r"""
+        calculate the snapshot, the mutex must be locked
+        """
+        interArrivals = np.diff(np.fromiter(self._sample_times, dtype=np.float64))
+        lags = [lag for _, lag in self._lags]
+        return LiveDataHealthSnapshot(
+            self._packets,
+            self._samples,
+            self._rate(self._packet_times),
+            self._rate(self._sample_times),
+            float(interArrivals.mean()) if len(interArrivals) > 0 else 0.0,
+            float(interArrivals.std()) if len(interArrivals) > 1 else 0.0,
+            self._gaps,
+            self._longest_gap,
+            self._connection.getQueueSize(2) if self._connection is not None else 0,
+            lags[-1] if lags else None,
+            max(lags) if lags else None,
+            sorted(self._active_alerts),
+        )
+
+    def _rate(self, times: deque[float]) -> float:
+        if len(times) < 2 or times[-1] <= times[0]:
+            return 0.0
+        return (len(times) - 1) / (times[-1] - times[0])
+
+    def _checkAlerts(self, force: bool) -> list[HealthAlert]:
+        r"""
+        compare the snapshot with the limits and call the alert functions for newly exceeded limits
+        """
+        now = time.monotonic()
+        with self._mutex:
+            if not force and now - self._last_check < self._check_interval:
+                return []
+            self._dropOld(now)
+            self._last_check = now
+            snapshot = self._snapshot()
+            thresholds = self._thresholds
+            measuring = self._last_sample_time is not None
+
+            exceeded = {}
+            if (
+                thresholds.maxQueueDepth is not None
+                and snapshot.queueDepth > thresholds.maxQueueDepth
+            ):
+                exceeded["maxQueueDepth"] = (
+                    snapshot.queueDepth,
+                    thresholds.maxQueueDepth,
+                )
+            if (
+                thresholds.maxLag is not None
+                and snapshot.lag is not None
+                and snapshot.lag > thresholds.maxLag
+            ):
+                exceeded["maxLag"] = (snapshot.lag, thresholds.maxLag)
+            if (
+                thresholds.minSampleRate is not None
+                and measuring
+                and len(self._sample_times) >= 2
+                and snapshot.sampleRate < thresholds.minSampleRate
+            ):
+                exceeded["minSampleRate"] = (
+                    snapshot.sampleRate,
+                    thresholds.minSampleRate,
+                )
+            if (
+                thresholds.maxJitter is not None
+                and snapshot.jitter > thresholds.maxJitter
+            ):
+                exceeded["maxJitter"] = (snapshot.jitter, thresholds.maxJitter)
+            gap = self._gap_since_check
+            if measuring:
+                gap = max(gap, now - self._last_sample_time)
+            self._gap_since_check = 0.0
+            if thresholds.maxGap is not None and gap > thresholds.maxGap:
+                exceeded["maxGap"] = (gap, thresholds.maxGap)
+
+            newAlerts = [
+                HealthAlert(metric, value, limit, now)
+                for metric, (value, limit) in exceeded.items()
+                if metric not in self._active_alerts
+            ]
+            self._active_alerts = set(exceeded.keys())
+            callbacks = list(self._callbacks)
+
+        for alert in newAlerts:
+            for callback in callbacks:
+                try:
+                    callback(alert)
+                except Exception as exception:
+                    warnings.warn(
+                        f"Exception in health alert callback: {exception!r}",
+                        RuntimeWarning,
+                    )
+        return newAlerts
@@ -0,0 +1,304 @@
+r"""
+  ____       __                        __    __   __      _ __
+ /_  / ___ _/ /  ___  ___ ___________ / /__ / /__/ /_____(_) /__
+  / /_/ _ `/ _ \/ _ \/ -_) __/___/ -_) / -_)  '_/ __/ __/ /  '_/
+ /___/\_,_/_//_/_//_/\__/_/      \__/_/\__/_/\_\\__/_/ /_/_/\_\
+
+Copyright 2024 Zahner-Elektrik GmbH & Co. KG
+
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the Software
+is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH
+THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import dataclasses
+import datetime
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from thales_remote.live_data import (
+    DataRow,
+    LiveDataEvent,
+    MeasurementBegin,
+    MeasurementEnd,
+)
+from thales_remote.live_file import LiveDataFile, LiveDataFileWriter
+
+
+@dataclass
+class MeasurementSegment:
+    r"""
+    Entry of the index of the :class:`.LiveDataSegmenter`.
+
+    :param number: Consecutive number of the segment in the directory.
+    :param kind: Kind of the measurement, the text of the packet of the measurement begin.
+    :param startTime: Time of the measurement begin in seconds since the epoch.
+    :param day: Local date of the start time in ISO format, for example "2024-05-17".
+    :param fileName: Name of the file with the data in the directory.
+    :param rows: Number of rows, 0 while the measurement is running.
+    :param endTime: Time of the measurement end in seconds since the epoch or None if the measurement did not end.
+    :param completed: True if the measurement end was received.
+    """
+
+    number: int
+    kind: str
+    startTime: float
+    day: str
+    fileName: str
+    rows: int = 0
+    endTime: Optional[float] = None
+    completed: bool = False
+
+
+class LiveDataSegmenter(object):
+    r"""Class which splits the live data into one file per measurement.
+
+    A new segment is started with every measurement begin of the :class:`~thales_remote.live_data.LiveDataStream`
+    and written with a :class:`~thales_remote.live_file.LiveDataFileWriter`, which stores the names, units and
+    kind of the measurement in the header. Rows without a preceding measurement begin start a segment with
+    an empty kind. If the number of columns changes within a measurement, a new segment of the same kind is
+    started.
+
+    The index is written to "index.jsonl" in the directory, when a segment starts and when it ends.
+    It is kept in memory grouped by day and kind, so the n-th measurement of a kind on a day is found directly:
+
+    .. code-block:: python
+
+        segmenter = LiveDataSegmenter("live")
+        stream.onEvent(segmenter.handleEvent)
+        ...
+        thirdEis = segmenter.find("EIS", 2)
+        data = segmenter.open(thirdEis)
+
+    :param directory: The directory of the segments. It is created if it does not exist.
+    :param flushInterval: Time in seconds after which the buffered rows are written to the file.
+    """
+
+    _directory: str
+    _flush_interval: float
+    _segments: dict[int, MeasurementSegment]
+    _by_day_and_kind: dict[tuple[str, str], list[MeasurementSegment]]
+    _current: Optional[MeasurementSegment]
+    _writer: Optional[LiveDataFileWriter]
+    _writer_names: list[str]
+    _pending_kind: Optional[str]
+    _pending_start: float
+    _mutex: threading.Lock
+
+    def __init__(self, directory: str, flushInterval: float = 1.0):
+        self._directory = directory
+        self._flush_interval = flushInterval
+        self._segments = {}
+        self._by_day_and_kind = {}
+        self._current = None
+        self._writer = None
+        self._writer_names = []
+        self._pending_kind = None
+        self._pending_start = 0.0
+        self._mutex = threading.Lock()
+
+        os.makedirs(self._directory, exist_ok=True)
+        self._loadIndex()
+        return
+
+    def handleEvent(self, event: LiveDataEvent) -> None:
+        r"""
+        process an event of the :class:`~thales_remote.live_data.LiveDataStream`
+
+        :param event: The event.
+        """
+        with self._mutex:
+            if isinstance(event, MeasurementBegin):
+                self._finishSegment(False)
+                self._pending_kind = event.text.strip()
+                self._pending_start = time.time()
+            elif isinstance(event, MeasurementEnd):
+                self._finishSegment(True)
+                self._pending_kind = None
+            elif isinstance(event, DataRow):
+                if self._writer is not None and len(event.values) != len(
+                    self._writer_names
+                ):
+                    kind = self._current.kind
+                    self._finishSegment(False)
+                    self._pending_kind = kind
+                    self._pending_start = time.time()
+                if self._writer is None:
+                    self._startSegment(event)
+                self._writer.append(event.values, event.timestamp)
+        return
+
+    def close(self) -> None:
+        r"""
+        close the file of the running measurement, it is indexed as not completed
+        """
+        with self._mutex:
+            self._finishSegment(False)
+        return
+
+    def getSegments(
+        self, kind: Optional[str] = None, day: Optional[str] = None
+    ) -> list[MeasurementSegment]:
+        r"""
+        get the indexed segments
+
+        :param kind: Only segments of this kind, the case is ignored.
+        :param day: Only segments started on this local date in ISO format, for example "2024-05-17".
+        :returns: List with the segments in the order of the start.
+        """
+        with self._mutex:
+            if kind is not None and day is not None:
+                return list(self._by_day_and_kind.get((day, kind.lower()), []))
+            return [
+                segment
+                for segment in sorted(
+                    self._segments.values(), key=lambda segment: segment.number
+                )
+                if (kind is None or segment.kind.lower() == kind.lower())
+                and (day is None or segment.day == day)
+            ]
+
+    def find(
+        self, kind: str, index: int, day: Optional[str] = None
+    ) -> Optional[MeasurementSegment]:
+        r"""
+        find the n-th measurement of a kind on a day
+
+        :param kind: Kind of the measurement, the case is ignored.
+        :param index: Index of the measurement on the day, starting with 0. Negative values count from the end.
+        :param day: Local date in ISO format, None for today.
+        :returns: The segment or None if there is no such measurement.
+        """
+        if day is None:
+            day = datetime.date.today().isoformat()
+        with self._mutex:
+            segments = self._by_day_and_kind.get((day, kind.lower()), [])
+            try:
+                return segments[index]
+            except IndexError:
+                return None
+
+    def open(self, segment: MeasurementSegment) -> LiveDataFile:
+        r"""
+        open the data of a segment
+
+        :param segment: The segment.
+        :returns: The memory mapped file.
+        """
+        return LiveDataFile(os.path.join(self._directory, segment.fileName))
+
+    # The following methods should not be called by the user.
+    # They are marked with the prefix '_' after the Python convention for proteced.
+
+    def _indexPath(self) -> str:
+        return os.path.join(self._directory, "index.jsonl")
+
+    def _startSegment(self, row: DataRow) -> None:
+        r"""
+        open the file of a new segment with the columns of the first row
+        """
+        kind = self._pending_kind if self._pending_kind is not None else ""
+        startTime = (
+            self._pending_start if self._pending_kind is not None else time.time()
+        )
+        number = max(self._segments.keys(), default=0) + 1
+        segment = MeasurementSegment(
+            number,
+            kind,
+            startTime,
+            datetime.date.fromtimestamp(startTime).isoformat(),
+            f"segment_{number:06d}.live",
+        )
+
+        names = list(row.names)
+        if len(names) != len(row.values):
+            names = [f"column{index}" for index in range(len(row.values))]
+        units = list(row.units) if len(row.units) == len(row.values) else []
+
+        self._writer = LiveDataFileWriter(
+            os.path.join(self._directory, segment.fileName),
+            names,
+            units,
+            self._flush_interval,
+            {"kind": kind, "number": number, "measurementStartTime": startTime},
+        )
+        self._writer_names = names
+        self._current = segment
+        self._addSegment(segment)
+        self._writeIndexEntry(segment)
+        return
+
+    def _finishSegment(self, completed: bool) -> None:
+        r"""
+        close the file of the current segment and update the index
+        """
+        if self._writer is None:
+            return
+        self._writer.close()
+        self._current.rows = self._writer.getNumberOfRows()
+        self._current.endTime = time.time() if completed else None
+        self._current.completed = completed
+        self._writeIndexEntry(self._current)
+        self._writer = None
+        self._current = None
+        return
+
+    def _addSegment(self, segment: MeasurementSegment) -> None:
+        self._segments[segment.number] = segment
+        self._by_day_and_kind.setdefault(
+            (segment.day, segment.kind.lower()), []
+        ).append(segment)
+        return
+
+    def _writeIndexEntry(self, segment: MeasurementSegment) -> None:
+        with open(self._indexPath(), "a+b") as index:
+            line = json.dumps(dataclasses.asdict(segment)).encode("utf-8") + b"\n"
+            if index.seek(0, os.SEEK_END) > 0:
+                index.seek(-1, os.SEEK_END)
+                if index.read(1) != b"\n":
+                    line = b"\n" + line
+            index.write(line)
+        return
+
+    def _loadIndex(self) -> None:
+        r"""
+        read the index and cut off an incomplete last line, the last entry of a segment is valid
+        """
+        if not os.path.exists(self._indexPath()):
+            return
+        segments = {}
+        indexEnd = 0
+        position = 0
+        with open(self._indexPath(), "rb") as index:
+            for line in index:
+                position += len(line)
+                try:
+                    segment = MeasurementSegment(**json.loads(line))
+                except (json.JSONDecodeError, UnicodeDecodeError, TypeError):
+                    # incomplete last line of an interrupted write
+                    continue
+                indexEnd = position
+                segments[segment.number] = segment
+        if position > indexEnd:
+            # the next entry must not be appended to an incomplete line
+            os.truncate(self._indexPath(), indexEnd)
+        for number in sorted(segments):
+            self._addSegment(segments[number])
+        return
@@ -0,0 +1,549 @@
+r"""
+  ____       __                        __    __   __      _ __
+ /_  / ___ _/ /  ___  ___ ___________ / /__ / /__/ /_____(_) /__
+  / /_/ _ `/ _ \/ _ \/ -_) __/___/ -_) / -_)  '_/ __/ __/ /  '_/
+ /___/\_,_/_//_/_//_/\__/_/      \__/_/\__/_/\_\\__/_/ /_/_/\_\
+
+Copyright 2024 Zahner-Elektrik GmbH & Co. KG
+
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the Software
+is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH
+THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import threading
+import time
+import warnings
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Optional, Union
+
+import numpy as np
+
+from thales_remote.live_data import (
+    ColumnNames,
+    DataRow,
+    LiveDataEvent,
+    MeasurementBegin,
+)
+
+
+class TriggerCondition(object):
+    r"""Base class of the conditions of the :class:`.TriggerEngine`.
+
+    A condition evaluates a block of rows at once and returns for every row whether it is fulfilled.
+    Conditions which need previous rows keep them between the blocks.
+
+    :param column: Name or index of the evaluated column.
+    """
+
+    _column: Union[str, int]
+
+    def __init__(self, column: Union[str, int]):
+        self._column = column
+        return
+
+    def evaluate(
+        self, values: np.ndarray, timestamps: np.ndarray, names: list[str]
+    ) -> np.ndarray:
+        r"""
+        evaluate the condition for a block of rows
+
+        :param values: 2-D array with one row per sample.
+        :param timestamps: 1-D array with the timestamps of the rows in seconds.
+        :param names: Names of the columns.
+        :returns: Boolean array with True for every row which fulfills the condition.
+        """
+        raise NotImplementedError()
+
+    def reset(self) -> None:
+        r"""
+        discard the kept rows, called at the begin of a measurement
+        """
+        return
+
+    # The following methods should not be called by the user.
+    # They are marked with the prefix '_' after the Python convention for proteced.
+
+    def _columnValues(self, values: np.ndarray, names: list[str]) -> np.ndarray:
+        if isinstance(self._column, str):
+            return values[:, names.index(self._column)]
+        return values[:, self._column]
+
+
+class ThresholdCondition(TriggerCondition):
+    r"""Condition which is fulfilled when a column crosses a limit.
+
+    With edge detection only the row which crosses the limit fulfills the condition, otherwise every row beyond
+    the limit.
+
+    :param column: Name or index of the evaluated column.
+    :param above: Upper limit or None.
+    :param below: Lower limit or None.
+    :param edge: True to fulfill the condition only when the limit is crossed.
+    """
+
+    _above: Optional[float]
+    _below: Optional[float]
+    _edge: bool
+    _previous: Optional[float]
+
+    def __init__(
+        self,
+        column: Union[str, int],
+        above: Optional[float] = None,
+        below: Optional[float] = None,
+        edge: bool = True,
+    ):
+        super().__init__(column)
+        self._above = above
+        self._below = below
+        self._edge = edge
+        self._previous = None
+        return
+
+    def evaluate(
+        self, values: np.ndarray, timestamps: np.ndarray, names: list[str]
+    ) -> np.ndarray:
+        column = self._columnValues(values, names)
+        beyond = self._beyond(column)
+        if self._edge and len(beyond) > 0:
+            previous = np.empty_like(beyond)
+            previous[1:] = beyond[:-1]
+            previous[0] = (
+                self._beyond(np.array([self._previous]))[0]
+                if self._previous is not None
+                else False
+            )
+            beyond = beyond & ~previous
+        if len(column) > 0:
+            self._previous = float(column[-1])
+        return beyond
+
+    def reset(self) -> None:
+        self._previous = None
+        return
+
+    def _beyond(self, column: np.ndarray) -> np.ndarray:
+        beyond = np.zeros(len(column), dtype=bool)
+        if self._above is not None:
+            beyond |= column > self._above
+        if self._below is not None:
+            beyond |= column < self._below
+        return beyond
+
+
+class _HistoryCondition(TriggerCondition):
+    r"""
+    Base of the conditions which evaluate a time window and keep the rows of the last window.
+    """
+
+    _window: float
+    _history_values: np.ndarray
+    _history_timestamps: np.ndarray
+
+    def __init__(self, column: Union[str, int], window: float):
+        super().__init__(column)
+        self._window = window
+        self.reset()
+        return
+
+    def reset(self) -> None:
+        self._history_values = np.empty(0, dtype=np.float64)
+        self._history_timestamps = np.empty(0, dtype=np.float64)
+        return
+
+    def _withHistory(
+        self, values: np.ndarray, timestamps: np.ndarray, names: list[str]
+    ) -> tuple[np.ndarray, np.ndarray, int]:
+        r"""
+        prepend the kept rows and keep the rows of the last window for the next block
+
+        :returns: the column and the timestamps with the history and the number of history rows
+        """
+        column = np.concatenate(
+            (self._history_values, self._columnValues(values, names))
+        )
+        times = np.concatenate((self._history_timestamps, timestamps))
+        historyLength = len(self._history_values)
+
+        if len(times) > 0:
+            keep = int(np.searchsorted(times, times[-1] - self._window, side="left"))
+            self._history_values = column[keep:]
+            self._history_timestamps = times[keep:]
+        return column, times, historyLength
+
+
+class SlopeCondition(_HistoryCondition):
+    r"""Condition which is fulfilled when a column drifts faster than a limit.
+
+    The slope of every row is calculated against the oldest row within the window before it.
+
+    :param column: Name or index of the evaluated column.
+    :param limit: Maximum absolute slope in units of the column per second.
+    :param window: Time in seconds over which the slope is calculated.
+    """
+
+    _limit: float
+
+    def __init__(self, column: Union[str, int], limit: float, window: float = 1.0):
+        self._limit = limit
+        super().__init__(column, window)
+        return
+
+    def evaluate(
+        self, values: np.ndarray, timestamps: np.ndarray, names: list[str]
+    ) -> np.ndarray:
+        column, times, historyLength = self._withHistory(values, timestamps, names)
+        current = np.arange(historyLength, len(times))
+        reference = np.searchsorted(times, times[current] - self._window, side="left")
+        deltaTime = times[current] - times[reference]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            slope = (column[current] - column[reference]) / deltaTime
+        return (deltaTime > 0) & (np.abs(slope) > self._limit)
+
+
+class WindowCondition(_HistoryCondition):
+    r"""Condition which is fulfilled when the mean of a column over a time window is beyond a limit.
+
+    The means of all rows of a block are calculated at once with cumulative sums.
+
+    :param column: Name or index of the evaluated column.
+    :param window: Length of the window in seconds.
+    :param above: Upper limit of the mean or None.
+    :param below: Lower limit of the mean or None.
+    """
+
+    _above: Optional[float]
+    _below: Optional[float]
+
+    def __init__(
+        self,
+        column: Union[str, int],
+        window: float,
+        above: Optional[float] = None,
+        below: Optional[float] = None,
+    ):
+        self._above = above
+        self._below = below
+        super().__init__(column, window)
+        return
+
+    def evaluate(
+        self, values: np.ndarray, timestamps: np.ndarray, names: list[str]
+    ) -> np.ndarray:
+        column, times, historyLength = self._withHistory(values, timestamps, names)
+        current = np.arange(historyLength, len(times))
+        start = np.searchsorted(times, times[current] - self._window, side="left")
+        cumulative = np.concatenate(([0.0], np.cumsum(column)))
+        mean = (cumulative[current + 1] - cumulative[start]) / (current + 1 - start)
+
+        beyond = np.zeros(len(current), dtype=bool)
+        if self._above is not None:
+            beyond |= mean > self._above
+        if self._below is not None:
+            beyond |= mean < self._below
+        return beyond
+
+
+@dataclass
+class TriggerEvent:
+    r"""
+    Information passed to the action of a fired trigger.
+
+    :param name: Name of the trigger.
+    :param values: Values of the row which fulfilled the condition.
+    :param names: Names of the columns.
+    :param timestamp: Time of the reception of the row in seconds of :func:`time.monotonic`.
+    :param detectionTime: Time of the detection in seconds of :func:`time.monotonic`.
+    """
+
+    name: str
+    values: np.ndarray
+    names: list[str]
+    timestamp: float
+    detectionTime: float
+
+    def getDetectionLatency(self) -> float:
+        r"""
+        get the time from the reception of the row to the detection
+
+        :returns: latency in seconds
+        """
+        return self.detectionTime - self.timestamp
+
+
+@dataclass
+class TriggerLatency:
+    r"""
+    Latencies of the fired triggers, the mean and maximum values of the last 1000 firings.
+
+    :param fired: Number of fired triggers.
+    :param lastDetection: Time in seconds from the reception of the row to the detection of the last trigger.
+    :param meanDetection: Mean time in seconds from the reception to the detection.
+    :param maxDetection: Maximum time in seconds from the reception to the detection.
+    :param lastAction: Time in seconds from the reception of the row to the end of the action of the last trigger.
+    :param meanAction: Mean time in seconds from the reception to the end of the action.
+    :param maxAction: Maximum time in seconds from the reception to the end of the action.
+    """
+
+    fired: int
+    lastDetection: float
+    meanDetection: float
+    maxDetection: float
+    lastAction: float
+    meanAction: float
+    maxAction: float
+
+
+class Trigger(object):
+    r"""Trigger of the :class:`.TriggerEngine`, created with
+    :func:`~thales_remote.live_trigger.TriggerEngine.addTrigger`.
+
+    :param name: Name of the trigger.
+    :param condition: The condition.
+    :param action: Function which is called with the :class:`.TriggerEvent` when the condition is fulfilled.
+    :param oneShot: If True the trigger is disarmed after it has fired.
+    :param holdoff: Minimum time in seconds between two firings.
+    """
+
+    name: str
+    condition: TriggerCondition
+    action: Callable[[TriggerEvent], None]
+    oneShot: bool
+    holdoff: float
+    armed: bool
+    fired: int
+    _last_fired: Optional[float]
+
+    def __init__(
+        self,
+        name: str,
+        condition: TriggerCondition,
+        action: Callable[[TriggerEvent], None],
+        oneShot: bool = True,
+        holdoff: float = 0.0,
+    ):
+        self.name = name
+        self.condition = condition
+        self.action = action
+        self.oneShot = oneShot
+        self.holdoff = holdoff
+        self.armed = True
+        self.fired = 0
+        self._last_fired = None
+        return
+
+    def arm(self) -> None:
+        r"""
+        arm the trigger again after it has fired
+        """
+        self.armed = True
+        return
+
+
+class TriggerEngine(object):
+    r"""Class which evaluates conditions on the live data and fires actions.
+
+    The engine is registered with :func:`~thales_remote.live_data.LiveDataDecoder.onEvent`, so every row is
+    evaluated directly in the thread decoding the telegrams, without polling. Blocks of rows, for example from a
+    full-rate subscription of the :class:`~thales_remote.live_decimation.LiveDataDecimator`, are evaluated with
+    :func:`~thales_remote.live_trigger.TriggerEngine.handleBlock` vectorized. For every trigger at most one row
+    per block fires, the first one.
+
+    The actions are called in the thread of the engine for the lowest latency, the next rows are evaluated after
+    the action has returned. The times from the reception of the row to the detection and to the end of the
+    action are measured.
+
+    .. code-block:: python
+
+        engine = TriggerEngine()
+        stream.onEvent(engine.handleEvent)
+        engine.addTrigger(
+            ThresholdCondition("Potential", above=1.5),
+            lambda event: zahnerZennium.disablePotentiostat(),
+        )
+
+    The actions may use a :class:`~thales_remote.script_wrapper.ThalesRemoteScriptWrapper`, but with another
+    connection than the "Logging" connection of the stream.
+    """
+
+    _triggers: list[Trigger]
+    _names: list[str]
+    _mutex: threading.Lock
+    _fired: int
+    _detection_latencies: deque[float]
+    _action_latencies: deque[float]
+
+    def __init__(self):
+        self._triggers = []
+        self._names = []
+        self._mutex = threading.Lock()
+        self._fired = 0
+        self._detection_latencies = deque(maxlen=1000)
+        self._action_latencies = deque(maxlen=1000)
+        return
+
+    def addTrigger(
+        self,
+        condition: TriggerCondition,
+        action: Callable[[TriggerEvent], None],
+        oneShot: bool = True,
+        holdoff: float = 0.0,
+        name: Optional[str] = None,
+    ) -> Trigger:
+        r"""
+        add a trigger
+
+        :param condition: The condition.
+        :param action: Function which is called with the :class:`.TriggerEvent` when the condition is fulfilled.
+        :param oneShot: If True the trigger is disarmed after it has fired, it is armed again with
+            :func:`~thales_remote.live_trigger.Trigger.arm`.
+        :param holdoff: Minimum time in seconds between two firings.
+        :param name: Name of the trigger, default is a consecutive number.
+        :returns: The trigger.
+        """
+        with self._mutex:
+            trigger = Trigger(
+                name if name is not None else f"trigger{len(self._triggers)}",
+                condition,
+                action,
+                oneShot,
+                holdoff,
+            )
+            self._triggers.append(trigger)
+        return trigger
+
+    def removeTrigger(self, trigger: Trigger) -> None:
+        r"""
+        remove a trigger
+
+        :param trigger: The trigger returned by :func:`~thales_remote.live_trigger.TriggerEngine.addTrigger`.
+        """
+        with self._mutex:
+            self._triggers.remove(trigger)
+        return
+
+    def handleEvent(self, event: LiveDataEvent) -> None:
+        r"""
+        process an event of the :class:`~thales_remote.live_data.LiveDataStream`
+
+        :param event: The event.
+        """
+        if isinstance(event, DataRow):
+            if len(event.names) == len(event.values):
+                self._names = event.names
+            self.handleBlock(event.values.reshape(1, -1), np.array([event.timestamp]))
+        elif isinstance(event, ColumnNames):
+            self._names = event.names
+        elif isinstance(event, MeasurementBegin):
+            with self._mutex:
+                triggers = list(self._triggers)
+            for trigger in triggers:
+                trigger.condition.reset()
+        return
+
+    def handleBlock(self, values: np.ndarray, timestamps: np.ndarray) -> None:
+        r"""
+        evaluate the armed triggers for a block of rows and fire the actions
+
+        :param values: 2-D array with one row per sample.
+        :param timestamps: 1-D array with the reception times of the rows in seconds of :func:`time.monotonic`.
+        """
+        with self._mutex:
+            triggers = list(self._triggers)
+        names = self._names
+
+        for trigger in triggers:
+            try:
+                fulfilled = trigger.condition.evaluate(values, timestamps, names)
+            except (ValueError, IndexError) as exception:
+                # column not in the data of this measurement
+                warnings.warn(
+                    f"Trigger {trigger.name} not evaluated: {exception!r}",
+                    RuntimeWarning,
+                )
+                continue
+            if not trigger.armed:
+                continue
+
+            rows = np.flatnonzero(fulfilled)
+            if trigger._last_fired is not None and trigger.holdoff > 0:
+                rows = rows[timestamps[rows] >= trigger._last_fired + trigger.holdoff]
+            if len(rows) == 0:
+                continue
+            self._fire(trigger, values[rows[0]], float(timestamps[rows[0]]), names)
+        return
+
+    def getLatencyStatistics(self) -> TriggerLatency:
+        r"""
+        get the latencies of the fired triggers
+
+        :returns: The latencies.
+        """
+        with self._mutex:
+            detection = list(self._detection_latencies)
+            action = list(self._action_latencies)
+            return TriggerLatency(
+                self._fired,
+                detection[-1] if detection else 0.0,
+                sum(detection) / len(detection) if detection else 0.0,
+                max(detection, default=0.0),
+                action[-1] if action else 0.0,
+                sum(action) / len(action) if action else 0.0,
+                max(action, default=0.0),
+            )
+
+    def resetLatencyStatistics(self) -> None:
+        r"""
+        delete the measured latencies
+        """
+        with self._mutex:
+            self._fired = 0
+            self._detection_latencies = deque(maxlen=1000)
+            self._action_latencies = deque(maxlen=1000)
+        return
+
+    # The following methods should not be called by the user.
+    # They are marked with the prefix '_' after the Python convention for proteced.
+
+    def _fire(
+        self, trigger: Trigger, row: np.ndarray, timestamp: float, names: list[str]
+    ) -> None:
+        r"""
+        call the action of a trigger and measure the latencies
+        """
+        event = TriggerEvent(
+            trigger.name, row.copy(), names, timestamp, time.monotonic()
+        )
+        trigger.fired += 1
+        trigger._last_fired = timestamp
+        if trigger.oneShot:
+            trigger.armed = False
+        try:
+            trigger.action(event)
+        except Exception as exception:
+            warnings.warn(
+                f"Exception in trigger action {trigger.name}: {exception!r}",
+                RuntimeWarning,
+            )
+        finished = time.monotonic()
+
+        with self._mutex:
+            self._fired += 1
+            self._detection_latencies.append(event.getDetectionLatency())
+            self._action_latencies.append(finished - timestamp)
+        return
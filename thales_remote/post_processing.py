@@ -0,0 +1,227 @@
+r"""
+  ____       __                        __    __   __      _ __
+ /_  / ___ _/ /  ___  ___ ___________ / /__ / /__/ /_____(_) /__
+  / /_/ _ `/ _ \/ _ \/ -_) __/___/ -_) / -_)  '_/ __/ __/ /  '_/
+ /___/\_,_/_//_/_//_/\__/_/      \__/_/\__/_/\_\\__/_/ /_/_/\_\
+
+Copyright 2024 Zahner-Elektrik GmbH & Co. KG
+
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the Software
+is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH
+THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import importlib
+import multiprocessing
+import multiprocessing.context
+import os
+import queue
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Optional
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from thales_remote.file_interface import FileData
+
+_IMPORTERS = {
+    ".ism": ("zahner_analysis.file_import.ism_import", "IsmImport"),
+    ".isc": ("zahner_analysis.file_import.isc_import", "IscImport"),
+    ".isw": ("zahner_analysis.file_import.isw_import", "IswImport"),
+    ".iss": ("zahner_analysis.file_import.iss_import", "IssImport"),
+}
+
+_ARRAY_GETTERS = {
+    "frequency": "getFrequencyArray",
+    "impedance": "getImpedanceArray",
+    "phase": "getPhaseArray",
+    "time": "getTimeArray",
+    "potential": "getVoltageArray",
+    "current": "getCurrentArray",
+}
+
+
+def parseMeasurementFile(name: str, binaryData: bytes) -> dict[str, np.ndarray]:
+    r"""
+    Parse a measurement file with the matching importer of zahner_analysis.
+
+    The importer is selected with the file extension. All arrays the importer offers of frequency, impedance,
+    phase, time, potential and current are extracted as contiguous float64 arrays.
+    This function runs in the worker processes of the :class:`.FilePostProcessor`.
+
+    :param name: Name of the file.
+    :param binaryData: Content of the file.
+    :returns: Dict with the array name as key and the array as value.
+    """
+    extension = os.path.splitext(name)[1].lower()
+    if extension not in _IMPORTERS:
+        raise ValueError(f"no importer for file: {name}")
+
+    moduleName, className = _IMPORTERS[extension]
+    importer = getattr(importlib.import_module(moduleName), className)(binaryData)
+
+    arrays = {}
+    for key, getter in _ARRAY_GETTERS.items():
+        if hasattr(importer, getter):
+            arrays[key] = np.ascontiguousarray(
+                getattr(importer, getter)(), dtype=np.float64
+            )
+    return arrays
+
+
+@dataclass
+class ProcessedFile:
+    r"""
+    Result of the post-processing of a received file.
+
+    :param name: Name of the file.
+    :param path: Full path of the file on the computer running the Thales software.
+    :param arrays: Dict with the array name as key and the array as value, empty if an error occurred.
+    :param error: The exception raised while parsing or None.
+    """
+
+    name: str
+    path: str
+    arrays: dict[str, np.ndarray]
+    error: Optional[BaseException] = None
+
+
+class FilePostProcessor(object):
+    r"""Class which parses received files in a pool of processes.
+
+    Every submitted file is parsed in a worker process, so that parsing runs on all cores while the file
+    interface keeps receiving. The compact arrays are returned to the main process, put into the result queue
+    and passed to the result function. The result function is called by a thread of the process pool and
+    should return quickly.
+
+    The worker processes are started with the "spawn" method by default, also on Linux, because the connection
+    to Term runs threads and forking a process with threads can deadlock. Therefore the script which uses this
+    class must be protected with ``if __name__ == "__main__":``.
+
+    :param callback: Optional function which is called with every :class:`.ProcessedFile`.
+    :param workers: Number of worker processes, default is the number of cores.
+    :param parser: Function which parses a file in the worker processes. It gets the name and the content of the
+        file and must be defined at the top level of a module.
+    :param mpContext: Optional multiprocessing context for the worker processes, default is the "spawn" context.
+    """
+
+    results: queue.Queue[ProcessedFile]
+    _callback: Optional[Callable[[ProcessedFile], None]]
+    _parser: Callable[[str, bytes], dict[str, np.ndarray]]
+    _executor: ProcessPoolExecutor
+    _pending: int
+    _mutex: threading.Condition
+
+    def __init__(
+        self,
+        callback: Optional[Callable[[ProcessedFile], None]] = None,
+        workers: Optional[int] = None,
+        parser: Callable[[str, bytes], dict[str, np.ndarray]] = parseMeasurementFile,
+        mpContext: Optional[multiprocessing.context.BaseContext] = None,
+    ):
+        self.results = queue.Queue()
+        self._callback = callback
+        self._parser = parser
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=(
+                mpContext
+                if mpContext is not None
+                else multiprocessing.get_context("spawn")
+            ),
+        )
+        self._pending = 0
+        self._mutex = threading.Condition()
+        return
+
+    def submit(self, file: "FileData") -> Future:
+        r"""
+        parse a file in the process pool
+
+        :param file: The received file.
+        :returns: Future with the :class:`.ProcessedFile`.
+        """
+        if file.binaryData is not None:
+            binaryData = bytes(file.binaryData)
+        else:
+            with open(file.localPath, "rb") as localFile:
+                binaryData = localFile.read()
+
+        with self._mutex:
+            self._pending += 1
+
+        result: Future = Future()
+        parsing = self._executor.submit(self._parser, file.name, binaryData)
+        parsing.add_done_callback(lambda parsing: self._finish(file, parsing, result))
+        return result
+
+    def getNumberOfPendingFiles(self) -> int:
+        r"""
+        get the number of files which are not parsed yet
+
+        :returns: number of files
+        """
+        with self._mutex:
+            return self._pending
+
+    def waitUntilIdle(self, timeout: Optional[float] = None) -> bool:
+        r"""
+        wait until all submitted files are parsed
+
+        :param timeout: The timeout in seconds, blocking at None.
+        :returns: True if all files are parsed, False on timeout.
+        """
+        with self._mutex:
+            return self._mutex.wait_for(lambda: self._pending == 0, timeout)
+
+    def close(self, wait: bool = True) -> None:
+        r"""
+        shut down the process pool
+
+        :param wait: If True wait until all submitted files are parsed.
+        """
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+        return
+
+    # The following methods should not be called by the user.
+    # They are marked with the prefix '_' after the Python convention for proteced.
+
+    def _finish(self, file: "FileData", parsing: Future, result: Future) -> None:
+        r"""
+        publish the result of a parsed file
+        """
+        if parsing.cancelled():
+            processed = ProcessedFile(file.name, file.path, {}, None)
+            result.cancel()
+        elif parsing.exception() is not None:
+            processed = ProcessedFile(file.name, file.path, {}, parsing.exception())
+            result.set_result(processed)
+        else:
+            processed = ProcessedFile(file.name, file.path, parsing.result())
+            result.set_result(processed)
+
+        try:
+            if not parsing.cancelled():
+                self.results.put(processed)
+                if self._callback is not None:
+                    self._callback(processed)
+        finally:
+            with self._mutex:
+                self._pending -= 1
+                self._mutex.notify_all()
+        return
@@ -26,12 +26,15 @@ THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
 from enum import Enum, IntEnum
 import re
-import shutil
-import os
-from typing import Optional, Union, Any, List
+import time
+from dataclasses import dataclass
+from typing import Optional, Union, Any, List, Sequence
+
+import numpy as np
 
 from thales_remote.error import ThalesRemoteError, TermConnectionError
 from thales_remote.connection import ThalesRemoteConnection
+from thales_remote.sequence_manager import SequenceManager
 
 MINIMUM_THALES_VERSION = "5.9.3"
 
@@ -133,6 +136,26 @@ class Pad4Mode(IntEnum):
     CURRENT = 1
 
 
+@dataclass
+class Snapshot:
+    r"""
+    Potential, current and ACQ values read with a single request.
+
+    :param timestamp: Time of the request in seconds since the epoch, taken on the computer running Python.
+        It is the middle between sending the request and receiving the reply.
+    :param potential: The measured potential.
+    :param current: The measured current.
+    :param acq: Dict with the ACQ channel index as key and the value as value.
+        Empty if the ACQ channels were not requested.
+    """
+
+    __slots__ = ("timestamp", "potential", "current", "acq")
+    timestamp: float
+    potential: float
+    current: float
+    acq: dict[int, float]
+
+
 class ThalesRemoteScriptWrapper(object):
     r"""
     Wrapper that uses the ThalesRemoteConnection class.
@@ -144,10 +167,13 @@ class ThalesRemoteScriptWrapper(object):
     """
 
     undefindedStandardErrorString: str = ""
+    _pad4SeparatorTable = str.maketrans(";,", "  ")
     _remote_connection: ThalesRemoteConnection
+    _sequence_managers: dict[str, SequenceManager]
 
     def __init__(self, remoteConnection: ThalesRemoteConnection):
         self._remote_connection = remoteConnection
+        self._sequence_managers = dict()
         try:
             versionReply = self.getThalesVersion(timeout=1)
         except TermConnectionError as err:
@@ -202,6 +228,53 @@ class ThalesRemoteScriptWrapper(object):
         """
         return self.getPotential()
 
+    def snapshot(self, includeAcq: bool = True) -> Snapshot:
+        r"""
+        Read potential, current and optionally all ACQ channels with one request
+
+        The queries are sent together as one telegram with the ':'-separated Remote2 syntax, so that only one
+        round trip is necessary and the values are measured closer to each other than with
+        :func:`~thales_remote.script_wrapper.ThalesRemoteScriptWrapper.getPotential`,
+        :func:`~thales_remote.script_wrapper.ThalesRemoteScriptWrapper.getCurrent` and
+        :func:`~thales_remote.script_wrapper.ThalesRemoteScriptWrapper.readAllAcqChannels` one after the other.
+
+        The ACQ channels must be set up and enabled, otherwise Thales answers with an error.
+
+        :param includeAcq: If True, all active ACQ channels are also read.
+        :returns: :class:`.Snapshot` with the values and the timestamp of the request.
+        """
+        command = "POTENTIAL:CURRENT"
+        if includeAcq:
+            command += ":ANALOGALL"
+
+        sendTime = time.time()
+        reply = self.executeRemoteCommand(command)
+        timestamp = (sendTime + time.time()) / 2
+
+        if reply.find("ERROR") >= 0:
+            raise ThalesRemoteError(
+                reply.rstrip("\r")
+                + ThalesRemoteScriptWrapper.undefindedStandardErrorString
+            )
+
+        potential = re.search(r"potential=\s*([-+0-9.eE]+)", reply)
+        current = re.search(r"current=\s*([-+0-9.eE]+)", reply)
+        if potential is None or current is None:
+            raise ThalesRemoteError(
+                "Unexpected reply: "
+                + reply.rstrip("\r")
+                + ThalesRemoteScriptWrapper.undefindedStandardErrorString
+            )
+
+        acq = {}
+        if includeAcq:
+            for match in re.finditer(r"ACQVAL\((\d+)\)=\s*([-+0-9.eE]+)", reply):
+                acq[int(match.group(1))] = float(match.group(2))
+
+        return Snapshot(
+            timestamp, float(potential.group(1)), float(current.group(1)), acq
+        )
+
     def setCurrent(self, current: float) -> str:
         r"""
         Set the output current
@@ -853,6 +926,84 @@ class ThalesRemoteScriptWrapper(object):
             retval.append(val.imag)
         return retval
 
+    def getImpedancePad4AsNumpyArray(
+        self,
+        frequency: Optional[float] = None,
+        amplitude: Optional[float] = None,
+        number_of_periods: Optional[int] = None,
+        out: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        r"""
+        Measure the impedance with PAD4 channels into a NumPy array
+
+        Like :func:`~thales_remote.script_wrapper.ThalesRemoteScriptWrapper.getImpedancePad4`, but the reply is parsed
+        directly into a complex NumPy array without creating Python objects for every channel.
+        The MAIN channel has index 0. Switched off PAD4 channels have an impedance of 0.
+
+        If *out* is passed, the values are written into this array, for example a row of a preallocated matrix.
+        It must be a one-dimensional complex128 array with at least as many elements as channels.
+
+        :param frequency: The frequency to measure the impedance at.
+        :param amplitude: The amplitude to measure the impedance with. In Volt if potentiostatic mode or Ampere for galvanostatic mode.
+        :param number_of_periods: The number of periods / waves to average.
+        :param out: Optional preallocated complex array which is filled.
+        :returns: Complex array with the impedance of each channel, a view of *out* if it was passed.
+        """
+        if frequency != None:
+            self.setFrequency(frequency)
+
+        if amplitude != None:
+            self.setAmplitude(amplitude)
+
+        if number_of_periods != None:
+            self.setNumberOfPeriods(number_of_periods)
+
+        reply = self.executeRemoteCommand("PAD4IMP")
+
+        if reply.find("ERROR") >= 0:
+            raise ThalesRemoteError(
+                reply.rstrip("\r")
+                + ThalesRemoteScriptWrapper.undefindedStandardErrorString
+            )
+        return self._parsePad4ImpedanceReply(reply, out)
+
+    def measureImpedancePad4Spectrum(
+        self,
+        frequencies: Sequence[float],
+        amplitude: Optional[float] = None,
+        number_of_periods: Optional[int] = None,
+    ) -> np.ma.MaskedArray:
+        r"""
+        Measure the impedance with PAD4 channels at several frequencies
+
+        The single frequency impedance is measured with
+        :func:`~thales_remote.script_wrapper.ThalesRemoteScriptWrapper.getImpedancePad4AsNumpyArray` at each frequency
+        and written into a preallocated matrix with one row per frequency and one column per channel.
+        The MAIN channel is column 0.
+        Switched off PAD4 channels and channels missing in the reply of a frequency are masked in the returned
+        array instead of being 0. The number of channels is taken from the first frequency, a later reply with more
+        channels raises a ThalesRemoteError.
+
+        :param frequencies: The frequencies to measure the impedance at.
+        :param amplitude: The amplitude to measure the impedance with. In Volt if potentiostatic mode or Ampere for galvanostatic mode.
+        :param number_of_periods: The number of periods / waves to average.
+        :returns: Masked complex array with the shape (number of frequencies, number of channels).
+        """
+        if len(frequencies) == 0:
+            return np.ma.masked_equal(np.zeros((0, 0), dtype=np.complex128), 0)
+
+        firstRow = self.getImpedancePad4AsNumpyArray(
+            frequencies[0], amplitude, number_of_periods
+        )
+        impedances = np.full(
+            (len(frequencies), len(firstRow)), np.nan, dtype=np.complex128
+        )
+        impedances[0] = firstRow
+
+        for index in range(1, len(frequencies)):
+            self.getImpedancePad4AsNumpyArray(frequencies[index], out=impedances[index])
+        return np.ma.masked_where((impedances == 0) | np.isnan(impedances), impedances)
+
     def setEISNaming(self, naming: Union[str, FileNaming]) -> str:
         r"""
         Set the EIS measurement naming rule.
@@ -1740,6 +1891,7 @@ class ThalesRemoteScriptWrapper(object):
         The file from the specified path is copied as sequence sequence_number=9 to the correct location in the Thales directory and then selected and executed.
         The default sequence number is 9 and does not need to be changed.
         The old sequence sequence_number is overwritten.
+        If the same content was already copied into the slot before, the file is not written again, see :class:`~thales_remote.sequence_manager.SequenceManager`.
 
         The variable sequence_folder is ONLY NECESSARY if python is running on ANOTHER COMPUTER like the one connected to the Zennium.
         For this the controlling computer must have access to the hard disk of the computer with the Zennium to access the THALES folder.
@@ -1752,22 +1904,55 @@ class ThalesRemoteScriptWrapper(object):
             Does not normally need to be transferred and changed.
         :returns: reponse string from the device
         """
-        if sequence_number > 9 or sequence_number < 0:
-            raise ThalesRemoteError("Wrong sequence number.")
-
-        sequence_folder = sequence_folder + "/sequence{:02d}.seq".format(
-            sequence_number
+        self.getSequenceManager(sequence_folder).installSequenceFile(
+            filepath, sequence_number
         )
 
-        if filepath.find(".seq") < 0:
-            raise ThalesRemoteError("Wrong sequence file extension.")
-        if os.path.exists(sequence_folder):
-            os.remove(sequence_folder)
-        shutil.copy2(filepath, sequence_folder)
+        self.selectSequence(sequence_number)
+        return self.runSequence()
+
+    def runSequenceContent(
+        self,
+        sequence: str,
+        sequence_folder: str = "C:/THALES/script/sequencer/sequences",
+        sequence_number: int = 9,
+    ) -> str:
+        r"""
+        Run a sequence passed as string.
+
+        Like :func:`~thales_remote.script_wrapper.ThalesRemoteScriptWrapper.runSequenceFile`, but the content of the
+        sequence is passed directly, for example a sequence rendered from a template.
+        The sequence is only written if the content differs from the one already in the slot.
+
+        :param sequence: The content of the sequence file.
+        :param sequence_folder: The filepath to the THALES sequence folder.
+            Does not normally need to be transferred and changed. Explanation see in :func:`~thales_remote.script_wrapper.ThalesRemoteScriptWrapper.runSequenceFile`.
+        :param sequence_number: The number in the THALES sequence directory.
+            Does not normally need to be transferred and changed.
+        :returns: reponse string from the device
+        """
+        self.getSequenceManager(sequence_folder).installSequence(
+            sequence, sequence_number
+        )
 
         self.selectSequence(sequence_number)
         return self.runSequence()
 
+    def getSequenceManager(
+        self, sequence_folder: str = "C:/THALES/script/sequencer/sequences"
+    ) -> SequenceManager:
+        r"""
+        Get the sequence manager for a sequence folder.
+
+        The manager remembers which content is installed in the sequence slots of the folder.
+
+        :param sequence_folder: The filepath to the THALES sequence folder.
+        :returns: The :class:`~thales_remote.sequence_manager.SequenceManager` of the folder.
+        """
+        if sequence_folder not in self._sequence_managers:
+            self._sequence_managers[sequence_folder] = SequenceManager(sequence_folder)
+        return self._sequence_managers[sequence_folder]
+
     def setSequenceOhmicDrop(self, value: float) -> str:
         r"""
         Set the Ohmic Drop or IR Drop for the sequencer.
@@ -2348,6 +2533,41 @@ class ThalesRemoteScriptWrapper(object):
         match = re.search(pattern, reply)
         return float(match.group(1))
 
+    def _parsePad4ImpedanceReply(
+        self, reply: str, out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        r"""
+        Parse the reply of PAD4IMP into a complex array.
+
+        The labels in front of the values are removed and the remaining real and imaginary parts are parsed in one
+        step as float array, which is then viewed as complex array.
+
+        :param reply: reply string of PAD4IMP.
+        :param out: Optional complex array which is filled.
+        :returns: Complex array with the impedance of each channel.
+        :raises ThalesRemoteError: If the reply contains more channels than out.
+        """
+        numbers = re.sub(r"[^;=]*=", " ", reply).translate(
+            ThalesRemoteScriptWrapper._pad4SeparatorTable
+        )
+        values = np.fromstring(numbers, dtype=np.float64, sep=" ")
+        if len(values) % 2 != 0:
+            raise ThalesRemoteError(
+                "Unexpected reply: "
+                + reply.rstrip("\r")
+                + ThalesRemoteScriptWrapper.undefindedStandardErrorString
+            )
+        impedances = values.view(np.complex128)
+        if out is None:
+            return impedances
+        if len(impedances) > len(out):
+            raise ThalesRemoteError(
+                f"Unexpected reply with {len(impedances)} channels, {len(out)} channels expected: "
+                + reply.rstrip("\r")
+            )
+        out[: len(impedances)] = impedances
+        return out[: len(impedances)]
+
     def _checkForForbiddenCharactersInPath(self, string: str):
         r"""
         This function ensures that only the permitted characters appear in the path to:
@@ -0,0 +1,175 @@
+r"""
+  ____       __                        __    __   __      _ __
+ /_  / ___ _/ /  ___  ___ ___________ / /__ / /__/ /_____(_) /__
+  / /_/ _ `/ _ \/ _ \/ -_) __/___/ -_) / -_)  '_/ __/ __/ /  '_/
+ /___/\_,_/_//_/_//_/\__/_/      \__/_/\__/_/\_\\__/_/ /_/_/\_\
+
+Copyright 2024 Zahner-Elektrik GmbH & Co. KG
+
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the Software
+is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH
+THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import Optional, Union
+
+from thales_remote.error import ThalesRemoteError
+
+
+@dataclass
+class InstalledSequence:
+    r"""
+    State of a sequence slot as it was written by the :class:`.SequenceManager`.
+
+    :param digest: SHA-256 hash of the content.
+    :param size: Size of the file in bytes.
+    :param modificationTime: Modification time of the file in nanoseconds after writing.
+    """
+
+    digest: str
+    size: int
+    modificationTime: int
+
+
+class SequenceManager(object):
+    r"""Class which installs sequences into the Thales sequence folder only if the content has changed.
+
+    Thales can run the sequences 0 to 9, which must be stored as "sequence00.seq" to "sequence09.seq" in the
+    sequence folder. The manager remembers the hash of the content it has written into each slot.
+    If the same content is installed again and the file was not changed by someone else in the meantime,
+    nothing is written. Changed content is written to a temporary file and then renamed, so that Thales never
+    reads a half written sequence.
+
+    The sequence folder must be accessible by Python. If Python runs on another computer than Thales, the
+    folder "C:/THALES/script/sequencer/sequences" of the computer with the Zennium must be shared.
+
+    :param sequenceFolder: The path to the THALES sequence folder.
+    """
+
+    _sequence_folder: str
+    _installed: dict[int, InstalledSequence]
+
+    def __init__(self, sequenceFolder: str = "C:/THALES/script/sequencer/sequences"):
+        self._sequence_folder = sequenceFolder
+        self._installed = {}
+        return
+
+    def getSequenceFolder(self) -> str:
+        r"""
+        get the path to the THALES sequence folder
+
+        :returns: path to the sequence folder
+        """
+        return self._sequence_folder
+
+    def installSequence(self, sequence: Union[str, bytes], number: int = 9) -> bool:
+        r"""
+        Install the content of a sequence into a slot.
+
+        :param sequence: The content of the sequence file. Strings are encoded as UTF-8.
+        :param number: The number of the sequence slot from 0 to 9.
+        :returns: True if the file was written, False if the slot already contained the same content.
+        """
+        if number > 9 or number < 0:
+            raise ThalesRemoteError("Wrong sequence number.")
+
+        if isinstance(sequence, str):
+            sequence = sequence.encode("utf-8")
+
+        digest = hashlib.sha256(sequence).hexdigest()
+        if self._isInstalled(number, digest):
+            return False
+
+        targetPath = self._sequencePath(number)
+        fileDescriptor, temporaryPath = tempfile.mkstemp(
+            suffix=".tmp", dir=self._sequence_folder
+        )
+        try:
+            with os.fdopen(fileDescriptor, "wb") as file:
+                file.write(sequence)
+            os.replace(temporaryPath, targetPath)
+        except:
+            if os.path.exists(temporaryPath):
+                os.remove(temporaryPath)
+            self._installed.pop(number, None)
+            raise
+
+        status = os.stat(targetPath)
+        self._installed[number] = InstalledSequence(
+            digest, status.st_size, status.st_mtime_ns
+        )
+        return True
+
+    def installSequenceFile(self, filepath: str, number: int = 9) -> bool:
+        r"""
+        Install a local sequence file into a slot.
+
+        :param filepath: Filepath of the sequence.
+        :param number: The number of the sequence slot from 0 to 9.
+        :returns: True if the file was written, False if the slot already contained the same content.
+        """
+        if filepath.find(".seq") < 0:
+            raise ThalesRemoteError("Wrong sequence file extension.")
+
+        with open(filepath, "rb") as file:
+            content = file.read()
+        return self.installSequence(content, number)
+
+    def getInstalledDigest(self, number: int) -> Optional[str]:
+        r"""
+        get the hash of the content which was installed into a slot
+
+        :param number: The number of the sequence slot from 0 to 9.
+        :returns: The SHA-256 hash or None if nothing was installed by this manager.
+        """
+        installed = self._installed.get(number)
+        return installed.digest if installed is not None else None
+
+    def forgetInstalledSequences(self) -> None:
+        r"""
+        forget the installed content, so that all sequences are written again with the next install
+        """
+        self._installed = {}
+        return
+
+    # The following methods should not be called by the user.
+    # They are marked with the prefix '_' after the Python convention for proteced.
+
+    def _sequencePath(self, number: int) -> str:
+        r"""
+        path of the sequence file in the slot
+        """
+        return os.path.join(self._sequence_folder, "sequence{:02d}.seq".format(number))
+
+    def _isInstalled(self, number: int, digest: str) -> bool:
+        r"""
+        check if the slot contains the content with the hash and was not changed since it was written
+        """
+        installed = self._installed.get(number)
+        if installed is None or installed.digest != digest:
+            return False
+        try:
+            status = os.stat(self._sequencePath(number))
+        except OSError:
+            return False
+        return (
+            status.st_size == installed.size
+            and status.st_mtime_ns == installed.modificationTime
+        )
@@ -0,0 +1,162 @@
+r"""
+  ____       __                        __    __   __      _ __
+ /_  / ___ _/ /  ___  ___ ___________ / /__ / /__/ /_____(_) /__
+  / /_/ _ `/ _ \/ _ \/ -_) __/___/ -_) / -_)  '_/ __/ __/ /  '_/
+ /___/\_,_/_//_/_//_/\__/_/      \__/_/\__/_/\_\\__/_/ /_/_/\_\
+
+Copyright 2024 Zahner-Elektrik GmbH & Co. KG
+
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the Software
+is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH
+THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from thales_remote.error import ThalesRemoteError
+from thales_remote.file_interface import FileData, ThalesFileInterface
+
+
+@dataclass
+class SweepResult:
+    r"""
+    Result of one point of a sweep.
+
+    :param point: The point as it was passed to the sweep.
+    :param file: The transferred measurement file.
+    :param data: The file parsed with the parser of the sweep executor.
+    """
+
+    point: Any
+    file: FileData
+    data: Any
+
+
+def parseIsmFile(file: FileData) -> Any:
+    r"""
+    Default parser of the sweep executor.
+
+    :param file: The transferred file.
+    :returns: The file imported with IsmImport from the zahner_analysis package.
+    """
+    from zahner_analysis.file_import.ism_import import IsmImport
+
+    return IsmImport(file.binaryData)
+
+
+class SweepExecutor(object):
+    r"""Class which runs a parameter sweep and retrieves the results while the next point is measured.
+
+    In a sweep every point is measured with a user function, which returns the path of the result file on the
+    computer running Thales. The file is then transferred with the
+    :class:`~thales_remote.file_interface.ThalesFileInterface` and parsed in a worker thread while the next point
+    is already measured. This way the total time of the sweep approaches the sum of the measurement times.
+
+    The files are transferred one after the other with
+    :func:`~thales_remote.file_interface.ThalesFileInterface.acquireFile`, therefore the automatic file exchange of
+    the file interface must be disabled.
+
+    .. code-block:: python
+
+        def measure(potential):
+            zahnerZennium.setEISOutputFileName(f"{int(potential * 1000)}_mvdc")
+            zahnerZennium.setPotential(potential)
+            zahnerZennium.measureEIS()
+            return rf"C:\THALES\temp\{int(potential * 1000)}_mvdc.ism"
+
+        executor = SweepExecutor(fileInterface)
+        for result in executor.run(potentialsToMeasure, measure):
+            print(result.point, result.data.getImpedanceArray())
+
+    :param fileInterface: The file interface used to transfer the result files.
+    :param parser: Function which is called with the :class:`~thales_remote.file_interface.FileData` in a worker
+        thread. The default imports ism files with IsmImport.
+    :param workers: Number of worker threads for transfer and parsing.
+    """
+
+    _file_interface: ThalesFileInterface
+    _parser: Callable[[FileData], Any]
+    _workers: int
+    _transfer_mutex: threading.Lock
+
+    def __init__(
+        self,
+        fileInterface: ThalesFileInterface,
+        parser: Optional[Callable[[FileData], Any]] = None,
+        workers: int = 2,
+    ):
+        self._file_interface = fileInterface
+        self._parser = parser if parser is not None else parseIsmFile
+        self._workers = workers
+        self._transfer_mutex = threading.Lock()
+        return
+
+    def run(
+        self, points: Iterable[Any], measure: Callable[[Any], str]
+    ) -> Iterator[SweepResult]:
+        r"""
+        Run the sweep and yield the results in the order of the points.
+
+        Results that are already complete are yielded between two measurements, the remaining results after
+        the last measurement.
+        While the caller processes a yielded result, the next measurement does not start, so the processing
+        should be short.
+        If the transfer or parsing of a point failed, the exception is raised when its result is yielded.
+
+        :param points: The points of the sweep, for example a list of potentials.
+        :param measure: Function which measures one point and returns the path of the result file on the
+            computer running Thales.
+        :returns: Generator with a :class:`.SweepResult` for each point.
+        """
+        pending: deque[tuple[Any, Future]] = deque()
+        executor = ThreadPoolExecutor(max_workers=self._workers)
+        try:
+            for point in points:
+                remotePath = measure(point)
+                pending.append((point, executor.submit(self._retrieve, remotePath)))
+
+                while len(pending) > 0 and pending[0][1].done():
+                    point, future = pending.popleft()
+                    yield SweepResult(point, *future.result())
+
+            while len(pending) > 0:
+                point, future = pending.popleft()
+                yield SweepResult(point, *future.result())
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+        return
+
+    # The following methods should not be called by the user.
+    # They are marked with the prefix '_' after the Python convention for proteced.
+
+    def _retrieve(self, remotePath: str) -> tuple[FileData, Any]:
+        r"""
+        transfer and parse one file, runs in a worker thread
+
+        :param remotePath: path of the file on the computer running Thales.
+        :returns: tuple with the file and the parsed data.
+        """
+        with self._transfer_mutex:
+            file = self._file_interface.acquireFile(remotePath)
+        if file is None:
+            raise ThalesRemoteError(
+                "The automatic file exchange must be disabled for the sweep executor."
+            )
+        return file, self._parser(file)
@@ -0,0 +1,198 @@
+r"""
+  ____       __                        __    __   __      _ __
+ /_  / ___ _/ /  ___  ___ ___________ / /__ / /__/ /_____(_) /__
+  / /_/ _ `/ _ \/ _ \/ -_) __/___/ -_) / -_)  '_/ __/ __/ /  '_/
+ /___/\_,_/_//_/_//_/\__/_/      \__/_/\__/_/\_\\__/_/ /_/_/\_\
+
+Copyright 2024 Zahner-Elektrik GmbH & Co. KG
+
+Permission is hereby granted, free of charge, to any person obtaining
+a copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the Software
+is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH
+THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class FileTransferRecord:
+    r"""
+    Measured values of the transfer of one file.
+
+    :param name: Name of the file.
+    :param bytes: Number of bytes of the file.
+    :param chunks: Number of chunks in which the file was received.
+    :param seconds: Time in seconds between the reception of the path telegram and of the last chunk.
+    :param minChunkSize: Size of the smallest chunk in bytes.
+    :param maxChunkSize: Size of the largest chunk in bytes.
+    """
+
+    name: str
+    bytes: int
+    chunks: int
+    seconds: float
+    minChunkSize: int
+    maxChunkSize: int
+
+    def getThroughput(self) -> float:
+        r"""
+        get the effective throughput of the transfer
+
+        :returns: throughput in MB/s
+        """
+        if self.seconds <= 0:
+            return 0.0
+        return self.bytes / self.seconds / 1e6
+
+
+@dataclass
+class TransferStatisticsSnapshot:
+    r"""
+    Aggregated values of the file transfers.
+
+    The totals cover all files since the creation or the last reset, the rolling values only the last files.
+
+    :param totalFiles: Number of transferred files.
+    :param totalBytes: Number of transferred bytes.
+    :param totalSeconds: Sum of the transfer times in seconds.
+    :param rollingFiles: Number of files in the rolling window.
+    :param rollingThroughput: Throughput of the files in the rolling window in MB/s.
+    :param rollingMinThroughput: Lowest throughput of a file in the rolling window in MB/s.
+    :param rollingMaxThroughput: Highest throughput of a file in the rolling window in MB/s.
+    :param rollingMeanSeconds: Mean transfer time of the files in the rolling window in seconds.
+    :param chunkSizeHistogram: Dict with the upper limit of a chunk size class in bytes as key and the number of
+        chunks as value. The classes are powers of two.
+    :param lastTransfer: The record of the last transfer or None.
+    """
+
+    totalFiles: int
+    totalBytes: int
+    totalSeconds: float
+    rollingFiles: int
+    rollingThroughput: float
+    rollingMinThroughput: float
+    rollingMaxThroughput: float
+    rollingMeanSeconds: float
+    chunkSizeHistogram: dict[int, int]
+    lastTransfer: Optional[FileTransferRecord]
+
+    def getTotalThroughput(self) -> float:
+        r"""
+        get the throughput of all transfers
+
+        :returns: throughput in MB/s
+        """
+        if self.totalSeconds <= 0:
+            return 0.0
+        return self.totalBytes / self.totalSeconds / 1e6
+
+
+class TransferStatistics(object):
+    r"""Class which collects the measured values of the file transfers.
+
+    All methods are thread safe.
+
+    :param window: Number of the last files used for the rolling values.
+    """
+
+    _records: deque[FileTransferRecord]
+    _total_files: int
+    _total_bytes: int
+    _total_seconds: float
+    _chunk_size_histogram: dict[int, int]
+    _mutex: threading.Lock
+
+    def __init__(self, window: int = 100):
+        self._records = deque(maxlen=window)
+        self._mutex = threading.Lock()
+        self.reset()
+        return
+
+    def reset(self) -> None:
+        r"""
+        delete all collected values
+        """
+        with self._mutex:
+            self._records.clear()
+            self._total_files = 0
+            self._total_bytes = 0
+            self._total_seconds = 0.0
+            self._chunk_size_histogram = {}
+        return
+
+    def record(self, name: str, chunkSizes: list[int], seconds: float) -> None:
+        r"""
+        add the transfer of a file
+
+        :param name: Name of the file.
+        :param chunkSizes: The size of every received chunk in bytes.
+        :param seconds: Time in seconds between the reception of the path telegram and of the last chunk.
+        """
+        record = FileTransferRecord(
+            name,
+            sum(chunkSizes),
+            len(chunkSizes),
+            seconds,
+            min(chunkSizes, default=0),
+            max(chunkSizes, default=0),
+        )
+        with self._mutex:
+            self._records.append(record)
+            self._total_files += 1
+            self._total_bytes += record.bytes
+            self._total_seconds += seconds
+            for size in chunkSizes:
+                upperLimit = 1 << max(size - 1, 0).bit_length()
+                self._chunk_size_histogram[upperLimit] = (
+                    self._chunk_size_histogram.get(upperLimit, 0) + 1
+                )
+        return
+
+    def getRecords(self) -> list[FileTransferRecord]:
+        r"""
+        get the records of the files in the rolling window
+
+        :returns: List with the records, the last transfer at the end.
+        """
+        with self._mutex:
+            return list(self._records)
+
+    def getSnapshot(self) -> TransferStatisticsSnapshot:
+        r"""
+        get the aggregated values
+
+        :returns: The snapshot of the statistics.
+        """
+        with self._mutex:
+            records = list(self._records)
+            rollingBytes = sum(record.bytes for record in records)
+            rollingSeconds = sum(record.seconds for record in records)
+            throughputs = [record.getThroughput() for record in records]
+            return TransferStatisticsSnapshot(
+                self._total_files,
+                self._total_bytes,
+                self._total_seconds,
+                len(records),
+                rollingBytes / rollingSeconds / 1e6 if rollingSeconds > 0 else 0.0,
+                min(throughputs, default=0.0),
+                max(throughputs, default=0.0),
+                rollingSeconds / len(records) if len(records) > 0 else 0.0,
+                dict(sorted(self._chunk_size_histogram.items())),
+                records[-1] if len(records) > 0 else None,
+            )